@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Compare the agent cost of a chat start: per-session create_base_agent vs the process cache.
+
+``per-session`` is the old on_chat_start behaviour (every session compiled its own
+agent graph); ``cached`` is get_base_agent, where only the first start of the
+process builds and every later start is a dictionary lookup. Both run against a
+domain's real tools and agent configs, so the environment must be able to build
+the agent (DYNAGENT_CONFIG_ROOT_DIR, SCHEMA_BASE and the model settings from .env).
+
+Reported per mode: first start, p50/p99 of the remaining starts, and the total.
+
+Usage:
+    python benchmarks/bench_chat_start.py
+    python benchmarks/bench_chat_start.py --domain sales --starts 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import TYPE_CHECKING
+
+from dotenv import load_dotenv
+
+from autobots_agents_jarvis.common.models.state import JarvisState
+from autobots_agents_jarvis.common.services.agent_cache import (
+    agent_cache_stats,
+    clear_agent_cache,
+    get_base_agent,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+DOMAINS = ("concierge", "sales", "customer_support")
+
+
+def register_domain(domain: str) -> None:
+    """Run the same settings and tool registration as the domain's server module."""
+    if domain == "concierge":
+        from autobots_agents_jarvis.domains.concierge.settings import init_concierge_settings
+        from autobots_agents_jarvis.domains.concierge.tools import register_concierge_tools
+
+        init_concierge_settings()
+        register_concierge_tools()
+        return
+    from autobots_agents_jarvis.common.configs.settings import init_app_settings
+
+    init_app_settings()
+    if domain == "sales":
+        from autobots_agents_jarvis.domains.sales.tools import register_sales_tools
+
+        register_sales_tools()
+    else:
+        from autobots_agents_jarvis.common.tools.validation_tools import register_validation_tools
+        from autobots_agents_jarvis.domains.customer_support.tools import (
+            register_customer_support_tools,
+        )
+
+        register_validation_tools()
+        register_customer_support_tools()
+
+
+def time_starts(start: Callable[[], object], starts: int) -> list[float]:
+    """Return the wall time of each of *starts* calls, in milliseconds."""
+    samples = []
+    for _ in range(starts):
+        t0 = time.perf_counter()
+        start()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def _percentile(sorted_ms: list[float], pct: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    return sorted_ms[min(len(sorted_ms) - 1, round(pct / 100 * (len(sorted_ms) - 1)))]
+
+
+def report(mode: str, samples: list[float]) -> None:
+    rest = sorted(samples[1:])
+    print(
+        f"{mode:<12} first {samples[0]:>9.1f} ms  "
+        f"p50 {_percentile(rest, 50):>9.3f} ms  p99 {_percentile(rest, 99):>9.3f} ms  "
+        f"mean {statistics.fmean(rest) if rest else 0.0:>9.3f} ms  total {sum(samples):>10.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--domain", choices=DOMAINS, default="concierge")
+    parser.add_argument("--starts", type=int, default=20, help="Chat starts per mode")
+    args = parser.parse_args()
+
+    load_dotenv()
+    register_domain(args.domain)
+    from autobots_devtools_shared_lib.dynagent import create_base_agent
+
+    app_name = f"{args.domain}_chat"
+    print(f"{args.starts} chat starts for {app_name}")
+    report(
+        "per-session",
+        time_starts(lambda: create_base_agent(state_schema=JarvisState), args.starts),
+    )
+    clear_agent_cache()
+    report(
+        "cached",
+        time_starts(lambda: get_base_agent(app_name, state_schema=JarvisState), args.starts),
+    )
+    print(f"cache: {agent_cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
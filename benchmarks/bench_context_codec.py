@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Compare Redis value codecs for context dicts: size on the wire and encode/decode cost.
+
+The baseline is ``json`` (the shared-lib RedisContextStore format). ``compact``
+is the stdlib schema-positional struct and ``msgpack`` needs the optional
+package; each is also run zstd-wrapped (``+zstd``) when zstandard is installed.
+
+Reported per codec: mean bytes per key over a generated population of contexts
+and ns per encode / decode. Sizes are what Redis stores (and what crosses the
+network); the L1 near-cache keeps decoded dicts and is unaffected.
+
+Usage:
+    python benchmarks/bench_context_codec.py
+    python benchmarks/bench_context_codec.py --keys 2000 --rounds 20 --zstd-threshold 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import TYPE_CHECKING, Any
+
+from autobots_agents_jarvis.common.services.codecs import CODEC_NAMES, build_codec
+
+if TYPE_CHECKING:
+    from autobots_agents_jarvis.common.services.codecs import ContextCodec
+
+
+def make_contexts(keys: int) -> list[dict[str, Any]]:
+    """Return *keys* contexts shaped like those the servers write (mostly sparse)."""
+    contexts: list[dict[str, Any]] = []
+    for i in range(keys):
+        data: dict[str, Any] = {
+            "domain_name": ("concierge_chat", "sales_chat", "customer_support_chat")[i % 3],
+            "user_name": f"user-{i:06d}@example.com",
+            "session_id": f"{i:08x}-5f2c-4c1e-9d7b-{i * 7919:012x}",
+        }
+        if i % 2:
+            data["repo_name"] = f"org-{i % 17}/service-{i % 101}"
+        if i % 5 == 0:
+            data["jira_number"] = f"JAR-{i % 9000 + 1000}"
+        contexts.append(data)
+    return contexts
+
+
+def run(label: str, codec: ContextCodec, contexts: list[dict[str, Any]], rounds: int) -> float:
+    """Print bytes/key and ns per encode / decode for *codec*; return bytes/key."""
+    payloads = [codec.encode(data) for data in contexts]
+    size = sum(map(len, payloads)) / len(payloads)
+    operations = len(contexts) * rounds
+
+    start = time.perf_counter_ns()
+    for _ in range(rounds):
+        for data in contexts:
+            codec.encode(data)
+    encode_ns = (time.perf_counter_ns() - start) / operations
+
+    start = time.perf_counter_ns()
+    for _ in range(rounds):
+        for payload in payloads:
+            codec.decode(payload)
+    decode_ns = (time.perf_counter_ns() - start) / operations
+
+    print(f"{label:<13} {size:7.1f} B/key  {encode_ns:8.0f} ns/encode  {decode_ns:8.0f} ns/decode")
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=1000, help="Distinct contexts encoded")
+    parser.add_argument("--rounds", type=int, default=50, help="Passes over the contexts per codec")
+    parser.add_argument(
+        "--zstd-threshold", type=int, default=128, help="Bytes at which +zstd runs compress"
+    )
+    args = parser.parse_args()
+
+    contexts = make_contexts(args.keys)
+    baseline = 0.0
+    for name in CODEC_NAMES:
+        for threshold in (0, args.zstd_threshold):
+            label = name if threshold == 0 else f"{name}+zstd"
+            try:
+                codec = build_codec(name, zstd_threshold=threshold)
+            except RuntimeError as exc:
+                print(f"{label:<13} skipped ({exc})")
+                continue
+            size = run(label, codec, contexts, args.rounds)
+            baseline = baseline or size
+            if label != "json":
+                print(f"{'':<13} {size / baseline:7.2f}x json size")
+
+
+if __name__ == "__main__":
+    main()
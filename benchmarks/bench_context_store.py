@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Benchmark the context-store stacks built by init_context_store under realistic read/write mixes.
+
+Backends (local stand-ins, so no Postgres or Redis server is needed):
+
+- ``inmemory``     InMemoryContextStore (no JARVIS_DATABASE_URL / JARVIS_SQLITE_PATH)
+- ``db``           JarvisCacheBackedContextStore over SQLite with no cache tier
+- ``db+redis``     the same over a fakeredis JarvisRedisContextStore (REDIS_URL set)
+- ``db+redis+l1``  plus the process-local LRU near-cache (CONTEXT_L1_MAX_ENTRIES > 0)
+
+Mixes pick keys from a skewed (Zipf-like) distribution over --keys sessions:
+
+- ``read-heavy``   90% get, 8% update, 2% set (typical chat turns)
+- ``write-heavy``  50% get, 40% update, 10% set (tool-heavy turns)
+
+Reported per backend and mix: ops/sec, p50/p99 latency per operation and overall,
+and the mean tracemalloc peak per operation (separate, slower pass). fakeredis
+runs in-process, so Redis numbers show client-side cost without network RTT;
+pass --url / --redis-url to measure real servers. --json writes the results as a
+baseline, and --baseline prints the change of each metric against an older one.
+
+Usage:
+    python benchmarks/bench_context_store.py
+    python benchmarks/bench_context_store.py --ops 20000 --keys 1000 --json benchmarks/baseline.json
+    python benchmarks/bench_context_store.py --baseline benchmarks/baseline.json
+    python benchmarks/bench_context_store.py --backends db db+redis --mixes read-heavy
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import fakeredis
+import sqlalchemy
+from autobots_devtools_shared_lib.common.services import InMemoryContextStore
+from sqlalchemy import delete
+
+from autobots_agents_jarvis.common.configs.settings import get_app_settings
+from autobots_agents_jarvis.common.db.engine import get_read_session_factory, init_db_engine
+from autobots_agents_jarvis.common.db.models import JarvisContextEntity
+from autobots_agents_jarvis.common.db.repository import JarvisContextRepository
+from autobots_agents_jarvis.common.services.context_store import JarvisCacheBackedContextStore
+from autobots_agents_jarvis.common.services.near_cache import LRUContextCache, NearCacheContextStore
+from autobots_agents_jarvis.common.services.redis_store import JarvisRedisContextStore
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+    from autobots_devtools_shared_lib.common.services import ContextStore
+
+BACKENDS = ("inmemory", "db", "db+redis", "db+redis+l1")
+MIXES: dict[str, dict[str, float]] = {
+    "read-heavy": {"get": 0.90, "update": 0.08, "set": 0.02},
+    "write-heavy": {"get": 0.50, "update": 0.40, "set": 0.10},
+}
+# Metrics compared by --baseline, and whether a higher value is better.
+_COMPARED = {"ops_per_sec": True, "p50_us": False, "p99_us": False, "alloc_bytes_per_op": False}
+
+
+class _NoCache:
+    """ContextStore that stores nothing, so every read goes to the DB."""
+
+    def get(self, _context_key: str) -> dict[str, Any] | None:
+        return None
+
+    def set(self, _context_key: str, _data: Mapping[str, Any]) -> None:
+        return None
+
+    def update(self, _context_key: str, patch: Mapping[str, Any]) -> dict[str, Any]:
+        return dict(patch)
+
+    def delete(self, _context_key: str) -> None:
+        return None
+
+
+def build_store(backend: str, db_url: str, redis_url: str | None) -> tuple[ContextStore, Any]:
+    """Return the store for *backend* and the engine to dispose (None for inmemory).
+
+    The engine is built as init_context_store() builds it (pool, SQLite PRAGMAs,
+    replicas and schema check from the JARVIS_* / DB_* settings), then emptied.
+    """
+    if backend == "inmemory":
+        return InMemoryContextStore(), None
+    settings = get_app_settings()
+    session_factory = init_db_engine(db_url, **settings.db_engine_options())
+    with session_factory() as session:
+        session.execute(delete(JarvisContextEntity))
+        session.commit()
+    read_session_factory = get_read_session_factory()
+    repo = JarvisContextRepository(session_factory, read_session_factory=read_session_factory)
+    ryw_window = settings.context_read_your_writes_seconds if read_session_factory else 0.0
+    cache: ContextStore = _NoCache()
+    if backend != "db":
+        client = fakeredis.FakeRedis() if redis_url is None else _real_redis(redis_url)
+        cache = JarvisRedisContextStore(client, prefix="bench_ctx")
+    if backend == "db+redis+l1":
+        cache = NearCacheContextStore(LRUContextCache(max_entries=1024, ttl=2.0), cache)
+    store = JarvisCacheBackedContextStore(
+        db=repo, cache=cache, prefix="jarvis-bench", read_your_writes_window=ryw_window
+    )
+    return store, session_factory.kw["bind"]
+
+
+def _real_redis(url: str) -> Any:
+    import redis
+
+    client = redis.Redis.from_url(url)
+    client.flushdb()
+    return client
+
+
+def workload(mix: str, ops: int, keys: int, seed: int) -> Iterator[tuple[str, str, dict[str, Any]]]:
+    """Yield ``(operation, context_key, payload)`` tuples for *mix* (deterministic per seed)."""
+    rng = random.Random(seed)  # noqa: S311 - reproducible workload, not security
+    names = list(MIXES[mix])
+    weights = list(MIXES[mix].values())
+    # Zipf-like skew: a few sessions are very active, most are idle.
+    key_weights = [1 / (rank + 1) for rank in range(keys)]
+    op_choices = rng.choices(names, weights, k=ops)
+    key_choices = rng.choices(range(keys), key_weights, k=ops)
+    for i, (op, k) in enumerate(zip(op_choices, key_choices, strict=True)):
+        payload: dict[str, Any]
+        if op == "set":
+            payload = {
+                "domain_name": "concierge_chat",
+                "user_name": f"user-{k}@example.com",
+                "session_id": f"session-{k}-{i}",
+            }
+        else:
+            payload = {"jira_number": f"JAR-{i % 9000 + 1000}"}
+        yield op, f"user-{k}", payload
+
+
+def seed_store(store: ContextStore, keys: int) -> None:
+    """Write one context per key so reads and updates hit existing rows."""
+    for k in range(keys):
+        store.set(
+            f"user-{k}",
+            {
+                "domain_name": "concierge_chat",
+                "user_name": f"user-{k}@example.com",
+                "session_id": f"session-{k}",
+            },
+        )
+
+
+def _call(store: ContextStore, op: str, key: str, payload: dict[str, Any]) -> None:
+    if op == "get":
+        store.get(key)
+    elif op == "update":
+        store.update(key, payload)
+    else:
+        store.set(key, payload)
+
+
+def _percentile(sorted_ns: list[int], pct: float) -> float:
+    if not sorted_ns:
+        return 0.0
+    index = min(len(sorted_ns) - 1, round(pct / 100 * (len(sorted_ns) - 1)))
+    return sorted_ns[index] / 1000
+
+
+def measure(store: ContextStore, mix: str, ops: int, keys: int, seed: int) -> dict[str, Any]:
+    """Run the timed pass and the allocation pass of *mix*; return its metrics."""
+    plan = list(workload(mix, ops, keys, seed))
+    for op, key, payload in plan[: min(len(plan), keys)]:  # warm caches and pools
+        _call(store, op, key, payload)
+
+    per_op: dict[str, list[int]] = {name: [] for name in MIXES[mix]}
+    clock = time.perf_counter_ns
+    gc.collect()
+    start = clock()
+    for op, key, payload in plan:
+        t0 = clock()
+        _call(store, op, key, payload)
+        per_op[op].append(clock() - t0)
+    elapsed = (clock() - start) / 1e9
+
+    alloc_plan = plan[: min(len(plan), 2000)]
+    gc.collect()
+    tracemalloc.start()
+    alloc_total = 0
+    for op, key, payload in alloc_plan:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        _call(store, op, key, payload)
+        _, peak = tracemalloc.get_traced_memory()
+        alloc_total += peak - baseline
+    tracemalloc.stop()
+
+    every = sorted(ns for samples in per_op.values() for ns in samples)
+    return {
+        "ops": len(plan),
+        "ops_per_sec": round(len(plan) / elapsed, 1),
+        "p50_us": round(_percentile(every, 50), 2),
+        "p99_us": round(_percentile(every, 99), 2),
+        "mean_us": round(statistics.fmean(every) / 1000, 2),
+        "alloc_bytes_per_op": round(alloc_total / len(alloc_plan), 1),
+        "operations": {
+            op: {
+                "count": len(samples),
+                "p50_us": round(_percentile(sorted(samples), 50), 2),
+                "p99_us": round(_percentile(sorted(samples), 99), 2),
+            }
+            for op, samples in per_op.items()
+        },
+    }
+
+
+def run_suite(args: argparse.Namespace, db_url: str) -> dict[str, dict[str, Any]]:
+    results: dict[str, dict[str, Any]] = {}
+    for backend in args.backends:
+        results[backend] = {}
+        for mix in args.mixes:
+            store, engine = build_store(backend, db_url, args.redis_url)
+            try:
+                seed_store(store, args.keys)
+                metrics = measure(store, mix, args.ops, args.keys, args.seed)
+            finally:
+                if engine is not None:
+                    engine.dispose()
+            results[backend][mix] = metrics
+            ops = metrics["operations"]
+            print(
+                f"{backend:<12} {mix:<12} {metrics['ops_per_sec']:>10.0f} ops/s  "
+                f"p50 {metrics['p50_us']:>8.1f} us  p99 {metrics['p99_us']:>9.1f} us  "
+                f"{metrics['alloc_bytes_per_op']:>8.0f} B/op  "
+                + "  ".join(
+                    f"{op} p50 {ops[op]['p50_us']:.1f}/p99 {ops[op]['p99_us']:.1f}" for op in ops
+                )
+            )
+    return results
+
+
+def compare(results: dict[str, dict[str, Any]], baseline_path: Path) -> None:
+    """Print the relative change of each compared metric against *baseline_path*."""
+    baseline = json.loads(baseline_path.read_text())["results"]
+    print(f"\nChange vs {baseline_path} (+ = better):")
+    for backend, mixes in results.items():
+        for mix, metrics in mixes.items():
+            old = baseline.get(backend, {}).get(mix)
+            if old is None:
+                continue
+            deltas = []
+            for metric, higher_is_better in _COMPARED.items():
+                if not old.get(metric):
+                    continue
+                change = (metrics[metric] - old[metric]) / old[metric] * 100
+                deltas.append(f"{metric} {change if higher_is_better else -change:+.1f}%")
+            print(f"{backend:<12} {mix:<12} " + "  ".join(deltas))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=10000, help="Operations per backend and mix")
+    parser.add_argument("--keys", type=int, default=500, help="Distinct context keys (sessions)")
+    parser.add_argument("--seed", type=int, default=42, help="Workload RNG seed")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--mixes", nargs="+", choices=list(MIXES), default=list(MIXES))
+    parser.add_argument("--url", help="SQLAlchemy URL (default: temporary SQLite file)")
+    parser.add_argument("--redis-url", help="Real Redis URL instead of fakeredis (flushes its DB)")
+    parser.add_argument("--json", type=Path, help="Write results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="Compare against an earlier --json file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = args.url or f"sqlite:///{Path(tmp) / 'bench.db'}"
+        print(f"Backend DB: {db_url.split('://', 1)[0]}, Redis: {args.redis_url or 'fakeredis'}")
+        results = run_suite(args, db_url)
+
+    if args.json:
+        report = {
+            "meta": {
+                "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "sqlalchemy": sqlalchemy.__version__,
+                "platform": platform.platform(),
+                "db": db_url.split("://", 1)[0],
+                "redis": "fakeredis" if args.redis_url is None else "redis",
+                "ops": args.ops,
+                "keys": args.keys,
+                "seed": args.seed,
+            },
+            "results": results,
+        }
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Wrote {args.json}")
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
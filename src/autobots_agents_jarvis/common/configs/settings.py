@@ -1,6 +1,8 @@
 # ABOUTME: Pydantic settings for application configuration.
 # ABOUTME: Extends DynagentSettings with app-level settings (OAuth, app name, port, etc.).
 
+from typing import Any, Literal
+
 from autobots_devtools_shared_lib.dynagent import DynagentSettings, set_dynagent_settings
 from pydantic import Field
 
@@ -26,7 +28,223 @@ class AppSettings(DynagentSettings):
         validation_alias="JARVIS_DATABASE_URL",
         description="Postgres DSN (env: JARVIS_DATABASE_URL)",
     )
+    database_replica_urls: str = Field(
+        default="",
+        validation_alias="JARVIS_DATABASE_REPLICA_URLS",
+        description=(
+            "Comma-separated Postgres read-replica DSNs for context reads "
+            "(env: JARVIS_DATABASE_REPLICA_URLS)"
+        ),
+    )
     redis_url: str = Field(default="", description="Redis URL (env: REDIS_URL)")
+    sqlite_path: str = Field(
+        default="",
+        validation_alias="JARVIS_SQLITE_PATH",
+        description=(
+            "On-disk SQLite file for single-node persistence when JARVIS_DATABASE_URL is unset "
+            "(env: JARVIS_SQLITE_PATH)"
+        ),
+    )
+    sqlite_cache_size_kib: int = Field(
+        default=65536, description="SQLite page cache per connection, in KiB"
+    )
+    sqlite_mmap_size_mb: int = Field(
+        default=256, description="SQLite memory-mapped I/O size in MiB (0 disables)"
+    )
+    skip_schema_init: bool = Field(
+        default=False,
+        validation_alias="JARVIS_SKIP_SCHEMA_INIT",
+        description="Skip the startup schema check; run migrations separately (env: JARVIS_SKIP_SCHEMA_INIT)",
+    )
+
+    # Database connection pool (per process; size for N domain processes x pool_size +
+    # max_overflow <= Postgres max_connections).
+    db_pool_size: int = Field(default=5, description="Connections kept in the DB pool")
+    db_max_overflow: int = Field(
+        default=10, description="Extra DB connections allowed beyond db_pool_size"
+    )
+    db_pool_recycle: int = Field(
+        default=1800, description="Seconds before a pooled DB connection is replaced (-1 = never)"
+    )
+    db_pool_timeout: float = Field(
+        default=30.0, description="Seconds to wait for a free DB connection"
+    )
+    db_pool_pre_ping: bool = Field(
+        default=True,
+        description="Ping DB connections on checkout (disable when db_pool_recycle covers idle drops)",
+    )
+    db_statement_timeout_ms: int = Field(
+        default=0, description="Postgres per-statement timeout in ms (0 = disabled)"
+    )
+
+    # Redis connection pool, shared by every Redis user in the process (context cache,
+    # L1 invalidation, ...); size for the concurrent requests of one process.
+    redis_max_connections: int = Field(
+        default=50, description="Connections kept in the shared Redis pool"
+    )
+    redis_pool_timeout: float = Field(
+        default=5.0, description="Seconds to wait for a free Redis connection"
+    )
+    redis_socket_timeout: float = Field(
+        default=5.0, description="Seconds a Redis command may block on the socket"
+    )
+    redis_socket_connect_timeout: float = Field(
+        default=2.0, description="Seconds to wait when opening a Redis connection"
+    )
+    redis_health_check_interval: int = Field(
+        default=30, description="Seconds a Redis connection may idle before a PING on checkout"
+    )
+
+    # Context store write-behind (cache-first writes, batched DB flushes)
+    context_write_behind: bool = Field(
+        default=False, description="Flush context writes to the DB asynchronously in batches"
+    )
+    context_write_behind_interval: float = Field(
+        default=1.0, description="Seconds between write-behind flushes"
+    )
+    context_write_behind_batch_size: int = Field(
+        default=200, description="Pending keys that trigger an early write-behind flush"
+    )
+    context_write_behind_max_pending: int = Field(
+        default=10_000, description="Pending keys at which writers flush inline (backpressure)"
+    )
+
+    # Process-local L1 cache in front of Redis (repeated reads within a turn skip the network)
+    context_l1_max_entries: int = Field(
+        default=1024, description="Context entries kept in the in-process L1 cache (0 = disabled)"
+    )
+    context_l1_ttl_seconds: float = Field(
+        default=2.0,
+        description="Seconds an L1 entry is served before re-reading Redis (bounds cross-process staleness)",
+    )
+    context_l1_invalidation: bool = Field(
+        default=True,
+        description="Evict L1 entries written by other processes via Redis pub/sub",
+    )
+    context_l1_invalidation_channel: str = Field(
+        default="jarvis:context:invalidate", description="Redis pub/sub channel for L1 evictions"
+    )
+    context_l1_invalidation_batch_interval: float = Field(
+        default=0.01, description="Seconds L1 invalidations are batched before publishing"
+    )
+
+    # Wire format of context values in Redis (json is the shared-lib format)
+    context_redis_codec: Literal["json", "compact", "msgpack"] = Field(
+        default="json", description="Redis value codec: json, compact or msgpack"
+    )
+    context_redis_zstd_threshold: int = Field(
+        default=0, description="zstd-compress Redis values of at least this many bytes (0 = off)"
+    )
+    context_redis_hash: bool = Field(
+        default=False,
+        description="Store each context as a Redis hash (field-level updates; codec unused)",
+    )
+
+    # Negative caching of context keys missing from the DB (first-turn sessions)
+    context_negative_cache_ttl_seconds: float = Field(
+        default=2.0, description="Seconds a missing context key is remembered (0 = disabled)"
+    )
+    context_negative_cache_max_entries: int = Field(
+        default=10_000, description="Missing context keys remembered per process"
+    )
+
+    # Startup cache warm-up: preload the most recently updated contexts in the background
+    context_warmup_rows: int = Field(
+        default=0,
+        description="Recently updated contexts preloaded into the cache at startup (0 = off)",
+    )
+    context_warmup_page_size: int = Field(
+        default=500, description="Rows per keyset page while warming the cache"
+    )
+
+    # Read-replica routing: after a write, reads of that key bypass replicas for this long
+    context_read_your_writes_seconds: float = Field(
+        default=5.0,
+        description="Seconds a written context_key is read from the primary (covers replica lag)",
+    )
+
+    # Context TTL (rows not updated within the TTL are removed by the purge job)
+    context_ttl_days: float = Field(
+        default=0, description="Days after the last update before a context expires (0 = never)"
+    )
+    context_purge_batch_size: int = Field(
+        default=500, description="Rows deleted per purge transaction"
+    )
+
+    # Trace export: Langfuse batches spans on a background thread with a bounded queue
+    tracing_flush_at: int = Field(default=128, description="Spans per export batch")
+    tracing_flush_interval: float = Field(
+        default=2.0, description="Seconds between background span exports"
+    )
+    tracing_max_queue_size: int = Field(
+        default=2048, description="Spans buffered for export; newer spans are dropped when full"
+    )
+    tracing_shutdown_timeout: float = Field(
+        default=5.0, description="Seconds to wait for pending spans at process exit"
+    )
+
+    # Trace sampling: head decision per session, plus tail records for errors and slow turns
+    tracing_sample_ratio: float = Field(
+        default=1.0, description="Fraction of sessions traced in full (1.0 = all, 0 = none)"
+    )
+    tracing_domain_sample_ratios: str = Field(
+        default="",
+        description="Comma-separated app_name=ratio overrides (e.g. sales_chat=0.1)",
+    )
+    tracing_agent_sample_ratios: str = Field(
+        default="",
+        description="Comma-separated agent_name=ratio overrides; win over domain ratios",
+    )
+    tracing_always_sample_errors: bool = Field(
+        default=True, description="Record a trace for failed turns of unsampled sessions"
+    )
+    tracing_slow_turn_seconds: float = Field(
+        default=0.0,
+        description="Record a trace for unsampled turns at least this slow (0 = disabled)",
+    )
+
+    def context_database_url(self) -> str:
+        """Return the DSN for the context store: JARVIS_DATABASE_URL, else the SQLite file, else ''."""
+        if self.database_url:
+            return self.database_url
+        if self.sqlite_path:
+            return f"sqlite:///{self.sqlite_path}"
+        return ""
+
+    def db_engine_options(self) -> dict[str, Any]:
+        """Return pool, timeout, schema-init, SQLite and replica keyword arguments for init_db_engine()."""
+        return {
+            "pool_size": self.db_pool_size,
+            "max_overflow": self.db_max_overflow,
+            "pool_recycle": self.db_pool_recycle,
+            "pool_timeout": self.db_pool_timeout,
+            "pool_pre_ping": self.db_pool_pre_ping,
+            "statement_timeout_ms": self.db_statement_timeout_ms,
+            "init_schema": not self.skip_schema_init,
+            "replica_urls": [u.strip() for u in self.database_replica_urls.split(",") if u.strip()],
+            "sqlite_pragmas": {
+                "cache_size": -self.sqlite_cache_size_kib,  # negative = KiB
+                "mmap_size": self.sqlite_mmap_size_mb * 1024 * 1024,
+            },
+        }
+
+    def redis_client_options(self) -> dict[str, Any]:
+        """Return pool and socket keyword arguments for get_redis_client()."""
+        return {
+            "max_connections": self.redis_max_connections,
+            "timeout": self.redis_pool_timeout,
+            "socket_timeout": self.redis_socket_timeout,
+            "socket_connect_timeout": self.redis_socket_connect_timeout,
+            "health_check_interval": self.redis_health_check_interval,
+        }
+
+    def tracing_exporter_env(self) -> dict[str, str]:
+        """Return the Langfuse / OpenTelemetry batch-exporter env vars for init_process_tracing()."""
+        return {
+            "LANGFUSE_FLUSH_AT": str(self.tracing_flush_at),
+            "LANGFUSE_FLUSH_INTERVAL": str(self.tracing_flush_interval),
+            "OTEL_BSP_MAX_QUEUE_SIZE": str(self.tracing_max_queue_size),
+        }
 
     def is_oauth_configured(self) -> bool:
         """Check if GitHub OAuth is properly configured."""
@@ -0,0 +1,101 @@
+# ABOUTME: asyncio counterpart of JarvisContextRepository backed by SQLAlchemy AsyncSession.
+# ABOUTME: Lets async handlers read/write the jarvis context store without blocking the event loop.
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from autobots_agents_jarvis.common.db.models import JarvisContextEntity
+from autobots_agents_jarvis.common.db.statements import (
+    CONTEXT_FIELDS,
+    GET_MANY_STATEMENT,
+    GET_STATEMENT,
+    chunked,
+    row_to_dict,
+    row_values,
+    upsert_statement,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+class AsyncJarvisContextRepository:
+    """Async mirror of :class:`JarvisContextRepository` (aget/aset/adelete/aget_many).
+
+    Same storage layout, prefixing and field handling as the sync repository, so
+    both can operate on the same table. Each method opens a short-lived
+    :class:`AsyncSession`, commits on success and rolls back on any exception.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        prefix: str = "",
+    ) -> None:
+        self._session_factory = session_factory
+        self._prefix = prefix
+
+    def _storage_key(self, context_key: str) -> str:
+        """Return the key used in the DB (with prefix when configured)."""
+        if not self._prefix:
+            return context_key
+        return f"{self._prefix}_{context_key}"
+
+    async def aget(self, context_key: str) -> dict[str, Any] | None:
+        """Return the stored context for *context_key*, or ``None`` if not found."""
+        key = self._storage_key(context_key)
+        async with self._session_factory() as session:
+            result = await session.execute(GET_STATEMENT, {"context_key": key})
+            row = result.first()
+        return None if row is None else row_to_dict(row)
+
+    async def aget_many(self, context_keys: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Return stored contexts for *context_keys*; missing keys are omitted."""
+        by_storage_key = {self._storage_key(k): k for k in context_keys}
+        if not by_storage_key:
+            return {}
+        result: dict[str, dict[str, Any]] = {}
+        async with self._session_factory() as session:
+            for chunk in chunked(list(by_storage_key)):
+                rows = await session.execute(GET_MANY_STATEMENT, {"context_keys": chunk})
+                for key, *values in rows:
+                    result[by_storage_key[key]] = row_to_dict(values)
+        return result
+
+    async def aset(self, context_key: str, data: Mapping[str, Any]) -> None:
+        """Upsert the context for *context_key* (same semantics as the sync ``set``)."""
+        row = {"context_key": self._storage_key(context_key), **row_values(data)}
+        async with self._session_factory() as session:
+            try:
+                stmt = upsert_statement(session.get_bind().dialect.name)
+                if stmt is None:
+                    entity = await session.get(JarvisContextEntity, row["context_key"])
+                    if entity is None:
+                        session.add(JarvisContextEntity(**row))
+                    else:
+                        for field in CONTEXT_FIELDS:
+                            setattr(entity, field, row[field])
+                        entity.version += 1
+                else:
+                    await session.execute(stmt, row)
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    async def adelete(self, context_key: str) -> None:
+        """Remove the context for *context_key* (no-op if not found)."""
+        key = self._storage_key(context_key)
+        async with self._session_factory() as session:
+            try:
+                entity = await session.get(JarvisContextEntity, key)
+                if entity is not None:
+                    await session.delete(entity)
+                    await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
@@ -0,0 +1,182 @@
+# ABOUTME: Versioned schema management for the jarvis database (startup check + explicit migrate).
+# ABOUTME: Run `python -m autobots_agents_jarvis.common.db.migrations` to migrate ahead of a deploy.
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import TYPE_CHECKING
+
+from autobots_devtools_shared_lib.common.observability import get_logger
+from sqlalchemy import create_engine, func, insert, inspect, select, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlmodel import SQLModel
+
+from autobots_agents_jarvis.common.db.models import JarvisContextEntity, JarvisSchemaVersion
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from sqlalchemy.engine import Connection
+
+logger = get_logger(__name__)
+
+# Bump together with a new entry in _MIGRATIONS whenever the table layout changes.
+SCHEMA_VERSION = 4
+
+# pg_advisory_xact_lock key shared by every process migrating the jarvis schema.
+_MIGRATION_LOCK_ID = 0x6A61_7276  # "jarv"
+
+
+# version -> step upgrading an existing database from version - 1. Version 1 is the
+# baseline created by SQLModel.metadata.create_all; fresh databases are created
+# directly at SCHEMA_VERSION and skip the steps.
+def _v2_context_lookup_indexes(conn: Connection) -> None:
+    """Add the (column, context_key) lookup indexes on jarvis_context_store."""
+    for index in JarvisContextEntity.__table__.indexes:  # pyright: ignore[reportAttributeAccessIssue]
+        index.create(conn, checkfirst=True)
+
+
+def _v3_updated_at_index(conn: Connection) -> None:
+    """Add the (updated_at, context_key) index used by TTL purges."""
+    for index in JarvisContextEntity.__table__.indexes:  # pyright: ignore[reportAttributeAccessIssue]
+        if index.name == "ix_jarvis_context_updated_at":
+            index.create(conn, checkfirst=True)
+
+
+def _v4_version_column(conn: Connection) -> None:
+    """Add the optimistic-concurrency ``version`` column (existing rows start at 1).
+
+    Runs under the migration lock; PostgreSQL also gets ``IF NOT EXISTS`` so the
+    step stays idempotent if the column was added outside a locked migrate().
+    """
+    if conn.dialect.name == "postgresql":
+        conn.execute(
+            text(
+                "ALTER TABLE jarvis_context_store "
+                "ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1"
+            )
+        )
+        return
+    columns = {c["name"] for c in inspect(conn).get_columns(JarvisContextEntity.__tablename__)}
+    if "version" not in columns:
+        conn.execute(
+            text("ALTER TABLE jarvis_context_store ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+        )
+
+
+_MIGRATIONS: dict[int, Callable[[Connection], None]] = {
+    2: _v2_context_lookup_indexes,
+    3: _v3_updated_at_index,
+    4: _v4_version_column,
+}
+
+
+def read_schema_version(conn: Connection) -> int:
+    """Return the applied schema version, or 0 when the version table does not exist."""
+    try:
+        version = conn.execute(select(func.max(JarvisSchemaVersion.version))).scalar()
+    except (OperationalError, ProgrammingError):
+        # Missing table; PostgreSQL also needs the aborted transaction rolled back.
+        conn.rollback()
+        return 0
+    return version or 0
+
+
+def migrate(conn: Connection) -> int:
+    """Bring the schema on *conn* up to :data:`SCHEMA_VERSION` and commit.
+
+    Databases created before schema versioning (context table present, no version
+    rows) are treated as version 1. Safe to run concurrently from several
+    processes: the steps run in one transaction under a migration lock (a
+    PostgreSQL advisory lock, ``BEGIN IMMEDIATE`` on SQLite), and the version is
+    re-read once the lock is held, so later processes find the work done.
+
+    Returns:
+        The schema version after migrating.
+    """
+    if conn.in_transaction():
+        conn.rollback()
+    _lock_for_migration(conn)
+    current = _read_schema_version_locked(conn)
+    if current >= SCHEMA_VERSION:
+        conn.commit()
+        return current
+
+    fresh = current == 0 and not inspect(conn).has_table(JarvisContextEntity.__tablename__)
+    SQLModel.metadata.create_all(conn)
+    if not fresh:
+        for version in range(max(current, 1) + 1, SCHEMA_VERSION + 1):
+            logger.info("Applying jarvis schema migration %s", version)
+            _MIGRATIONS[version](conn)
+    conn.execute(insert(JarvisSchemaVersion).values(version=SCHEMA_VERSION))
+    conn.commit()
+    logger.info("Jarvis schema at version %s (was %s)", SCHEMA_VERSION, current)
+    return SCHEMA_VERSION
+
+
+def _lock_for_migration(conn: Connection) -> None:
+    """Hold the cross-process migration lock until the current transaction ends."""
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        conn.execute(
+            text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": _MIGRATION_LOCK_ID}
+        )
+    elif dialect == "sqlite":
+        # Takes the database write lock now; other migrators wait (busy timeout) until commit.
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def _read_schema_version_locked(conn: Connection) -> int:
+    """Like :func:`read_schema_version`, without the rollback that would drop the lock."""
+    if not inspect(conn).has_table(JarvisSchemaVersion.__tablename__):
+        return 0
+    return conn.execute(select(func.max(JarvisSchemaVersion.version))).scalar() or 0
+
+
+def ensure_schema(conn: Connection) -> int:
+    """Startup check: one version lookup when current, otherwise :func:`migrate`."""
+    current = read_schema_version(conn)
+    if current >= SCHEMA_VERSION:
+        if current > SCHEMA_VERSION:
+            logger.warning(
+                "Database schema version %s is newer than this build (%s)", current, SCHEMA_VERSION
+            )
+        return current
+    return migrate(conn)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI entry point: migrate (default) or --check the jarvis schema."""
+    parser = argparse.ArgumentParser(description="Migrate the jarvis database schema.")
+    parser.add_argument("--url", help="SQLAlchemy DSN (default: JARVIS_DATABASE_URL)")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report the schema version; exit 1 when a migration is pending",
+    )
+    args = parser.parse_args(argv)
+
+    database_url = args.url
+    if not database_url:
+        from autobots_agents_jarvis.common.configs.settings import get_app_settings
+
+        database_url = get_app_settings().database_url
+    if not database_url:
+        parser.error("no database URL — pass --url or set JARVIS_DATABASE_URL")
+
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as conn:
+            if args.check:
+                current = read_schema_version(conn)
+                print(f"schema version {current} (expected {SCHEMA_VERSION})")
+                return 0 if current >= SCHEMA_VERSION else 1
+            print(f"schema version {migrate(conn)}")
+            return 0
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,12 @@
 # ABOUTME: SQLModel models for Jarvis context — shared fields in JarvisContextFields.
 # ABOUTME: JarvisContextData (Pydantic) and JarvisContextEntity (ORM table) both extend JarvisContextFields.
+# ABOUTME: JarvisSchemaVersion records applied schema migrations (see migrations.py).
 
 from __future__ import annotations
 
 from datetime import UTC, datetime
 
-from sqlalchemy import Column, DateTime, func
+from sqlalchemy import Column, DateTime, Index, Integer, func, text
 from sqlmodel import Field, SQLModel
 
 
@@ -27,8 +28,23 @@ class JarvisContextEntity(JarvisContextFields, table=True):
     """Persistent ORM table — adds infrastructure fields to JarvisContextFields."""
 
     __tablename__ = "jarvis_context_store"  # pyright: ignore[reportAssignmentType]
+    # (lookup column, context_key) composites serve equality filters and keyset
+    # pagination ordered by context_key from the same index.
+    __table_args__ = (
+        Index("ix_jarvis_context_user_name", "user_name", "context_key"),
+        Index("ix_jarvis_context_session_id", "session_id", "context_key"),
+        Index("ix_jarvis_context_jira_number", "jira_number", "context_key"),
+        Index("ix_jarvis_context_domain_name", "domain_name", "context_key"),
+        # Oldest-first range scans for TTL purge batches.
+        Index("ix_jarvis_context_updated_at", "updated_at", "context_key"),
+    )
 
     context_key: str = Field(primary_key=True)
+    # Bumped on every write; compare-and-swap writes pass the version they read.
+    version: int = Field(
+        default=1,
+        sa_column=Column(Integer, nullable=False, server_default=text("1")),
+    )
     created_at: datetime = Field(
         default=None,
         sa_column=Column(DateTime(timezone=True), server_default=func.now(), nullable=False),
@@ -42,3 +58,15 @@ class JarvisContextEntity(JarvisContextFields, table=True):
             nullable=False,
         ),
     )
+
+
+class JarvisSchemaVersion(SQLModel, table=True):
+    """One row per applied schema version; the max version is the live schema version."""
+
+    __tablename__ = "jarvis_schema_version"  # pyright: ignore[reportAssignmentType]
+
+    version: int = Field(primary_key=True)
+    applied_at: datetime = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now(), nullable=False),
+    )
@@ -3,14 +3,90 @@
 
 from __future__ import annotations
 
+import functools
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
+from sqlalchemy import bindparam, delete, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
 from autobots_agents_jarvis.common.db.models import JarvisContextEntity
+from autobots_agents_jarvis.common.db.statements import (
+    BULK_CHUNK_SIZE,
+    CONTEXT_FIELDS,
+    GET_MANY_STATEMENT,
+    GET_STATEMENT,
+    GET_VERSIONED_STATEMENT,
+    chunked,
+    dialect_insert,
+    row_to_dict,
+    row_values,
+    upsert_statement,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Callable, Iterable, Iterator, Mapping
+    from datetime import datetime
 
     from sqlalchemy.orm import Session, sessionmaker
+    from sqlalchemy.sql import Executable
+
+# Default attempts for :meth:`JarvisContextRepository.modify` before a conflict is surfaced.
+_CAS_MAX_ATTEMPTS = 3
+
+
+class ContextVersionConflictError(RuntimeError):
+    """Raised when a compare-and-swap write finds a row version other than the expected one."""
+
+    def __init__(self, context_key: str, expected_version: int) -> None:
+        self.context_key = context_key
+        self.expected_version = expected_version
+        super().__init__(
+            f"context {context_key!r} is no longer at version {expected_version} (concurrent write)"
+        )
+
+
+@dataclass(slots=True)
+class ContextPage:
+    """One keyset-paginated page of contexts.
+
+    Pass ``next_after`` back as ``after`` to fetch the following page; it is
+    ``None`` on the last page.
+    """
+
+    items: list[tuple[str, dict[str, Any]]]
+    next_after: str | None = None
+
+
+def _cas_update(key: str, expected_version: int, values: Mapping[str, Any]) -> Executable:
+    """Return ``UPDATE ... WHERE context_key = :key AND version = :expected`` bumping the version."""
+    table = JarvisContextEntity.__table__  # pyright: ignore[reportAttributeAccessIssue]
+    return (
+        update(table)
+        .where(table.c.context_key == key, table.c.version == expected_version)
+        .values(**values, version=expected_version + 1, updated_at=func.now())
+    )
+
+
+@functools.cache
+def _patch_statement(dialect_name: str, fields: tuple[str, ...]) -> Executable | None:
+    """Return an upsert writing only *fields*, skipped when they already hold the values.
+
+    The ``DO UPDATE ... WHERE col IS DISTINCT FROM excluded.col`` guard means an
+    unchanged row is not rewritten (no new tuple / WAL record). Cached per field set.
+    """
+    insert = dialect_insert(dialect_name)
+    if insert is None:
+        return None
+    table = JarvisContextEntity.__table__  # pyright: ignore[reportAttributeAccessIssue]
+    stmt = insert(table)
+    update_cols: dict[str, Any] = {field: stmt.excluded[field] for field in fields}
+    update_cols["updated_at"] = func.now()
+    update_cols["version"] = table.c.version + 1
+    changed = or_(*(table.c[field].is_distinct_from(stmt.excluded[field]) for field in fields))
+    return stmt.on_conflict_do_update(
+        index_elements=["context_key"], set_=update_cols, where=changed
+    )
 
 
 class JarvisContextRepository:
@@ -20,6 +96,11 @@ class JarvisContextRepository:
     and rolls back on any exception. When *prefix* is set, the same prefix
     is applied to the storage key so DB keys align with CacheBackedContextStore
     (e.g. cache and DB both use ``{prefix}_{context_key}``).
+
+    With *read_session_factory* (e.g. :func:`get_read_session_factory` over the
+    read replicas) get/get_many and the find_by queries run there, unless the
+    caller asks for ``primary=True``; writes and the version reads that guard
+    compare-and-swap writes always use *session_factory*.
     """
 
     def __init__(
@@ -27,8 +108,10 @@ class JarvisContextRepository:
         session_factory: sessionmaker[Session],
         *,
         prefix: str = "",
+        read_session_factory: Callable[[], Session] | None = None,
     ) -> None:
         self._session_factory = session_factory
+        self._read_session_factory = read_session_factory or session_factory
         self._prefix = prefix
 
     def _storage_key(self, context_key: str) -> str:
@@ -37,61 +120,426 @@ class JarvisContextRepository:
             return context_key
         return f"{self._prefix}_{context_key}"
 
-    def get(self, context_key: str) -> dict[str, Any] | None:
-        """Return the stored context for *context_key*, or ``None`` if not found."""
+    def _reader(self, primary: bool) -> Callable[[], Session]:
+        """Return the session factory for a read (replicas unless *primary*)."""
+        return self._session_factory if primary else self._read_session_factory
+
+    def get(self, context_key: str, *, primary: bool = False) -> dict[str, Any] | None:
+        """Return the stored context for *context_key*, or ``None`` if not found.
+
+        Reads the five context columns with a cached Core ``SELECT``; no ORM
+        entity is built. *primary* skips the read replicas (read-your-writes).
+        """
+        key = self._storage_key(context_key)
+        with self._reader(primary)() as session:
+            row = session.connection().execute(GET_STATEMENT, {"context_key": key}).first()
+        return None if row is None else row_to_dict(row)
+
+    def get_with_version(self, context_key: str) -> tuple[dict[str, Any], int] | None:
+        """Return ``(context, version)`` for *context_key*, or ``None`` if not found.
+
+        Pass the version back as ``expected_version`` to :meth:`set` or :meth:`patch`
+        to make the write conditional on nobody having written in between.
+        """
         key = self._storage_key(context_key)
         with self._session_factory() as session:
-            entity = session.get(JarvisContextEntity, key)
-            if entity is None:
-                return None
-            return {
-                k: v
-                for k, v in {
-                    "domain_name": entity.domain_name,
-                    "user_name": entity.user_name,
-                    "repo_name": entity.repo_name,
-                    "session_id": entity.session_id,
-                    "jira_number": entity.jira_number,
-                }.items()
-                if v is not None
-            }
-
-    def set(self, context_key: str, data: Mapping[str, Any]) -> None:
+            row = (
+                session.connection().execute(GET_VERSIONED_STATEMENT, {"context_key": key}).first()
+            )
+        if row is None:
+            return None
+        *values, version = row
+        return row_to_dict(values), version
+
+    def get_many(
+        self, context_keys: Iterable[str], *, primary: bool = False
+    ) -> dict[str, dict[str, Any]]:
+        """Return stored contexts for *context_keys* in a single session.
+
+        Keys are resolved with one ``SELECT ... WHERE context_key IN (...)`` per
+        chunk of :data:`BULK_CHUNK_SIZE` keys. Missing keys are omitted from the
+        result, which is keyed by the caller's (unprefixed) context keys.
+        *primary* skips the read replicas.
+        """
+        by_storage_key = {self._storage_key(k): k for k in context_keys}
+        if not by_storage_key:
+            return {}
+        result: dict[str, dict[str, Any]] = {}
+        with self._reader(primary)() as session:
+            conn = session.connection()
+            for chunk in chunked(list(by_storage_key)):
+                for key, *values in conn.execute(GET_MANY_STATEMENT, {"context_keys": chunk}):
+                    result[by_storage_key[key]] = row_to_dict(values)
+        return result
+
+    def set(
+        self,
+        context_key: str,
+        data: Mapping[str, Any],
+        *,
+        expected_version: int | None = None,
+    ) -> None:
         """Upsert the context for *context_key*.
 
         Persists domain_name, user_name, repo_name, jira_number, session_id.
         Unknown keys are silently ignored.
         ``user_id`` is accepted as an alias for ``user_name``.
+
+        On PostgreSQL and SQLite this is a single ``INSERT ... ON CONFLICT DO UPDATE``
+        statement that bypasses the ORM unit of work (no prior ``SELECT``).
+
+        With *expected_version* the write is a compare-and-swap: ``0`` means the
+        row must not exist yet, any other value must match the stored version
+        (see :meth:`get_with_version`).
+
+        Raises:
+            ContextVersionConflictError: If *expected_version* no longer matches.
         """
-        domain_name = data.get("domain_name")
-        user_name = data.get("user_name") or data.get("user_id")
-        repo_name = data.get("repo_name")
-        jira_number = data.get("jira_number")
-        session_id = data.get("session_id")
-        key = self._storage_key(context_key)
+        row = {"context_key": self._storage_key(context_key), **row_values(data)}
         with self._session_factory() as session:
             try:
-                entity = session.get(JarvisContextEntity, key)
+                if expected_version is None:
+                    self._upsert_rows(session, [row])
+                else:
+                    self._compare_and_set(session, row, expected_version)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+
+    def set_many(self, data_by_key: Mapping[str, Mapping[str, Any]]) -> None:
+        """Upsert several contexts in one transaction.
+
+        Uses a batched ``INSERT ... ON CONFLICT (context_key) DO UPDATE`` on
+        PostgreSQL and SQLite; other dialects fall back to per-row ``merge``
+        inside the same transaction. Field handling matches :meth:`set`.
+        """
+        rows = [
+            {"context_key": self._storage_key(k), **row_values(v)} for k, v in data_by_key.items()
+        ]
+        if not rows:
+            return
+        with self._session_factory() as session:
+            try:
+                for chunk in chunked(rows):
+                    self._upsert_rows(session, chunk)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+
+    @staticmethod
+    def _upsert_rows(session: Session, rows: list[dict[str, Any]]) -> None:
+        """Issue a dialect-native upsert for *rows* on *session*."""
+        stmt = upsert_statement(session.get_bind().dialect.name)
+        if stmt is None:
+            for row in rows:
+                entity = session.get(JarvisContextEntity, row["context_key"])
                 if entity is None:
-                    entity = JarvisContextEntity(
-                        context_key=key,
-                        domain_name=domain_name,
-                        user_name=user_name,
-                        repo_name=repo_name,
-                        jira_number=jira_number,
-                        session_id=session_id,
-                    )
-                    session.add(entity)
+                    session.add(JarvisContextEntity(**row))
+                    continue
+                for field in CONTEXT_FIELDS:
+                    setattr(entity, field, row[field])
+                entity.version += 1
+            return
+        # A single parameter set executes once; a list uses the driver's batched
+        # executemany (insertmanyvalues), so N rows stay one round-trip per batch.
+        session.execute(stmt, rows[0] if len(rows) == 1 else rows)
+
+    @staticmethod
+    def _compare_and_set(session: Session, row: dict[str, Any], expected_version: int) -> None:
+        """Insert (``expected_version == 0``) or conditionally update *row*."""
+        key = row["context_key"]
+        if expected_version == 0:
+            if session.get(JarvisContextEntity, key) is not None:
+                raise ContextVersionConflictError(key, expected_version)
+            session.add(JarvisContextEntity(**row))
+            try:
+                session.flush()
+            except IntegrityError as exc:
+                raise ContextVersionConflictError(key, expected_version) from exc
+            return
+        values = {f: row[f] for f in CONTEXT_FIELDS}
+        result = session.execute(_cas_update(key, expected_version, values))
+        if result.rowcount == 0:  # pyright: ignore[reportAttributeAccessIssue]
+            raise ContextVersionConflictError(key, expected_version)
+
+    def modify(
+        self,
+        context_key: str,
+        mutate: Callable[[dict[str, Any]], Mapping[str, Any]],
+        *,
+        max_attempts: int = _CAS_MAX_ATTEMPTS,
+    ) -> dict[str, Any]:
+        """Read-modify-write *context_key* with optimistic concurrency.
+
+        *mutate* receives a copy of the current context (``{}`` when missing) and
+        returns the new one, which is written with :meth:`set` conditioned on the
+        version that was read. On a concurrent write the read and *mutate* are
+        retried, up to *max_attempts* times in total, so *mutate* must be free of
+        side effects.
+
+        Returns:
+            The context as written.
+
+        Raises:
+            ContextVersionConflictError: If every attempt lost the race.
+        """
+        if max_attempts <= 0:
+            msg = "max_attempts must be positive"
+            raise ValueError(msg)
+        for _ in range(max_attempts - 1):
+            try:
+                return self._modify_once(context_key, mutate)
+            except ContextVersionConflictError:
+                continue
+        return self._modify_once(context_key, mutate)
+
+    def _modify_once(
+        self, context_key: str, mutate: Callable[[dict[str, Any]], Mapping[str, Any]]
+    ) -> dict[str, Any]:
+        """Single read / mutate / compare-and-set round for :meth:`modify`."""
+        data, version = self.get_with_version(context_key) or ({}, 0)
+        new_data = dict(mutate(dict(data)))
+        self.set(context_key, new_data, expected_version=version)
+        return new_data
+
+    def patch(
+        self,
+        context_key: str,
+        fields: Mapping[str, Any],
+        *,
+        expected_version: int | None = None,
+    ) -> bool:
+        """Write only the provided context columns for *context_key*.
+
+        Unlike :meth:`set`, columns absent from *fields* are left untouched, so
+        callers need not read-modify-write the full record. The row is created
+        when missing; when every provided column already holds its value the
+        write is skipped entirely. Unknown keys are ignored and ``user_id`` is
+        accepted as an alias for ``user_name``.
+
+        With *expected_version* the patch only applies to an existing row at
+        that version (it neither creates the row nor skips unchanged values).
+
+        Returns:
+            ``True`` if a row was inserted or updated, ``False`` if nothing changed.
+
+        Raises:
+            ContextVersionConflictError: If *expected_version* no longer matches.
+        """
+        values = {f: fields[f] for f in CONTEXT_FIELDS if f in fields}
+        if "user_name" not in values and "user_id" in fields:
+            values["user_name"] = fields["user_id"]
+        if not values:
+            return False
+        key = self._storage_key(context_key)
+        with self._session_factory() as session:
+            try:
+                stmt = _patch_statement(session.get_bind().dialect.name, tuple(sorted(values)))
+                if expected_version is not None:
+                    changed = self._compare_and_patch(session, key, values, expected_version)
+                elif stmt is None:
+                    changed = self._patch_orm(session, key, values)
                 else:
-                    entity.domain_name = domain_name
-                    entity.user_name = user_name
-                    entity.repo_name = repo_name
-                    entity.jira_number = jira_number
-                    entity.session_id = session_id
+                    result = session.execute(stmt, {"context_key": key, **values})
+                    changed = result.rowcount > 0  # pyright: ignore[reportAttributeAccessIssue]
                 session.commit()
             except Exception:
                 session.rollback()
                 raise
+        return changed
+
+    @staticmethod
+    def _compare_and_patch(
+        session: Session, key: str, values: dict[str, Any], expected_version: int
+    ) -> bool:
+        """Apply *values* only if the row is still at *expected_version*."""
+        result = session.execute(_cas_update(key, expected_version, values))
+        if result.rowcount == 0:  # pyright: ignore[reportAttributeAccessIssue]
+            raise ContextVersionConflictError(key, expected_version)
+        return True
+
+    @staticmethod
+    def _patch_orm(session: Session, key: str, values: dict[str, Any]) -> bool:
+        """ORM fallback for :meth:`patch` on dialects without native upsert."""
+        entity = session.get(JarvisContextEntity, key)
+        if entity is None:
+            session.add(JarvisContextEntity(context_key=key, **values))
+            return True
+        changed = {f: v for f, v in values.items() if getattr(entity, f) != v}
+        for field, value in changed.items():
+            setattr(entity, field, value)
+        if changed:
+            entity.version += 1
+        return bool(changed)
+
+    # ------------------------------------------------------------------
+    # Query API (indexed lookups, keyset-paginated by context_key)
+    # ------------------------------------------------------------------
+
+    def find_by_user(
+        self, user_name: str, *, after: str | None = None, limit: int = 100
+    ) -> ContextPage:
+        """Return contexts whose ``user_name`` equals *user_name*."""
+        return self._find_by("user_name", user_name, after=after, limit=limit)
+
+    def find_by_session(
+        self, session_id: str, *, after: str | None = None, limit: int = 100
+    ) -> ContextPage:
+        """Return contexts whose ``session_id`` equals *session_id*."""
+        return self._find_by("session_id", session_id, after=after, limit=limit)
+
+    def find_by_jira(
+        self, jira_number: str, *, after: str | None = None, limit: int = 100
+    ) -> ContextPage:
+        """Return contexts whose ``jira_number`` equals *jira_number*."""
+        return self._find_by("jira_number", jira_number, after=after, limit=limit)
+
+    def find_by_domain(
+        self, domain_name: str, *, after: str | None = None, limit: int = 100
+    ) -> ContextPage:
+        """Return contexts whose ``domain_name`` equals *domain_name*."""
+        return self._find_by("domain_name", domain_name, after=after, limit=limit)
+
+    def _find_by(self, column: str, value: str, *, after: str | None, limit: int) -> ContextPage:
+        """Keyset query on the ``(column, context_key)`` index.
+
+        *after* is a context key (as returned in a previous page); rows are
+        ordered by context_key so each page is an index range scan, independent
+        of how deep the caller has paged. With a repository prefix, only keys
+        under that prefix are returned and keys are reported without it.
+        """
+        if limit <= 0:
+            msg = "limit must be positive"
+            raise ValueError(msg)
+        table = JarvisContextEntity.__table__  # pyright: ignore[reportAttributeAccessIssue]
+        stmt = select(table).where(table.c[column] == value)
+        if self._prefix:
+            stmt = stmt.where(table.c.context_key.startswith(f"{self._prefix}_", autoescape=True))
+        if after is not None:
+            stmt = stmt.where(table.c.context_key > self._storage_key(after))
+        stmt = stmt.order_by(table.c.context_key).limit(limit + 1)
+
+        with self._read_session_factory() as session:
+            rows = session.execute(stmt).mappings().all()
+
+        strip = len(self._prefix) + 1 if self._prefix else 0
+        items = [
+            (
+                row["context_key"][strip:],
+                {f: row[f] for f in CONTEXT_FIELDS if row[f] is not None},
+            )
+            for row in rows[:limit]
+        ]
+        next_after = items[-1][0] if len(rows) > limit else None
+        return ContextPage(items=items, next_after=next_after)
+
+    # ------------------------------------------------------------------
+    # Cache warm-up
+    # ------------------------------------------------------------------
+
+    def iter_recent(
+        self, limit: int, *, key_prefix: str = "", page_size: int = BULK_CHUNK_SIZE
+    ) -> Iterator[dict[str, dict[str, Any]]]:
+        """Stream up to *limit* contexts, most recently updated first, one page at a time.
+
+        Pages are keyset-paginated on the ``(updated_at, context_key)`` index
+        (walked backwards), so each page is a bounded index range scan and no
+        OFFSET or server-side cursor is held between pages. Each page is read in
+        its own short session from the read factory. Only keys starting with
+        *key_prefix* (under the repository prefix) are returned; keys are
+        reported without the repository prefix.
+
+        Yields:
+            ``{context_key: data}`` for each page of at most *page_size* rows.
+        """
+        if page_size <= 0:
+            msg = "page_size must be positive"
+            raise ValueError(msg)
+        table = JarvisContextEntity.__table__  # pyright: ignore[reportAttributeAccessIssue]
+        base = select(table.c.context_key, *(table.c[f] for f in CONTEXT_FIELDS))
+        match_prefix = self._storage_key(key_prefix)
+        if match_prefix:
+            base = base.where(table.c.context_key.startswith(match_prefix, autoescape=True))
+        base = base.order_by(table.c.updated_at.desc(), table.c.context_key.desc())
+        strip = len(self._prefix) + 1 if self._prefix else 0
+        # The cursor compares against the last row's stored updated_at (a primary-key
+        # lookup) rather than a round-tripped datetime, whose text form need not match
+        # what SQLite stored. A cursor row deleted meanwhile simply ends the scan.
+        cursor_key = bindparam("cursor_key")
+        cursor_ts = (
+            select(table.c.updated_at).where(table.c.context_key == cursor_key).scalar_subquery()
+        )
+        after_cursor = base.where(
+            or_(
+                table.c.updated_at < cursor_ts,
+                (table.c.updated_at == cursor_ts) & (table.c.context_key < cursor_key),
+            )
+        )
+        remaining = limit
+        last_key: str | None = None
+        while remaining > 0:
+            stmt = base if last_key is None else after_cursor
+            with self._read_session_factory() as session:
+                rows = session.execute(
+                    stmt.limit(min(page_size, remaining)), {"cursor_key": last_key}
+                ).all()
+            if not rows:
+                return
+            yield {row[0][strip:]: row_to_dict(row[1:]) for row in rows}
+            remaining -= len(rows)
+            last_key = rows[-1][0]
+
+    # ------------------------------------------------------------------
+    # TTL purge
+    # ------------------------------------------------------------------
+
+    def purge_expired(
+        self, older_than: datetime, *, batch_size: int = BULK_CHUNK_SIZE
+    ) -> Iterator[list[str]]:
+        """Delete rows last updated before *older_than*, one bounded batch at a time.
+
+        Each batch selects up to *batch_size* of the oldest expired keys via the
+        ``(updated_at, context_key)`` index and deletes them in its own short
+        transaction, so no long-running lock is held. The delete re-checks
+        ``updated_at`` so rows written after selection survive. Yields the
+        (unprefixed) keys deleted in each batch; iteration ends when no expired
+        rows remain.
+        """
+        if batch_size <= 0:
+            msg = "batch_size must be positive"
+            raise ValueError(msg)
+        table = JarvisContextEntity.__table__  # pyright: ignore[reportAttributeAccessIssue]
+        expired = table.c.updated_at < older_than
+        if self._prefix:
+            expired = expired & table.c.context_key.startswith(f"{self._prefix}_", autoescape=True)
+        select_stmt = (
+            select(table.c.context_key)
+            .where(expired)
+            .order_by(table.c.updated_at, table.c.context_key)
+            .limit(batch_size)
+        )
+        strip = len(self._prefix) + 1 if self._prefix else 0
+        while True:
+            with self._session_factory() as session:
+                try:
+                    keys = list(session.scalars(select_stmt))
+                    if not keys:
+                        return
+                    result = session.execute(
+                        delete(table).where(table.c.context_key.in_(keys), expired)
+                    )
+                    session.commit()
+                except Exception:
+                    session.rollback()
+                    raise
+            deleted = [k[strip:] for k in keys]
+            if result.rowcount != len(keys):  # pyright: ignore[reportAttributeAccessIssue]
+                # Some rows were refreshed between select and delete; report only the gone ones.
+                still_present = self.get_many(deleted, primary=True)
+                deleted = [k for k in deleted if k not in still_present]
+            yield deleted
 
     def delete(self, context_key: str) -> None:
         """Remove the context for *context_key* (no-op if not found)."""
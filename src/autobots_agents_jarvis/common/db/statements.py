@@ -0,0 +1,101 @@
+# ABOUTME: SQL building blocks shared by the sync and async context repositories.
+# ABOUTME: Column list, cached Core read/upsert statements and row <-> dict conversion.
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import bindparam, func, select
+
+from autobots_agents_jarvis.common.db.models import JarvisContextEntity
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from sqlalchemy.sql import Executable
+
+# User-facing columns persisted for each context row (order matches JarvisContextFields).
+CONTEXT_FIELDS = ("domain_name", "user_name", "repo_name", "session_id", "jira_number")
+
+# Upper bound on keys per IN (...) list / upsert batch; keeps bulk calls
+# well under driver bind-parameter limits (SQLite defaults to 999 on older builds).
+BULK_CHUNK_SIZE = 500
+
+
+def _read_statements() -> tuple[Executable, Executable, Executable]:
+    """Build the Core reads used on the hot lookup path.
+
+    They select only the user-facing columns (no ORM entity, identity map or
+    timestamp columns) and use bound / expanding parameters, so each statement
+    is compiled once and then served from SQLAlchemy's compiled cache.
+    """
+    table = JarvisContextEntity.__table__  # pyright: ignore[reportAttributeAccessIssue]
+    columns = [table.c[field] for field in CONTEXT_FIELDS]
+    by_key = table.c.context_key == bindparam("context_key")
+    return (
+        select(*columns).where(by_key),
+        select(*columns, table.c.version).where(by_key),
+        select(table.c.context_key, *columns).where(
+            table.c.context_key.in_(bindparam("context_keys", expanding=True))
+        ),
+    )
+
+
+# Module-level so every repository instance shares the same cache keys.
+GET_STATEMENT, GET_VERSIONED_STATEMENT, GET_MANY_STATEMENT = _read_statements()
+
+
+def chunked(items: list[Any], size: int = BULK_CHUNK_SIZE) -> Iterable[list[Any]]:
+    """Yield successive *size*-length slices of *items*."""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def row_to_dict(values: Iterable[Any]) -> dict[str, Any]:
+    """Zip a Core row of :data:`CONTEXT_FIELDS` values into a dict, omitting ``None``."""
+    return {
+        field: value
+        for field, value in zip(CONTEXT_FIELDS, values, strict=True)
+        if value is not None
+    }
+
+
+def row_values(data: Mapping[str, Any]) -> dict[str, Any]:
+    """Map an input context dict onto the persisted columns.
+
+    Unknown keys are dropped; ``user_id`` is accepted as an alias for ``user_name``.
+    """
+    values = {field: data.get(field) for field in CONTEXT_FIELDS}
+    values["user_name"] = data.get("user_name") or data.get("user_id")
+    return values
+
+
+def dialect_insert(dialect_name: str) -> Any | None:
+    """Return the dialect's ``insert`` construct supporting ON CONFLICT, or ``None``."""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+@functools.cache
+def upsert_statement(dialect_name: str) -> Executable | None:
+    """Return the ``INSERT ... ON CONFLICT DO UPDATE`` statement for *dialect_name*.
+
+    Built once per dialect so the compiled form is reused from SQLAlchemy's
+    statement cache. Returns ``None`` for dialects without native upsert.
+    """
+    insert = dialect_insert(dialect_name)
+    if insert is None:
+        return None
+
+    stmt = insert(JarvisContextEntity)
+    # ON CONFLICT bypasses Column.onupdate, so refresh updated_at explicitly.
+    update_cols: dict[str, Any] = {field: stmt.excluded[field] for field in CONTEXT_FIELDS}
+    update_cols["updated_at"] = func.now()
+    update_cols["version"] = JarvisContextEntity.__table__.c.version + 1  # pyright: ignore[reportAttributeAccessIssue]
+    return stmt.on_conflict_do_update(index_elements=["context_key"], set_=update_cols)
@@ -0,0 +1,147 @@
+# ABOUTME: Process-level cache of compiled dynagent graphs, shared by every chat session of a domain.
+# ABOUTME: Keyed by (domain, state schema, agent-config hash); chat end releases a thread's checkpoints.
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from autobots_devtools_shared_lib.common.observability import get_logger
+
+from autobots_agents_jarvis.common.services.single_flight import SingleFlight
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = get_logger(__name__)
+
+# (domain, state schema path, agent config hash) -> compiled agent graph and its checkpointer.
+_AGENTS: dict[tuple[str, str, str], Any] = {}
+_CHECKPOINTERS: dict[tuple[str, str, str], Any] = {}
+_LOCK = threading.Lock()
+_FLIGHT = SingleFlight()
+_HITS = 0
+_BUILDS = 0
+_BUILD_SECONDS = 0.0
+
+
+@functools.lru_cache(maxsize=16)
+def _hash_config_dir(config_dir: str) -> str:
+    digest = hashlib.sha256()
+    root = Path(config_dir)
+    for path in sorted(p for p in root.rglob("*") if p.is_file()):
+        digest.update(path.relative_to(root).as_posix().encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def agent_config_hash(config_dir: str | Path | None = None) -> str:
+    """Return a short content hash of the agent config tree (agents.yaml, prompts, schemas).
+
+    Defaults to DYNAGENT_CONFIG_ROOT_DIR. The hash is computed once per directory
+    per process (configs are not hot-reloaded); :func:`clear_agent_cache` resets it.
+    """
+    if config_dir is None:
+        from autobots_devtools_shared_lib.dynagent.config.dynagent_settings import (
+            get_dynagent_settings,
+        )
+
+        config_dir = get_dynagent_settings().dynagent_config_root_dir
+    return _hash_config_dir(str(Path(config_dir).resolve()))
+
+
+def get_base_agent(
+    domain: str,
+    *,
+    state_schema: type[Any],
+    build: Callable[[Any], Any] | None = None,
+) -> Any:
+    """Return the compiled base agent for *domain*, building it on first use.
+
+    One instance serves every chat session of the process; concurrent first
+    calls share a single build. The graph's checkpointer is shared too and keeps
+    each conversation's checkpoints under its ``thread_id``, so servers must call
+    :func:`release_agent_thread` when a chat ends or the checkpoints of every
+    session ever opened stay in memory.
+
+    Args:
+        domain: Domain / app name (e.g. ``concierge_chat``).
+        state_schema: Agent state class passed to ``create_base_agent``.
+        build: Factory taking the checkpointer to compile with; defaults to
+            ``create_base_agent(checkpointer=checkpointer, state_schema=state_schema)``.
+
+    Returns:
+        The cached compiled agent graph.
+    """
+    global _HITS
+    key = (domain, f"{state_schema.__module__}.{state_schema.__qualname__}", agent_config_hash())
+    agent = _AGENTS.get(key)
+    if agent is not None:
+        with _LOCK:
+            _HITS += 1
+        return agent
+    return _FLIGHT.do(key, lambda: _build(key, state_schema, build))
+
+
+def _build(
+    key: tuple[str, str, str], state_schema: type[Any], build: Callable[[Any], Any] | None
+) -> Any:
+    global _BUILDS, _BUILD_SECONDS
+    agent = _AGENTS.get(key)
+    if agent is not None:  # built by a flight that finished just before this one started
+        return agent
+    if build is None:
+        from autobots_devtools_shared_lib.dynagent import create_base_agent
+
+        def build(checkpointer: Any) -> Any:
+            return create_base_agent(checkpointer=checkpointer, state_schema=state_schema)
+
+    from langgraph.checkpoint.memory import InMemorySaver
+
+    checkpointer = InMemorySaver()
+    started = time.perf_counter()
+    agent = build(checkpointer)
+    elapsed = time.perf_counter() - started
+    with _LOCK:
+        _AGENTS[key] = agent
+        _CHECKPOINTERS[key] = checkpointer
+        _BUILDS += 1
+        _BUILD_SECONDS += elapsed
+    logger.info("Built base agent for %s (config %s) in %.0f ms", key[0], key[2], elapsed * 1000)
+    return agent
+
+
+def release_agent_thread(thread_id: str) -> None:
+    """Drop the checkpoints of conversation *thread_id* from every cached agent (call on chat end)."""
+    with _LOCK:
+        checkpointers = list(_CHECKPOINTERS.values())
+    for checkpointer in checkpointers:
+        checkpointer.delete_thread(thread_id)
+
+
+def agent_cache_stats() -> dict[str, Any]:
+    """Return ``hits``, ``builds``, cached ``size`` and total ``build_seconds``."""
+    with _LOCK:
+        return {
+            "hits": _HITS,
+            "builds": _BUILDS,
+            "size": len(_AGENTS),
+            "build_seconds": _BUILD_SECONDS,
+        }
+
+
+def clear_agent_cache() -> None:
+    """Drop every cached agent and config hash (tests, or after editing agent configs)."""
+    global _HITS, _BUILDS, _BUILD_SECONDS
+    with _LOCK:
+        _AGENTS.clear()
+        _CHECKPOINTERS.clear()
+        _HITS = _BUILDS = 0
+        _BUILD_SECONDS = 0.0
+    _hash_config_dir.cache_clear()
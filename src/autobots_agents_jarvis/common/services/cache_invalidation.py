@@ -0,0 +1,198 @@
+# ABOUTME: Cross-process L1 cache invalidation over Redis pub/sub (fakeredis works as a local stand-in).
+# ABOUTME: Writers publish changed keys in batches; every subscriber evicts them, and flushes its L1 on reconnect.
+
+from __future__ import annotations
+
+import json
+import threading
+import uuid
+from typing import TYPE_CHECKING, Any
+
+from autobots_devtools_shared_lib.common.observability import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+logger = get_logger(__name__)
+
+DEFAULT_INVALIDATION_CHANNEL = "jarvis:context:invalidate"
+
+
+class RedisInvalidationBus:
+    """Broadcast L1 evictions between processes sharing one Redis.
+
+    :meth:`publish` only queues keys; a publisher thread sends them every
+    *batch_interval* seconds as one message of up to *max_batch* keys, so a write
+    burst costs a handful of PUBLISH calls instead of one per write. Each message
+    carries this bus's origin id, and a process ignores its own messages (its L1
+    was already updated by the write).
+
+    A subscriber thread calls *on_invalidate* with the keys of every foreign
+    message. Pub/sub is fire-and-forget, so whenever the subscription is
+    (re-)established *on_reset* is called to drop the whole L1: anything
+    published while disconnected was missed.
+
+    Args:
+        client: A ``redis.Redis`` (or ``fakeredis.FakeRedis``) client.
+        channel: Pub/sub channel shared by all processes using the same cache.
+        batch_interval: Seconds to let a burst accumulate before publishing.
+        max_batch: Upper bound on keys per message.
+        reconnect_delay: Seconds to wait before re-subscribing after an error.
+        poll_interval: Subscriber read timeout; bounds how long :meth:`close` waits.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        channel: str = DEFAULT_INVALIDATION_CHANNEL,
+        batch_interval: float = 0.01,
+        max_batch: int = 500,
+        reconnect_delay: float = 1.0,
+        poll_interval: float = 0.5,
+    ) -> None:
+        self._client = client
+        self._channel = channel
+        self._batch_interval = batch_interval
+        self._max_batch = max_batch
+        self._reconnect_delay = reconnect_delay
+        self._poll_interval = poll_interval
+        self._origin = uuid.uuid4().hex
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._subscribed = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._keys_queued = 0
+        self._messages_published = 0
+        self._publish_errors = 0
+        self._keys_received = 0
+        self._subscriptions = 0
+
+    def start(
+        self, on_invalidate: Callable[[list[str]], None], on_reset: Callable[[], None]
+    ) -> None:
+        """Start the publisher and subscriber threads (call once)."""
+        self._threads = [
+            threading.Thread(
+                target=self._publish_loop, name="jarvis-l1-invalidation-pub", daemon=True
+            ),
+            threading.Thread(
+                target=self._subscribe_loop,
+                args=(on_invalidate, on_reset),
+                name="jarvis-l1-invalidation-sub",
+                daemon=True,
+            ),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def wait_subscribed(self, timeout: float | None = None) -> bool:
+        """Block until the subscriber is listening; return False on timeout."""
+        return self._subscribed.wait(timeout)
+
+    def publish(self, keys: Iterable[str]) -> None:
+        """Queue *keys* for invalidation in other processes."""
+        with self._lock:
+            before = len(self._pending)
+            self._pending.update(keys)
+            self._keys_queued += len(self._pending) - before
+        self._wake.set()
+
+    def flush(self) -> int:
+        """Publish all queued keys now; return the number of messages sent."""
+        with self._lock:
+            keys, self._pending = sorted(self._pending), set()
+        sent = 0
+        for start in range(0, len(keys), self._max_batch):
+            payload = json.dumps(
+                {"origin": self._origin, "keys": keys[start : start + self._max_batch]}
+            )
+            try:
+                self._client.publish(self._channel, payload)
+            except Exception:
+                # Lost invalidations fall back to the L1 TTL in the other processes.
+                logger.exception("Failed to publish %d L1 invalidations", len(keys))
+                with self._lock:
+                    self._publish_errors += 1
+                continue
+            sent += 1
+        with self._lock:
+            self._messages_published += sent
+        return sent
+
+    def close(self) -> None:
+        """Publish what is still queued and stop both threads."""
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+        self.flush()
+
+    def stats(self) -> dict[str, int]:
+        """Return publish / receive counters (keys_queued counts distinct keys per batch)."""
+        with self._lock:
+            return {
+                "keys_queued": self._keys_queued,
+                "messages_published": self._messages_published,
+                "publish_errors": self._publish_errors,
+                "keys_received": self._keys_received,
+                "subscriptions": self._subscriptions,
+            }
+
+    # ------------------------------------------------------------------
+    # Threads
+    # ------------------------------------------------------------------
+
+    def _publish_loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait()
+            # Let the rest of a write burst land in the same message.
+            self._stop.wait(self._batch_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _subscribe_loop(
+        self, on_invalidate: Callable[[list[str]], None], on_reset: Callable[[], None]
+    ) -> None:
+        while not self._stop.is_set():
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self._channel)
+                # Messages sent before (or between) subscriptions were missed.
+                on_reset()
+                with self._lock:
+                    self._subscriptions += 1
+                self._subscribed.set()
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=self._poll_interval)
+                    if message is not None:
+                        self._handle(message.get("data"), on_invalidate)
+            except Exception:
+                self._subscribed.clear()
+                logger.warning(
+                    "L1 invalidation subscriber disconnected; retrying in %.1fs",
+                    self._reconnect_delay,
+                    exc_info=True,
+                )
+                self._stop.wait(self._reconnect_delay)
+            finally:
+                try:
+                    pubsub.close()
+                except Exception:
+                    logger.debug("Error closing pub/sub connection", exc_info=True)
+
+    def _handle(self, data: Any, on_invalidate: Callable[[list[str]], None]) -> None:
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning("Ignoring malformed L1 invalidation message: %r", data)
+            return
+        if message.get("origin") == self._origin:
+            return
+        keys = list(message.get("keys") or [])
+        with self._lock:
+            self._keys_received += len(keys)
+        on_invalidate(keys)
@@ -0,0 +1,211 @@
+# ABOUTME: Pluggable byte codecs for context values stored in Redis (JSON, compact struct, msgpack, zstd).
+# ABOUTME: Binary formats start with a tag byte; every decoder still reads plain JSON so codecs can be switched live.
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any, Protocol
+
+from autobots_agents_jarvis.common.db.models import JarvisContextFields
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+# Fixed schema: field order defines the positional layout of the compact and msgpack formats.
+# Never reorder; append new fields at the end.
+_SCHEMA_FIELDS: tuple[str, ...] = tuple(JarvisContextFields.model_fields)
+
+# First byte of each binary format. JSON objects always start with "{" (0x7B).
+_TAG_COMPACT = 0x01
+_TAG_MSGPACK = 0x02
+_TAG_ZSTD = 0x03
+_JSON_START = ord("{")
+
+CODEC_NAMES = ("json", "compact", "msgpack")
+
+
+class ContextCodec(Protocol):
+    """Encodes a context dict to bytes for Redis and back."""
+
+    def encode(self, data: Mapping[str, Any]) -> bytes:  # pragma: no cover - Protocol
+        """Return the wire form of *data*."""
+        ...
+
+    def decode(self, payload: bytes) -> dict[str, Any]:  # pragma: no cover - Protocol
+        """Return the context dict encoded in *payload*."""
+        ...
+
+
+def _json_encode(data: Mapping[str, Any]) -> bytes:
+    return json.dumps(dict(data), separators=(",", ":")).encode()
+
+
+def _is_schema_only(data: Mapping[str, Any]) -> bool:
+    """Return True when *data* holds only schema fields with str / None values."""
+    return all(k in _SCHEMA_FIELDS and (v is None or isinstance(v, str)) for k, v in data.items())
+
+
+class JsonCodec:
+    """The shared-lib RedisContextStore format (``json.dumps`` of the dict)."""
+
+    def encode(self, data: Mapping[str, Any]) -> bytes:
+        return json.dumps(dict(data)).encode()
+
+    def decode(self, payload: bytes) -> dict[str, Any]:
+        if payload[:1] != b"{":
+            return _decode_foreign(payload)
+        return json.loads(payload)
+
+
+class CompactCodec:
+    """Schema-positional binary format with no field names on the wire (stdlib only).
+
+    Layout: tag byte, presence bitmap (one bit per JarvisContextFields field), then
+    for each present field a one-byte (<128) or two-byte length and its UTF-8 bytes.
+    Contexts carrying keys outside the schema (or non-string values) are stored as
+    compact JSON instead, so any dict round-trips. ``None`` values are not stored.
+    """
+
+    def encode(self, data: Mapping[str, Any]) -> bytes:
+        if not _is_schema_only(data):
+            return _json_encode(data)
+        bitmap = 0
+        out = bytearray(2)
+        for bit, field in enumerate(_SCHEMA_FIELDS):
+            value = data.get(field)
+            if value is None:
+                continue
+            raw = value.encode()
+            size = len(raw)
+            if size >= 0x8000:
+                return _json_encode(data)
+            bitmap |= 1 << bit
+            if size < 0x80:
+                out.append(size)
+            else:
+                out += bytes((0x80 | (size >> 8), size & 0xFF))
+            out += raw
+        out[0] = _TAG_COMPACT
+        out[1] = bitmap
+        return bytes(out)
+
+    def decode(self, payload: bytes) -> dict[str, Any]:
+        if payload[0] != _TAG_COMPACT:
+            return _decode_foreign(payload)
+        bitmap = payload[1]
+        pos = 2
+        result: dict[str, Any] = {}
+        for bit, field in enumerate(_SCHEMA_FIELDS):
+            if not bitmap & (1 << bit):
+                continue
+            size = payload[pos]
+            pos += 1
+            if size & 0x80:
+                size = ((size & 0x7F) << 8) | payload[pos]
+                pos += 1
+            result[field] = payload[pos : pos + size].decode()
+            pos += size
+        return result
+
+
+class MsgpackCodec:
+    """msgpack array of the schema fields in order (``nil`` when absent).
+
+    Keys outside the schema are appended as a trailing map; ``None`` schema values
+    are dropped on decode. Requires the optional ``msgpack`` package.
+    """
+
+    def __init__(self) -> None:
+        try:
+            import msgpack
+        except ImportError as exc:
+            msg = "The msgpack context codec requires the 'msgpack' package (pip install msgpack)."
+            raise RuntimeError(msg) from exc
+        self._packb = msgpack.packb
+        self._unpackb = msgpack.unpackb
+
+    def encode(self, data: Mapping[str, Any]) -> bytes:
+        row: list[Any] = [data.get(field) for field in _SCHEMA_FIELDS]
+        extras = {k: v for k, v in data.items() if k not in _SCHEMA_FIELDS}
+        if extras:
+            row.append(extras)
+        return bytes((_TAG_MSGPACK,)) + self._packb(row)
+
+    def decode(self, payload: bytes) -> dict[str, Any]:
+        if payload[0] != _TAG_MSGPACK:
+            return _decode_foreign(payload)
+        row = self._unpackb(payload[1:])
+        result = {
+            field: value
+            for field, value in zip(_SCHEMA_FIELDS, row, strict=False)
+            if value is not None
+        }
+        if len(row) > len(_SCHEMA_FIELDS):
+            result.update(row[-1])
+        return result
+
+
+class ZstdCodec:
+    """Wrap *inner* and zstd-compress payloads of at least *threshold* bytes.
+
+    Small payloads are passed through untouched (compression would only add
+    overhead). Requires the optional ``zstandard`` package.
+    """
+
+    def __init__(self, inner: ContextCodec, *, threshold: int = 512, level: int = 3) -> None:
+        try:
+            import zstandard
+        except ImportError as exc:
+            msg = "zstd compression of context values requires the 'zstandard' package."
+            raise RuntimeError(msg) from exc
+        self._inner = inner
+        self._threshold = threshold
+        self._compress = zstandard.ZstdCompressor(level=level).compress
+        self._decompress = zstandard.ZstdDecompressor().decompress
+
+    def encode(self, data: Mapping[str, Any]) -> bytes:
+        payload = self._inner.encode(data)
+        if len(payload) < self._threshold:
+            return payload
+        return bytes((_TAG_ZSTD,)) + self._compress(payload)
+
+    def decode(self, payload: bytes) -> dict[str, Any]:
+        if payload[0] == _TAG_ZSTD:
+            payload = self._decompress(payload[1:])
+        return self._inner.decode(payload)
+
+
+def _decode_foreign(payload: bytes) -> dict[str, Any]:
+    """Decode a payload written by a different codec (rolling codec changes)."""
+    tag = payload[0]
+    if tag == _JSON_START:
+        return json.loads(payload)
+    if tag == _TAG_COMPACT:
+        return CompactCodec().decode(payload)
+    if tag == _TAG_MSGPACK:
+        return MsgpackCodec().decode(payload)
+    if tag == _TAG_ZSTD:
+        return ZstdCodec(JsonCodec()).decode(payload)
+    msg = f"Unknown context payload tag 0x{tag:02x}"
+    raise ValueError(msg)
+
+
+def build_codec(name: str = "json", *, zstd_threshold: int = 0) -> ContextCodec:
+    """Return the codec called *name*, zstd-wrapped when *zstd_threshold* > 0.
+
+    Raises:
+        ValueError: If *name* is not one of :data:`CODEC_NAMES`.
+        RuntimeError: If the codec's optional package is not installed.
+    """
+    codecs: dict[str, type[JsonCodec | CompactCodec | MsgpackCodec]] = {
+        "json": JsonCodec,
+        "compact": CompactCodec,
+        "msgpack": MsgpackCodec,
+    }
+    if name not in codecs:
+        msg = f"Unknown context codec {name!r}; expected one of {', '.join(CODEC_NAMES)}"
+        raise ValueError(msg)
+    codec: ContextCodec = codecs[name]()
+    if zstd_threshold > 0:
+        codec = ZstdCodec(codec, threshold=zstd_threshold)
+    return codec
@@ -0,0 +1,66 @@
+# ABOUTME: Entry point for the batched TTL purge of stale jarvis context rows.
+# ABOUTME: Run `python -m autobots_agents_jarvis.common.services.context_purge` from cron / a k8s CronJob.
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import timedelta
+
+from autobots_devtools_shared_lib.common.observability import get_logger
+from autobots_devtools_shared_lib.common.services import get_context_store
+
+from autobots_agents_jarvis.common.configs.settings import get_app_settings
+from autobots_agents_jarvis.common.services.context_setup import init_context_store
+
+logger = get_logger(__name__)
+
+
+def purge_expired_contexts(ttl: timedelta, *, batch_size: int = 500, pause: float = 0.0) -> int:
+    """Purge contexts idle for longer than *ttl* using the registered context store.
+
+    Call after init_context_store(). Returns the number of contexts removed.
+
+    Raises:
+        RuntimeError: If the registered store is not DB-backed (JARVIS_DATABASE_URL unset).
+    """
+    purge = getattr(get_context_store(), "purge_expired", None)
+    if purge is None:
+        msg = "Context purge requires a DB-backed context store — set JARVIS_DATABASE_URL."
+        raise RuntimeError(msg)
+    purged = purge(ttl, batch_size=batch_size, pause=pause)
+    logger.info("Purged %s context rows idle for more than %s", purged, ttl)
+    return purged
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI entry point: purge contexts older than --ttl-days (default CONTEXT_TTL_DAYS)."""
+    settings = get_app_settings()
+    parser = argparse.ArgumentParser(description="Purge expired jarvis context rows.")
+    parser.add_argument(
+        "--ttl-days",
+        type=float,
+        default=settings.context_ttl_days,
+        help="Delete contexts not updated for this many days (env: CONTEXT_TTL_DAYS)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.context_purge_batch_size,
+        help="Rows deleted per transaction (env: CONTEXT_PURGE_BATCH_SIZE)",
+    )
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    args = parser.parse_args(argv)
+    if args.ttl_days <= 0:
+        parser.error("TTL disabled — pass --ttl-days or set CONTEXT_TTL_DAYS > 0")
+
+    init_context_store()
+    purged = purge_expired_contexts(
+        timedelta(days=args.ttl_days), batch_size=args.batch_size, pause=args.pause
+    )
+    print(f"purged {purged} context rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,64 +3,270 @@
 
 from __future__ import annotations
 
+import atexit
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
 from autobots_devtools_shared_lib.common.observability import get_logger
 from autobots_devtools_shared_lib.common.services import (
-    CacheBackedContextStore,
     InMemoryContextStore,
     set_context_store,
 )
 
 from autobots_agents_jarvis.common.configs.settings import get_app_settings
-from autobots_agents_jarvis.common.db.engine import init_db_engine
+from autobots_agents_jarvis.common.db.engine import get_read_session_factory, init_db_engine
 from autobots_agents_jarvis.common.db.repository import JarvisContextRepository
+from autobots_agents_jarvis.common.services.cache_invalidation import RedisInvalidationBus
+from autobots_agents_jarvis.common.services.codecs import build_codec
+from autobots_agents_jarvis.common.services.context_store import JarvisCacheBackedContextStore
+from autobots_agents_jarvis.common.services.near_cache import LRUContextCache, NearCacheContextStore
+from autobots_agents_jarvis.common.services.redis_client import get_redis_client
+from autobots_agents_jarvis.common.services.redis_store import (
+    JarvisRedisContextStore,
+    JarvisRedisHashContextStore,
+)
+from autobots_agents_jarvis.common.services.write_behind import WriteBehindContextStore
+
+if TYPE_CHECKING:
+    from autobots_agents_jarvis.common.configs.settings import AppSettings
 
 logger = get_logger(__name__)
 
+type RedisCache = JarvisRedisContextStore | JarvisRedisHashContextStore
+
+# Active write-behind store, flushed on re-initialisation and at interpreter exit.
+_WRITE_BEHIND_STORE: WriteBehindContextStore | None = None
+# Active L1 near-cache; its invalidation bus threads are stopped the same way.
+_NEAR_CACHE: NearCacheContextStore | None = None
+_ATEXIT_REGISTERED = False
+# Background cache warm-up started by init_context_store (CONTEXT_WARMUP_ROWS > 0).
+_WARMUP_THREAD: threading.Thread | None = None
+_WARMUP_STOP = threading.Event()
+
 
 def init_context_store(*, app_name: str | None = None) -> None:
-    """Initialise and register the write-through CacheBackedContextStore.
+    """Initialise and register the write-through JarvisCacheBackedContextStore.
 
-    Reads JARVIS_DATABASE_URL and REDIS_URL from AppSettings.
-    - JARVIS_DATABASE_URL is optional; logs a warning and sets InMemoryContextStore
-      if absent (suitable for local dev without a DB).
+    Reads JARVIS_DATABASE_URL, JARVIS_SQLITE_PATH and REDIS_URL from AppSettings.
+    - JARVIS_DATABASE_URL is optional. Without it, JARVIS_SQLITE_PATH selects a
+      single-node SQLite file (WAL, synchronous=NORMAL, mmap) as the persistent
+      store; with neither, logs a warning and sets InMemoryContextStore
+      (suitable for local dev without a DB).
     - REDIS_URL is optional; falls back to InMemoryContextStore for the cache
-      layer when absent.
+      layer when absent. Redis connections come from the process-wide pool
+      (REDIS_MAX_CONNECTIONS, REDIS_*_TIMEOUT). With Redis, a process-local LRU (CONTEXT_L1_MAX_ENTRIES,
+      CONTEXT_L1_TTL_SECONDS) serves repeated reads without a network hop; writes
+      are broadcast on Redis pub/sub so other processes evict their copy
+      (CONTEXT_L1_INVALIDATION=false leaves only the TTL). CONTEXT_REDIS_CODEC and
+      CONTEXT_REDIS_ZSTD_THRESHOLD pick the wire format of the Redis values;
+      CONTEXT_REDIS_HASH=true stores one hash per context for field-level updates.
+    - Keys missing from the DB are negative-cached for
+      CONTEXT_NEGATIVE_CACHE_TTL_SECONDS (0 disables) until the first write.
     - app_name: Domain name for prefix isolation (e.g. 'concierge', 'sales').
       Defaults to settings.app_name; use '' if not set.
+    - CONTEXT_WRITE_BEHIND=true switches to WriteBehindContextStore: writes land in
+      the cache immediately and are flushed to the DB in coalesced batches
+      (pending writes are flushed at interpreter exit).
+    - JARVIS_DATABASE_REPLICA_URLS routes reads to replicas; keys this process
+      wrote within CONTEXT_READ_YOUR_WRITES_SECONDS are still read from the primary.
+    - CONTEXT_WARMUP_ROWS > 0 preloads that many of this domain's most recently
+      updated contexts into the cache on a background thread (startup is not
+      blocked; keys written meanwhile are not overwritten).
 
     Safe to call multiple times (idempotent per settings state).
     Call once at server startup, after load_dotenv() / init_app_settings().
     """
     settings = get_app_settings()
+    _stop_cache_warmup()
+    _close_near_cache()
     prefix_app = app_name if app_name is not None else settings.app_name
     prefix = f"jarvis-{prefix_app}" if prefix_app else "jarvis"
 
-    if not settings.database_url:
+    database_url = settings.context_database_url()
+    if not database_url:
         logger.warning(
-            "JARVIS_DATABASE_URL not set — context store not initialised; "
+            "JARVIS_DATABASE_URL / JARVIS_SQLITE_PATH not set — context store not initialised; "
             "using in-memory fallback (data will not persist across restarts)"
         )
         set_context_store(InMemoryContextStore())
         return
 
-    session_factory = init_db_engine(settings.database_url)
-    repo = JarvisContextRepository(session_factory)
+    session_factory = init_db_engine(database_url, **settings.db_engine_options())
+    read_session_factory = get_read_session_factory()
+    repo = JarvisContextRepository(session_factory, read_session_factory=read_session_factory)
+    # Only replica reads can lag behind a write; without replicas there is nothing to pin.
+    ryw_window = settings.context_read_your_writes_seconds if read_session_factory else 0.0
+    if read_session_factory is not None:
+        logger.info("Context store: reads routed to replicas (read-your-writes %.1fs)", ryw_window)
+    if not settings.database_url:
+        logger.info("Context store: single-node SQLite (WAL) at %s", settings.sqlite_path)
 
     if settings.redis_url:
-        from autobots_devtools_shared_lib.common.services.context import (
-            RedisContextStore,
-            _RedisConfig,
-        )
-
         # Redis prefix for multi-tenant isolation; CacheBackedContextStore applies own prefix to keys.
-        cache: InMemoryContextStore | RedisContextStore = RedisContextStore(
-            _RedisConfig(url=settings.redis_url)
+        cache: InMemoryContextStore | RedisCache | NearCacheContextStore = _build_redis_cache(
+            settings, get_redis_client(settings.redis_url)
         )
-        logger.info("Context store: CacheBackedContextStore (Postgres + Redis)")
+        if settings.context_l1_max_entries > 0:
+            cache = _build_near_cache(settings, cache)
     else:
         cache = InMemoryContextStore()
-        logger.warning(
-            "REDIS_URL not set — using InMemoryContextStore as cache layer (dev mode only)"
+        # Single-node SQLite mode expects a process-local cache; only warn for shared DBs.
+        if settings.database_url:
+            logger.warning(
+                "REDIS_URL not set — using InMemoryContextStore as cache layer (dev mode only)"
+            )
+
+    _close_write_behind_store()
+    store: JarvisCacheBackedContextStore
+    if settings.context_write_behind:
+        store = WriteBehindContextStore(
+            db=repo,
+            cache=cache,
+            prefix=prefix,
+            flush_interval=settings.context_write_behind_interval,
+            batch_size=settings.context_write_behind_batch_size,
+            max_pending=settings.context_write_behind_max_pending,
+            read_your_writes_window=ryw_window,
+            negative_ttl=settings.context_negative_cache_ttl_seconds,
+            negative_max_entries=settings.context_negative_cache_max_entries,
+        )
+        _register_write_behind_store(store)
+        logger.info("Context store: write-behind enabled (DB flushed in batches)")
+    else:
+        store = JarvisCacheBackedContextStore(
+            db=repo,
+            cache=cache,
+            prefix=prefix,
+            read_your_writes_window=ryw_window,
+            negative_ttl=settings.context_negative_cache_ttl_seconds,
+            negative_max_entries=settings.context_negative_cache_max_entries,
         )
+    set_context_store(store)
+    if settings.context_warmup_rows > 0:
+        _start_cache_warmup(store, settings.context_warmup_rows, settings.context_warmup_page_size)
+
+
+def _start_cache_warmup(store: JarvisCacheBackedContextStore, rows: int, page_size: int) -> None:
+    """Preload *store*'s cache with its *rows* most recent contexts on a daemon thread."""
+    global _WARMUP_THREAD
+    _WARMUP_STOP.clear()
+
+    def _run() -> None:
+        started = time.perf_counter()
+        try:
+            warmed = store.warm_cache(rows, page_size=page_size, should_stop=_WARMUP_STOP.is_set)
+        except Exception:
+            # Best effort: a failed warm-up only means the first turns read the DB.
+            logger.exception("Context cache warm-up failed")
+            return
+        logger.info(
+            "Context cache warm-up: %d contexts preloaded in %.2fs",
+            warmed,
+            time.perf_counter() - started,
+        )
+
+    _WARMUP_THREAD = threading.Thread(target=_run, name="jarvis-context-warmup", daemon=True)
+    _WARMUP_THREAD.start()
+    _register_atexit()
+
 
-    set_context_store(CacheBackedContextStore(db=repo, cache=cache, prefix=prefix))
+def _stop_cache_warmup() -> None:
+    """Ask a running warm-up to stop after its current page and wait briefly for it."""
+    global _WARMUP_THREAD
+    thread, _WARMUP_THREAD = _WARMUP_THREAD, None
+    if thread is None:
+        return
+    _WARMUP_STOP.set()
+    thread.join(timeout=5)
+
+
+def _build_redis_cache(settings: AppSettings, client: Any) -> RedisCache:
+    """Return the Redis tier: one hash per context, or one encoded value per context."""
+    if settings.context_redis_hash:
+        logger.info("Context store: CacheBackedContextStore (Postgres + Redis hashes)")
+        return JarvisRedisHashContextStore(client)
+    logger.info(
+        "Context store: CacheBackedContextStore (Postgres + Redis, %s codec)",
+        settings.context_redis_codec,
+    )
+    return JarvisRedisContextStore(
+        client,
+        codec=build_codec(
+            settings.context_redis_codec, zstd_threshold=settings.context_redis_zstd_threshold
+        ),
+    )
+
+
+def _build_near_cache(settings: AppSettings, remote: RedisCache) -> NearCacheContextStore:
+    """Wrap *remote* in the process-local L1 (plus pub/sub invalidation when enabled)."""
+    global _NEAR_CACHE
+    bus = None
+    if settings.context_l1_invalidation:
+        bus = RedisInvalidationBus(
+            get_redis_client(settings.redis_url),
+            channel=settings.context_l1_invalidation_channel,
+            batch_interval=settings.context_l1_invalidation_batch_interval,
+        )
+    near_cache = NearCacheContextStore(
+        LRUContextCache(
+            max_entries=settings.context_l1_max_entries, ttl=settings.context_l1_ttl_seconds
+        ),
+        remote,
+        bus=bus,
+    )
+    _NEAR_CACHE = near_cache
+    _register_atexit()
+    logger.info(
+        "Context store: L1 cache enabled (%d entries, %.1fs TTL, pub/sub invalidation %s)",
+        settings.context_l1_max_entries,
+        settings.context_l1_ttl_seconds,
+        "on" if bus is not None else "off",
+    )
+    return near_cache
+
+
+def _close_near_cache() -> None:
+    """Publish outstanding L1 invalidations and stop the bus threads of the active near-cache."""
+    global _NEAR_CACHE
+    near_cache, _NEAR_CACHE = _NEAR_CACHE, None
+    if near_cache is None:
+        return
+    try:
+        near_cache.close()
+    except Exception:
+        logger.exception("Failed to stop L1 cache invalidation")
+
+
+def _register_write_behind_store(store: WriteBehindContextStore) -> None:
+    """Track *store* so its pending writes are flushed on re-init and at interpreter exit."""
+    global _WRITE_BEHIND_STORE
+    _WRITE_BEHIND_STORE = store
+    _register_atexit()
+
+
+def _register_atexit() -> None:
+    """Register the shutdown hook once per process."""
+    global _ATEXIT_REGISTERED
+    if not _ATEXIT_REGISTERED:
+        atexit.register(_close_context_store_resources)
+        _ATEXIT_REGISTERED = True
+
+
+def _close_context_store_resources() -> None:
+    """Flush pending DB writes, then pending L1 invalidations (the flush writes the cache first)."""
+    _stop_cache_warmup()
+    _close_write_behind_store()
+    _close_near_cache()
+
+
+def _close_write_behind_store() -> None:
+    """Stop the active write-behind flusher (if any) and flush its pending writes."""
+    global _WRITE_BEHIND_STORE
+    store, _WRITE_BEHIND_STORE = _WRITE_BEHIND_STORE, None
+    if store is None:
+        return
+    try:
+        store.close()
+    except Exception:
+        logger.exception("Failed to flush pending context writes on shutdown")
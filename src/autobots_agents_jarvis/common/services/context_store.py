@@ -0,0 +1,352 @@
+# ABOUTME: Jarvis extension of the shared-lib CacheBackedContextStore.
+# ABOUTME: Adds bulk get_many / set_many, column-level patch and version-checked update backed by the repository.
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from autobots_devtools_shared_lib.common.services import CacheBackedContextStore
+
+from autobots_agents_jarvis.common.services.near_cache import (
+    LRUContextCache,
+    NearCacheContextStore,
+)
+from autobots_agents_jarvis.common.services.redis_store import (
+    FieldPatchableStore,
+    cache_add_many,
+    cache_delete_many,
+    cache_get_many,
+    cache_set_many,
+)
+from autobots_agents_jarvis.common.services.single_flight import SingleFlight
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping
+    from datetime import timedelta
+
+    from autobots_devtools_shared_lib.common.services import ContextStore
+
+    from autobots_agents_jarvis.common.db.repository import JarvisContextRepository
+
+
+# Size at which expired read-your-writes entries are swept out of the tracking dict.
+_RECENT_WRITES_PRUNE_AT = 10_000
+
+
+class JarvisCacheBackedContextStore(CacheBackedContextStore):
+    """CacheBackedContextStore with bulk operations for cache warm-up and migrations.
+
+    Single-key get/set/delete keep the shared-lib write-through semantics.
+    get_many/set_many route all DB traffic through one JarvisContextRepository
+    call so N keys cost one query (per chunk) instead of N sessions. patch writes
+    only the given columns without the read-modify-write that update performs;
+    update itself is a compare-and-swap on the row version with bounded retries.
+
+    When the repository reads from replicas, *read_your_writes_window* seconds
+    after this store writes a key, a cache miss on that key is read from the
+    primary instead, so a caller never sees its own write undone by replica lag.
+
+    Cache misses are coalesced per key (single-flight): when a hot key expires,
+    concurrent get() calls from threads, or aget() calls from asyncio tasks,
+    share one DB load instead of each querying the repository.
+
+    With *negative_ttl* > 0, keys the DB does not have are remembered (up to
+    *negative_max_entries*, process-local) for that many seconds, so repeated
+    lookups of a brand-new session's key stop reaching the DB until its first
+    write. Any write through this store drops the key's negative entry; writes
+    from other processes become visible once the short TTL runs out.
+    """
+
+    def __init__(
+        self,
+        db: JarvisContextRepository,
+        cache: ContextStore,
+        *,
+        prefix: str = "",
+        read_your_writes_window: float = 0.0,
+        negative_ttl: float = 0.0,
+        negative_max_entries: int = 10_000,
+    ) -> None:
+        super().__init__(db=db, cache=cache, prefix=prefix)
+        self._repo = db
+        self._ryw_window = read_your_writes_window
+        # storage key -> monotonic deadline until which reads go to the primary.
+        self._recent_writes: dict[str, float] = {}
+        self._recent_writes_lock = threading.Lock()
+        self._flight = SingleFlight()
+        # Coalesces aget() tasks in front of _flight; its loads are lookups, not DB reads.
+        self._async_flight = SingleFlight()
+        self._missing = (
+            LRUContextCache(max_entries=negative_max_entries, ttl=negative_ttl)
+            if negative_ttl > 0
+            else None
+        )
+        # Bumped on every write; a load only records a miss if no write raced with it.
+        self._write_seq = 0
+
+    # ------------------------------------------------------------------
+    # Read-your-writes window
+    # ------------------------------------------------------------------
+
+    def _mark_written(self, keys: Iterable[str]) -> None:
+        """Record a write of *keys* (storage keys).
+
+        Drops their negative-cache entries and pins them to the primary for the
+        read-your-writes window.
+        """
+        keys = list(keys)
+        self._forget_missing(keys)
+        if self._ryw_window <= 0:
+            return
+        now = time.monotonic()
+        deadline = now + self._ryw_window
+        with self._recent_writes_lock:
+            for key in keys:
+                self._recent_writes[key] = deadline
+            if len(self._recent_writes) > _RECENT_WRITES_PRUNE_AT:
+                self._recent_writes = {k: d for k, d in self._recent_writes.items() if d > now}
+
+    def _read_primary(self, key: str) -> bool:
+        """Return True if *key* was written within the read-your-writes window."""
+        deadline = self._recent_writes.get(key)
+        return deadline is not None and deadline > time.monotonic()
+
+    # ------------------------------------------------------------------
+    # ContextStore API
+    # ------------------------------------------------------------------
+
+    def get(self, context_key: str) -> dict[str, Any] | None:
+        """Return the context; cache first, then one coalesced DB load per key."""
+        return self._lookup(self._key(context_key))
+
+    async def aget(self, context_key: str) -> dict[str, Any] | None:
+        """Async get(): the whole lookup runs in a worker thread, shared by concurrent tasks.
+
+        Neither the cache round trip nor the DB load blocks the event loop, and
+        tasks asking for the same key at once await a single lookup.
+        """
+        key = self._key(context_key)
+        data = await self._async_flight.ado(key, lambda: asyncio.to_thread(self._lookup, key))
+        return None if data is None else dict(data)
+
+    def _lookup(self, key: str) -> dict[str, Any] | None:
+        """get() by storage key: the cache, then the negative cache, then a coalesced DB load."""
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        if self._known_missing(key):
+            return None
+        return self._load_coalesced(key)
+
+    def _load_coalesced(self, key: str) -> dict[str, Any] | None:
+        """Load *key* through the single-flight group; each caller gets its own copy."""
+        data = self._flight.do(key, lambda: self._load(key))
+        return None if data is None else dict(data)
+
+    def _load(self, key: str) -> dict[str, Any] | None:
+        """Cache-miss path: read the DB (primary inside the write window) and fill the cache."""
+        write_seq = self._write_seq
+        data = self._repo.get(key, primary=self._read_primary(key))
+        if data is not None:
+            self._cache.set(key, data)
+        else:
+            self._remember_missing([key], write_seq)
+        return data
+
+    # ------------------------------------------------------------------
+    # Negative cache
+    # ------------------------------------------------------------------
+
+    def _known_missing(self, key: str) -> bool:
+        """Return True if *key* was recently found missing in the DB."""
+        return self._missing is not None and self._missing.get(key) is not None
+
+    def _forget_missing(self, keys: Iterable[str]) -> None:
+        """Drop negative entries for *keys* (just written) and fence in-flight loads."""
+        with self._recent_writes_lock:
+            self._write_seq += 1
+        if self._missing is not None:
+            self._missing.delete_many(keys)
+
+    def _remember_missing(self, keys: Iterable[str], write_seq: int) -> None:
+        """Negative-cache *keys* unless a write happened since *write_seq* was read."""
+        if self._missing is None or self._write_seq != write_seq:
+            return
+        for key in keys:
+            self._missing.set(key, {})
+
+    def negative_cache_stats(self) -> dict[str, Any]:
+        """Return the negative cache counters (hits = DB reads avoided), or ``{}`` when disabled."""
+        return {} if self._missing is None else self._missing.stats()
+
+    def load_stats(self) -> dict[str, int]:
+        """Return single-flight counters: DB ``loads`` and ``coalesced`` callers (threads and tasks)."""
+        stats = self._flight.stats()
+        stats["coalesced"] += self._async_flight.stats()["coalesced"]
+        return stats
+
+    def set(self, context_key: str, data: Mapping[str, Any]) -> None:
+        """Write-through *data* (DB, then cache)."""
+        super().set(context_key, data)
+        self._mark_written([self._key(context_key)])
+
+    def delete(self, context_key: str) -> None:
+        """Delete from the DB and the cache."""
+        super().delete(context_key)
+        self._mark_written([self._key(context_key)])
+
+    def update(self, context_key: str, patch: Mapping[str, Any]) -> dict[str, Any]:
+        """Merge *patch* into the stored context with optimistic concurrency.
+
+        The read-modify-write runs through :meth:`JarvisContextRepository.modify`,
+        so two concurrent updates of the same key cannot silently drop each
+        other's fields: the loser re-reads and re-applies its patch. ``None``
+        values are ignored, as in the shared-lib store.
+
+        Raises:
+            ContextVersionConflictError: If the key stays contended past the retry bound.
+        """
+        key = self._key(context_key)
+        values = {k: v for k, v in patch.items() if v is not None}
+        updated = self._repo.modify(key, lambda current: {**current, **values})
+        # A Redis hash cache rewrites only the patched fields (a miss gets the full row); any
+        # other cache gets the authoritative row modify() returned, with no extra cache read.
+        if not (self._cache_patches_fields() and self._patch_cached(key, values)):
+            self._cache.set(key, updated)
+        self._mark_written([key])
+        return updated
+
+    def get_many(self, context_keys: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Return contexts for *context_keys*; one batched cache read, one DB query for the misses.
+
+        Missing keys are omitted (and negative-cached when enabled). DB hits
+        repopulate the cache.
+        """
+        result: dict[str, dict[str, Any]] = {}
+        misses: dict[str, str] = {}
+        by_key = {self._key(context_key): context_key for context_key in context_keys}
+        cached = cache_get_many(self._cache, list(by_key))
+        for key, context_key in by_key.items():
+            if key in cached:
+                result[context_key] = cached[key]
+            elif not self._known_missing(key):
+                misses[key] = context_key
+        if misses:
+            for key, data in self._load_many(list(misses)).items():
+                result[misses[key]] = data
+        return result
+
+    def _load_many(self, keys: list[str]) -> dict[str, dict[str, Any]]:
+        """Cache-miss path of get_many(): batched DB read, cache fill, negative entries."""
+        write_seq = self._write_seq
+        loaded = self._read_many(keys)
+        cache_set_many(self._cache, loaded)
+        self._remember_missing((k for k in keys if k not in loaded), write_seq)
+        return loaded
+
+    def _read_many(self, keys: list[str]) -> dict[str, dict[str, Any]]:
+        """Read *keys* from the DB; keys inside the read-your-writes window go to the primary."""
+        primary_keys = {key for key in keys if self._read_primary(key)}
+        replica_keys = [key for key in keys if key not in primary_keys]
+        loaded = self._repo.get_many(replica_keys) if replica_keys else {}
+        if primary_keys:
+            loaded.update(self._repo.get_many(primary_keys, primary=True))
+        return loaded
+
+    def set_many(self, data_by_key: Mapping[str, Mapping[str, Any]]) -> None:
+        """Write-through several contexts: one DB upsert, then populate the cache."""
+        prefixed = {self._key(k): v for k, v in data_by_key.items()}
+        self._repo.set_many(prefixed)
+        cache_set_many(self._cache, prefixed)
+        self._mark_written(prefixed)
+
+    def patch(self, context_key: str, fields: Mapping[str, Any]) -> bool:
+        """Write only *fields* to the DB (skipped when unchanged), then merge them into the cache.
+
+        ``None`` values are ignored, matching update(). A cache miss is left empty
+        rather than re-read, so the next get() loads the full row from the DB.
+
+        Returns:
+            ``True`` if the DB row was inserted or changed.
+        """
+        key = self._key(context_key)
+        values = {k: v for k, v in fields.items() if v is not None}
+        changed = self._repo.patch(key, values)
+        if changed:
+            self._mark_written([key])
+            self._patch_cached(key, values)
+        return changed
+
+    def _cache_patches_fields(self) -> bool:
+        """True if the cache writes single fields natively rather than by read-merge-rewrite."""
+        if isinstance(self._cache, NearCacheContextStore):
+            return self._cache.patches_fields
+        return isinstance(self._cache, FieldPatchableStore)
+
+    def _patch_cached(self, key: str, values: Mapping[str, Any]) -> bool:
+        """Merge *values* into the cached entry for *key*; return False if it is not cached.
+
+        Field-level caches (:class:`FieldPatchableStore`) write just *values*;
+        others are read, merged and rewritten.
+        """
+        if isinstance(self._cache, FieldPatchableStore):
+            return self._cache.patch_existing(key, values)
+        cached = self._cache.get(key)
+        if cached is None:
+            return False
+        merged = {**cached, **values}
+        if merged != cached:
+            self._cache.set(key, merged)
+        return True
+
+    def warm_cache(
+        self,
+        limit: int,
+        *,
+        page_size: int = 500,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> int:
+        """Preload the *limit* most recently updated contexts under this store's prefix.
+
+        Rows are streamed from :meth:`JarvisContextRepository.iter_recent` page by
+        page and each page is filled with one conditional batch
+        (:func:`cache_add_many`): keys already in the cache (written since startup,
+        so newer than the row) are left alone. The Redis stores check and write each
+        key atomically, so a write racing with the fill is not overwritten; other
+        cache tiers check first and can lose such a write. *should_stop* is checked
+        between pages so a shutdown can abort the scan.
+
+        Returns:
+            Number of contexts written to the cache.
+        """
+        key_prefix = f"{self._prefix}_" if self._prefix else ""
+        warmed = 0
+        for page in self._repo.iter_recent(limit, key_prefix=key_prefix, page_size=page_size):
+            if should_stop is not None and should_stop():
+                break
+            warmed += len(cache_add_many(self._cache, page))
+        return warmed
+
+    def purge_expired(self, ttl: timedelta, *, batch_size: int = 500, pause: float = 0.0) -> int:
+        """Delete contexts not updated within *ttl* from the DB and expire their cache keys.
+
+        Rows are removed in repository batches of *batch_size*; each batch's keys are
+        evicted from the cache before the next batch starts. *pause* seconds are
+        slept between batches to spread load. Keys are the repository's storage keys,
+        so a store whose repository has no prefix purges every domain's rows.
+
+        Returns:
+            Number of contexts purged.
+        """
+        cutoff = datetime.now(UTC) - ttl
+        purged = 0
+        for keys in self._repo.purge_expired(cutoff, batch_size=batch_size):
+            cache_delete_many(self._cache, keys)
+            purged += len(keys)
+            if pause:
+                time.sleep(pause)
+        return purged
@@ -0,0 +1,242 @@
+# ABOUTME: Process-local L1 cache tier (bounded, TTL-aware LRU) placed in front of the Redis cache.
+# ABOUTME: NearCacheContextStore composes the L1 with a shared ContextStore (optionally kept coherent over pub/sub).
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from autobots_agents_jarvis.common.services.redis_store import (
+    FieldPatchableStore,
+    cache_add_many,
+    cache_delete_many,
+    cache_get_many,
+    cache_set_many,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from autobots_devtools_shared_lib.common.services import ContextStore
+
+    from autobots_agents_jarvis.common.services.cache_invalidation import RedisInvalidationBus
+
+
+class LRUContextCache:
+    """Bounded in-process ContextStore with per-entry TTL and LRU eviction.
+
+    Entries expire *ttl* seconds after they were written (``ttl <= 0`` keeps them
+    until evicted). When *max_entries* is exceeded the least recently used entry
+    is dropped. Values are copied on the way in and out so callers cannot mutate
+    the cached dict. Thread-safe.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 2.0) -> None:
+        if max_entries <= 0:
+            msg = "max_entries must be positive"
+            raise ValueError(msg)
+        self._max_entries = max_entries
+        self._ttl = ttl
+        # key -> (expires_at monotonic, or 0.0 for no expiry; value)
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, context_key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(context_key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at and expires_at <= time.monotonic():
+                del self._entries[context_key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(context_key)
+            self._hits += 1
+            return dict(value)
+
+    def set(self, context_key: str, data: Mapping[str, Any]) -> None:
+        expires_at = time.monotonic() + self._ttl if self._ttl > 0 else 0.0
+        with self._lock:
+            self._entries[context_key] = (expires_at, dict(data))
+            self._entries.move_to_end(context_key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def update(self, context_key: str, patch: Mapping[str, Any]) -> dict[str, Any]:
+        updated = {
+            **(self.get(context_key) or {}),
+            **{k: v for k, v in patch.items() if v is not None},
+        }
+        self.set(context_key, updated)
+        return updated
+
+    def delete(self, context_key: str) -> None:
+        with self._lock:
+            self._entries.pop(context_key, None)
+
+    def delete_many(self, context_keys: Iterable[str]) -> None:
+        """Drop *context_keys* under one lock acquisition."""
+        with self._lock:
+            for context_key in context_keys:
+                self._entries.pop(context_key, None)
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss/eviction counters, current size and the hit ratio."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "size": len(self._entries),
+                "max_entries": self._max_entries,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
+
+
+class NearCacheContextStore:
+    """Two-tier ContextStore: a process-local :class:`LRUContextCache` over a shared cache.
+
+    Reads are served from the L1 when present and otherwise from *remote* (e.g.
+    RedisContextStore), populating the L1. Writes go to *remote* first, then the
+    L1, so a failed remote write never leaves a value only this process can see.
+
+    Without *bus*, other processes' writes become visible once the L1 entry's TTL
+    runs out. With a :class:`RedisInvalidationBus`, every write also publishes
+    its key and the bus evicts keys written elsewhere (and flushes the L1 after a
+    reconnect); the TTL then only bounds staleness for lost messages.
+    """
+
+    def __init__(
+        self,
+        local: LRUContextCache,
+        remote: ContextStore,
+        *,
+        bus: RedisInvalidationBus | None = None,
+    ) -> None:
+        self._local = local
+        self._remote = remote
+        self._bus = bus
+        if bus is not None:
+            bus.start(on_invalidate=local.delete_many, on_reset=local.clear)
+
+    def get(self, context_key: str) -> dict[str, Any] | None:
+        cached = self._local.get(context_key)
+        if cached is not None:
+            return cached
+        data = self._remote.get(context_key)
+        if data is not None:
+            self._local.set(context_key, data)
+        return data
+
+    def set(self, context_key: str, data: Mapping[str, Any]) -> None:
+        self._remote.set(context_key, data)
+        self._local.set(context_key, data)
+        self._invalidate_elsewhere(context_key)
+
+    def update(self, context_key: str, patch: Mapping[str, Any]) -> dict[str, Any]:
+        updated = self._remote.update(context_key, patch)
+        self._local.set(context_key, updated)
+        self._invalidate_elsewhere(context_key)
+        return updated
+
+    def delete(self, context_key: str) -> None:
+        self._remote.delete(context_key)
+        self._local.delete(context_key)
+        self._invalidate_elsewhere(context_key)
+
+    def get_many(self, context_keys: Sequence[str]) -> dict[str, dict[str, Any]]:
+        """Serve L1 hits and fetch the rest from *remote* in one batch, populating the L1."""
+        result: dict[str, dict[str, Any]] = {}
+        misses: list[str] = []
+        for context_key in context_keys:
+            cached = self._local.get(context_key)
+            if cached is not None:
+                result[context_key] = cached
+            else:
+                misses.append(context_key)
+        if misses:
+            loaded = cache_get_many(self._remote, misses)
+            for context_key, data in loaded.items():
+                self._local.set(context_key, data)
+            result.update(loaded)
+        return result
+
+    def set_many(self, data_by_key: Mapping[str, Mapping[str, Any]]) -> None:
+        cache_set_many(self._remote, data_by_key)
+        for context_key, data in data_by_key.items():
+            self._local.set(context_key, data)
+        if self._bus is not None:
+            self._bus.publish(data_by_key)
+
+    def add_many(self, data_by_key: Mapping[str, Mapping[str, Any]]) -> list[str]:
+        """Fill the keys *remote* does not hold (see :func:`cache_add_many`); return them."""
+        added = cache_add_many(self._remote, data_by_key)
+        for context_key in added:
+            self._local.set(context_key, data_by_key[context_key])
+        if added and self._bus is not None:
+            self._bus.publish(added)
+        return added
+
+    def delete_many(self, context_keys: Sequence[str]) -> None:
+        cache_delete_many(self._remote, context_keys)
+        self._local.delete_many(context_keys)
+        if self._bus is not None:
+            self._bus.publish(context_keys)
+
+    @property
+    def patches_fields(self) -> bool:
+        """True when the remote writes single fields natively (a Redis hash store)."""
+        return isinstance(self._remote, FieldPatchableStore)
+
+    def patch_existing(self, context_key: str, fields: Mapping[str, Any]) -> bool:
+        """Write *fields* into the entry if the shared cache holds it; return whether it did.
+
+        With a field-level remote (a Redis hash store) only those fields are sent;
+        otherwise the remote entry is read, merged and rewritten. The L1 copy is
+        merged in place, or dropped when the remote had no entry.
+        """
+        values = {k: v for k, v in fields.items() if v is not None}
+        if isinstance(self._remote, FieldPatchableStore):
+            applied = self._remote.patch_existing(context_key, values)
+        else:
+            current = self._remote.get(context_key)
+            applied = current is not None
+            if current is not None:
+                self._remote.set(context_key, {**current, **values})
+        cached = self._local.get(context_key) if applied else None
+        if cached is not None:
+            self._local.set(context_key, {**cached, **values})
+        else:
+            self._local.delete(context_key)
+        self._invalidate_elsewhere(context_key)
+        return applied
+
+    def _invalidate_elsewhere(self, context_key: str) -> None:
+        if self._bus is not None:
+            self._bus.publish([context_key])
+
+    def close(self) -> None:
+        """Publish outstanding invalidations and stop the bus threads (if any)."""
+        if self._bus is not None:
+            self._bus.close()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the L1 counters (see :meth:`LRUContextCache.stats`)."""
+        return self._local.stats()
@@ -0,0 +1,69 @@
+# ABOUTME: Process-wide Redis client registry: one bounded connection pool per URL, configured from AppSettings.
+# ABOUTME: Every Redis user in the process (context cache, L1 invalidation, ...) shares it via get_redis_client().
+
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from autobots_devtools_shared_lib.common.observability import get_logger
+
+from autobots_agents_jarvis.common.configs.settings import get_app_settings
+
+logger = get_logger(__name__)
+
+# URL -> shared client; guarded by _CLIENTS_LOCK so concurrent first calls build one pool.
+_CLIENTS: dict[str, Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_redis_client(url: str | None = None) -> Any:
+    """Return the process-wide ``redis.Redis`` client for *url* (default REDIS_URL).
+
+    The first call per URL builds a ``BlockingConnectionPool`` from
+    :meth:`AppSettings.redis_client_options`: at most REDIS_MAX_CONNECTIONS
+    connections, callers wait up to REDIS_POOL_TIMEOUT for a free one instead of
+    failing, and idle connections are health-checked on checkout. Later calls
+    return the same client, so all stores and rate limiters share the pool.
+
+    Raises:
+        RuntimeError: If no URL is given and REDIS_URL is not set, or the redis
+            package is not installed.
+    """
+    settings = get_app_settings()
+    url = url or settings.redis_url
+    if not url:
+        msg = "REDIS_URL is not set; cannot create a Redis client."
+        raise RuntimeError(msg)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(url)
+        if client is None:
+            client = _CLIENTS[url] = _create_client(url, settings.redis_client_options())
+        return client
+
+
+def _create_client(url: str, options: dict[str, Any]) -> Any:
+    try:
+        import redis
+    except ImportError as exc:
+        msg = "The redis package is required for REDIS_URL but is not installed."
+        raise RuntimeError(msg) from exc
+    pool = redis.BlockingConnectionPool.from_url(url, **options)
+    logger.info(
+        "Redis pool created (max %d connections, %.1fs socket timeout)",
+        options["max_connections"],
+        options["socket_timeout"],
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+def close_redis_clients() -> None:
+    """Disconnect and forget every shared client (tests, and re-init after a fork)."""
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+    for client in clients:
+        try:
+            client.connection_pool.disconnect()
+        except Exception:
+            logger.exception("Failed to close Redis connection pool")
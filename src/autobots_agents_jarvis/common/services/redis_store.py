@@ -0,0 +1,342 @@
+# ABOUTME: Redis-backed ContextStores: one encoded value per key (pluggable codec) or one hash per key.
+# ABOUTME: Drop-ins for the shared-lib RedisContextStore as the cache layer of the context store.
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
+
+from autobots_devtools_shared_lib.common.observability import get_logger
+
+from autobots_agents_jarvis.common.services.codecs import JsonCodec
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from autobots_devtools_shared_lib.common.services import ContextStore
+
+    from autobots_agents_jarvis.common.services.codecs import ContextCodec
+
+logger = get_logger(__name__)
+
+# Same default namespace as the shared-lib RedisContextStore, so existing keys stay readable.
+DEFAULT_REDIS_PREFIX = "dynagent_ctx"
+# Hashes live in their own namespace: a key cannot be a string and a hash at once.
+DEFAULT_REDIS_HASH_PREFIX = "dynagent_ctxh"
+
+# Hash field values are raw UTF-8 for str; anything else is JSON behind this marker byte.
+_JSON_MARK = b"\x00"
+
+
+@runtime_checkable
+class BatchContextStore(Protocol):
+    """A cache tier that reads and writes many keys per round trip."""
+
+    def get_many(
+        self, context_keys: Sequence[str]
+    ) -> dict[str, dict[str, Any]]:  # pragma: no cover - Protocol
+        """Return the contexts stored for *context_keys*; missing keys are omitted."""
+        ...
+
+    def set_many(
+        self, data_by_key: Mapping[str, Mapping[str, Any]]
+    ) -> None:  # pragma: no cover - Protocol
+        """Store every context in *data_by_key*."""
+        ...
+
+    def delete_many(self, context_keys: Sequence[str]) -> None:  # pragma: no cover - Protocol
+        """Delete *context_keys*."""
+        ...
+
+
+def cache_get_many(store: ContextStore, context_keys: Sequence[str]) -> dict[str, dict[str, Any]]:
+    """Batch get from *store*: one pipelined call for a BatchContextStore, else one get per key."""
+    if isinstance(store, BatchContextStore):
+        return store.get_many(context_keys)
+    return {key: data for key in context_keys if (data := store.get(key)) is not None}
+
+
+def cache_set_many(store: ContextStore, data_by_key: Mapping[str, Mapping[str, Any]]) -> None:
+    """Batch set on *store* (see :func:`cache_get_many`)."""
+    if isinstance(store, BatchContextStore):
+        store.set_many(data_by_key)
+        return
+    for key, data in data_by_key.items():
+        store.set(key, data)
+
+
+@runtime_checkable
+class ConditionalBatchStore(Protocol):
+    """A cache tier that can fill many keys only where no entry exists, atomically per key."""
+
+    def add_many(
+        self, data_by_key: Mapping[str, Mapping[str, Any]]
+    ) -> list[str]:  # pragma: no cover - Protocol
+        """Store each context whose key is absent; return the keys that were written."""
+        ...
+
+
+def cache_add_many(store: ContextStore, data_by_key: Mapping[str, Mapping[str, Any]]) -> list[str]:
+    """Store the entries of *data_by_key* whose keys *store* does not hold; return those keys.
+
+    A :class:`ConditionalBatchStore` checks and writes each key atomically, so an
+    entry written concurrently is never replaced. Other stores are read, then
+    written, which leaves a small window in which a concurrent write can be lost.
+    """
+    if isinstance(store, ConditionalBatchStore):
+        return store.add_many(data_by_key)
+    cached = cache_get_many(store, list(data_by_key))
+    fresh = {key: data for key, data in data_by_key.items() if key not in cached}
+    if fresh:
+        cache_set_many(store, fresh)
+    return list(fresh)
+
+
+def cache_delete_many(store: ContextStore, context_keys: Sequence[str]) -> None:
+    """Batch delete on *store* (see :func:`cache_get_many`)."""
+    if isinstance(store, BatchContextStore):
+        store.delete_many(context_keys)
+        return
+    for key in context_keys:
+        store.delete(key)
+
+
+@runtime_checkable
+class FieldPatchableStore(Protocol):
+    """A cache tier that can overwrite individual fields of an entry it already holds."""
+
+    def patch_existing(
+        self, context_key: str, fields: Mapping[str, Any]
+    ) -> bool:  # pragma: no cover - Protocol
+        """Write *fields* into the cached entry; return False (writing nothing) if it is absent."""
+        ...
+
+
+class JarvisRedisContextStore:
+    """ContextStore keeping one encoded value per context key in Redis.
+
+    With the default :class:`JsonCodec` the stored bytes match the shared-lib
+    RedisContextStore; binary codecs still read those JSON values, so the codec
+    can be changed without flushing Redis.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        codec: ContextCodec | None = None,
+        prefix: str = DEFAULT_REDIS_PREFIX,
+    ) -> None:
+        self._redis = client
+        self._codec = codec or JsonCodec()
+        self._prefix = prefix
+
+    def _key(self, context_key: str) -> str:
+        """Return the key used in Redis (with prefix when configured)."""
+        if not self._prefix:
+            return context_key
+        return f"{self._prefix}_{context_key}"
+
+    def get(self, context_key: str) -> dict[str, Any] | None:
+        payload = self._redis.get(self._key(context_key))
+        if payload is None:
+            return None
+        try:
+            return self._codec.decode(payload)
+        except Exception:
+            logger.exception("Failed to decode context for context_key %s", context_key)
+            raise
+
+    def set(self, context_key: str, data: Mapping[str, Any]) -> None:
+        self._redis.set(self._key(context_key), self._codec.encode(data))
+
+    def get_many(self, context_keys: Sequence[str]) -> dict[str, dict[str, Any]]:
+        """Return the stored contexts for *context_keys* with one MGET."""
+        if not context_keys:
+            return {}
+        payloads = self._redis.mget([self._key(k) for k in context_keys])
+        return {
+            context_key: self._codec.decode(payload)
+            for context_key, payload in zip(context_keys, payloads, strict=True)
+            if payload is not None
+        }
+
+    def set_many(self, data_by_key: Mapping[str, Mapping[str, Any]]) -> None:
+        """Store every context in *data_by_key* with one MSET."""
+        if data_by_key:
+            self._redis.mset(
+                {self._key(k): self._codec.encode(data) for k, data in data_by_key.items()}
+            )
+
+    def add_many(self, data_by_key: Mapping[str, Mapping[str, Any]]) -> list[str]:
+        """Store each context whose key is absent (pipelined SET NX); return the keys written."""
+        if not data_by_key:
+            return []
+        pipe = self._redis.pipeline(transaction=False)
+        for context_key, data in data_by_key.items():
+            pipe.set(self._key(context_key), self._codec.encode(data), nx=True)
+        return [
+            context_key
+            for context_key, written in zip(data_by_key, pipe.execute(), strict=True)
+            if written
+        ]
+
+    def delete_many(self, context_keys: Sequence[str]) -> None:
+        """Delete *context_keys* with one DEL."""
+        if context_keys:
+            self._redis.delete(*(self._key(k) for k in context_keys))
+
+    def update(self, context_key: str, patch: Mapping[str, Any]) -> dict[str, Any]:
+        current = self.get(context_key) or {}
+        updated = {**current, **{k: v for k, v in patch.items() if v is not None}}
+        self.set(context_key, updated)
+        return updated
+
+    def delete(self, context_key: str) -> None:
+        self._redis.delete(self._key(context_key))
+
+
+def _encode_field(value: Any) -> bytes:
+    if isinstance(value, str) and not value.startswith("\x00"):
+        return value.encode()
+    return _JSON_MARK + json.dumps(value, separators=(",", ":")).encode()
+
+
+def _decode_field(raw: bytes) -> Any:
+    if raw[:1] == _JSON_MARK:
+        return json.loads(raw[1:])
+    return raw.decode()
+
+
+def _decode_hash(raw: Mapping[bytes, bytes]) -> dict[str, Any]:
+    return {field.decode(): _decode_field(value) for field, value in raw.items()}
+
+
+class JarvisRedisHashContextStore:
+    """ContextStore keeping each context as a Redis hash, one field per context field.
+
+    Reads are one HGETALL (or HMGET via :meth:`get_fields`). :meth:`update` is one
+    MULTI/EXEC pipeline (HSET of the patched fields, then HGETALL), so changing
+    ``jira_number`` rewrites that field only and concurrent updates of different
+    fields never overwrite each other. :meth:`set` replaces the whole hash
+    (DEL + HSET in one transaction).
+
+    ``None`` values are not stored and an empty context is stored as no key,
+    since Redis has no empty hashes.
+    """
+
+    def __init__(self, client: Any, *, prefix: str = DEFAULT_REDIS_HASH_PREFIX) -> None:
+        self._redis = client
+        self._prefix = prefix
+
+    def _key(self, context_key: str) -> str:
+        """Return the key used in Redis (with prefix when configured)."""
+        if not self._prefix:
+            return context_key
+        return f"{self._prefix}_{context_key}"
+
+    def get(self, context_key: str) -> dict[str, Any] | None:
+        raw = self._redis.hgetall(self._key(context_key))
+        return _decode_hash(raw) if raw else None
+
+    def get_fields(self, context_key: str, fields: Sequence[str]) -> dict[str, Any]:
+        """Return only *fields* of the context (HMGET); absent fields are omitted."""
+        values = self._redis.hmget(self._key(context_key), list(fields))
+        return {
+            field: _decode_field(raw)
+            for field, raw in zip(fields, values, strict=True)
+            if raw is not None
+        }
+
+    def set(self, context_key: str, data: Mapping[str, Any]) -> None:
+        key = self._key(context_key)
+        mapping = {k: _encode_field(v) for k, v in data.items() if v is not None}
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.delete(key)
+        if mapping:
+            pipe.hset(key, mapping=mapping)
+        pipe.execute()
+
+    def get_many(self, context_keys: Sequence[str]) -> dict[str, dict[str, Any]]:
+        """Return the stored contexts for *context_keys* (HGETALL each, one pipeline)."""
+        pipe = self._redis.pipeline(transaction=False)
+        for context_key in context_keys:
+            pipe.hgetall(self._key(context_key))
+        return {
+            context_key: _decode_hash(raw)
+            for context_key, raw in zip(context_keys, pipe.execute(), strict=True)
+            if raw
+        }
+
+    def set_many(self, data_by_key: Mapping[str, Mapping[str, Any]]) -> None:
+        """Replace every context in *data_by_key* in one MULTI/EXEC pipeline."""
+        pipe = self._redis.pipeline(transaction=True)
+        for context_key, data in data_by_key.items():
+            key = self._key(context_key)
+            pipe.delete(key)
+            mapping = {k: _encode_field(v) for k, v in data.items() if v is not None}
+            if mapping:
+                pipe.hset(key, mapping=mapping)
+        pipe.execute()
+
+    def add_many(self, data_by_key: Mapping[str, Mapping[str, Any]]) -> list[str]:
+        """Create the hashes whose keys are absent (WATCH/EXISTS, then MULTI); return those keys.
+
+        The transaction is retried if a watched key changes before EXEC, so a hash
+        written concurrently is never replaced.
+        """
+        mappings = {
+            context_key: mapping
+            for context_key, data in data_by_key.items()
+            if (mapping := {k: _encode_field(v) for k, v in data.items() if v is not None})
+        }
+        if not mappings:
+            return []
+        keys = {self._key(context_key): context_key for context_key in mappings}
+
+        def _apply(pipe: Any) -> list[str]:
+            absent = [key for key in keys if not pipe.exists(key)]
+            pipe.multi()
+            for key in absent:
+                pipe.hset(key, mapping=mappings[keys[key]])
+            return [keys[key] for key in absent]
+
+        return self._redis.transaction(_apply, *keys, value_from_callable=True)
+
+    def delete_many(self, context_keys: Sequence[str]) -> None:
+        """Delete *context_keys* with one DEL."""
+        if context_keys:
+            self._redis.delete(*(self._key(k) for k in context_keys))
+
+    def update(self, context_key: str, patch: Mapping[str, Any]) -> dict[str, Any]:
+        key = self._key(context_key)
+        mapping = {k: _encode_field(v) for k, v in patch.items() if v is not None}
+        if not mapping:
+            return self.get(context_key) or {}
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hset(key, mapping=mapping)
+        pipe.hgetall(key)
+        _, raw = pipe.execute()
+        return _decode_hash(raw)
+
+    def patch_existing(self, context_key: str, fields: Mapping[str, Any]) -> bool:
+        """HSET *fields* only if the hash exists (WATCH/MULTI); return whether it did.
+
+        Used by the cache-backed store so a field update never turns an evicted
+        entry into a partial context that later reads would take as complete.
+        """
+        key = self._key(context_key)
+        mapping = {k: _encode_field(v) for k, v in fields.items() if v is not None}
+
+        def _apply(pipe: Any) -> bool:
+            if not pipe.exists(key):
+                return False
+            if mapping:
+                pipe.multi()
+                pipe.hset(key, mapping=mapping)
+            return True
+
+        return self._redis.transaction(_apply, key, value_from_callable=True)
+
+    def delete(self, context_key: str) -> None:
+        self._redis.delete(self._key(context_key))
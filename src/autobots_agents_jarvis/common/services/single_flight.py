@@ -0,0 +1,86 @@
+# ABOUTME: Per-key request coalescing ("single-flight") for cache-miss loads, for threads and asyncio tasks.
+# ABOUTME: Concurrent callers of the same key share one in-flight load instead of each hitting the database.
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
+
+
+class _Call[T]:
+    """One in-flight synchronous load and the outcome shared with its waiters."""
+
+    __slots__ = ("done", "error", "result")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Collapse concurrent loads of the same key into one.
+
+    :meth:`do` coalesces threads: the first caller for a key runs the loader and
+    later callers block until it finishes, then receive the same result (or the
+    same exception). :meth:`ado` does the same for asyncio tasks on one event
+    loop. Nothing is cached once the load completes; the next miss loads again.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call[Any]] = {}
+        self._tasks: dict[tuple[int, Hashable], asyncio.Future[Any]] = {}
+        self._loads = 0
+        self._coalesced = 0
+
+    def do[T](self, key: Hashable, load: Callable[[], T]) -> T:
+        """Return ``load()``, sharing one call among threads that ask for *key* concurrently."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+                self._loads += 1
+            else:
+                self._coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # pyright: ignore[reportReturnType]
+        try:
+            result = call.result = load()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return result
+
+    async def ado[T](self, key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+        """Await ``load()``, sharing one task among coroutines that ask for *key* concurrently.
+
+        A caller being cancelled does not cancel the shared load for the others.
+        """
+        flight_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            task = self._tasks.get(flight_key)
+            if task is None:
+                task = self._tasks[flight_key] = asyncio.ensure_future(load())
+                task.add_done_callback(lambda _: self._tasks.pop(flight_key, None))
+                self._loads += 1
+            else:
+                self._coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, int]:
+        """Return ``loads`` (loader calls) and ``coalesced`` (callers that shared one)."""
+        with self._lock:
+            return {"loads": self._loads, "coalesced": self._coalesced}
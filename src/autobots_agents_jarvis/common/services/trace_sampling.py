@@ -0,0 +1,190 @@
+# ABOUTME: Trace sampling policy: head ratios per domain/agent plus tail records for errors and slow turns.
+# ABOUTME: Servers, batch and invoke helpers consult it when building TraceMetadata and choosing enable_tracing.
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from autobots_devtools_shared_lib.common.observability import get_logger
+
+from autobots_agents_jarvis.common.configs.settings import get_app_settings
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from autobots_devtools_shared_lib.common.observability import TraceMetadata
+
+    from autobots_agents_jarvis.common.configs.settings import AppSettings
+
+logger = get_logger(__name__)
+
+_POLICY: TraceSamplingPolicy | None = None
+_LOCK = threading.Lock()
+
+
+def parse_sample_ratios(raw: str) -> dict[str, float]:
+    """Parse ``"name=ratio,name=ratio"`` into a mapping; ratios must lie in [0, 1]."""
+    ratios: dict[str, float] = {}
+    for entry in raw.split(","):
+        if not entry.strip():
+            continue
+        name, sep, value = entry.partition("=")
+        try:
+            ratio = float(value)
+        except ValueError:
+            ratio = -1.0
+        if not sep or not name.strip() or not 0.0 <= ratio <= 1.0:
+            msg = f"Invalid trace sample ratio {entry.strip()!r}; expected name=<0..1>"
+            raise ValueError(msg)
+        ratios[name.strip()] = ratio
+    return ratios
+
+
+@dataclass(frozen=True, slots=True)
+class TraceSamplingPolicy:
+    """Decide which sessions are traced in full, and which unsampled turns still get a record.
+
+    The head decision hashes a stable key (the session id), so every turn of a
+    session is either traced or not and the same session gets the same answer in
+    every process. The ratio is the agent override, else the domain override,
+    else ``ratio``. Unsampled turns run with ``enable_tracing=False`` (no Langfuse
+    callback, no per-turn flush); :meth:`tail_reason` says whether such a turn
+    failed or was slow enough to be worth a summary trace anyway.
+    """
+
+    ratio: float = 1.0
+    domain_ratios: dict[str, float] = field(default_factory=dict)
+    agent_ratios: dict[str, float] = field(default_factory=dict)
+    always_sample_errors: bool = True
+    slow_turn_seconds: float = 0.0
+
+    @classmethod
+    def from_settings(cls, settings: AppSettings) -> TraceSamplingPolicy:
+        """Build the policy from the ``TRACING_*`` sampling settings."""
+        if not 0.0 <= settings.tracing_sample_ratio <= 1.0:
+            msg = (
+                f"TRACING_SAMPLE_RATIO must be between 0 and 1, got {settings.tracing_sample_ratio}"
+            )
+            raise ValueError(msg)
+        return cls(
+            ratio=settings.tracing_sample_ratio,
+            domain_ratios=parse_sample_ratios(settings.tracing_domain_sample_ratios),
+            agent_ratios=parse_sample_ratios(settings.tracing_agent_sample_ratios),
+            always_sample_errors=settings.tracing_always_sample_errors,
+            slow_turn_seconds=settings.tracing_slow_turn_seconds,
+        )
+
+    def ratio_for(self, domain: str, agent: str | None = None) -> float:
+        """Return the head sampling ratio for *agent* within *domain*."""
+        if agent is not None and agent in self.agent_ratios:
+            return self.agent_ratios[agent]
+        return self.domain_ratios.get(domain, self.ratio)
+
+    def should_sample(self, key: str, *, domain: str, agent: str | None = None) -> bool:
+        """Return True if the session identified by *key* is traced in full."""
+        ratio = self.ratio_for(domain, agent)
+        if ratio >= 1.0:
+            return True
+        if ratio <= 0.0:
+            return False
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        return int.from_bytes(digest) / 2**64 < ratio
+
+    def tail_reason(self, *, duration: float, failed: bool) -> str | None:
+        """Return ``"error"`` or ``"slow"`` if an unsampled turn should still be recorded."""
+        if failed and self.always_sample_errors:
+            return "error"
+        if self.slow_turn_seconds > 0 and duration >= self.slow_turn_seconds:
+            return "slow"
+        return None
+
+
+def get_trace_sampling_policy() -> TraceSamplingPolicy:
+    """Return the process-wide policy, built from settings on first use."""
+    global _POLICY
+    policy = _POLICY
+    if policy is None:
+        with _LOCK:
+            if _POLICY is None:
+                _POLICY = TraceSamplingPolicy.from_settings(get_app_settings())
+            policy = _POLICY
+    return policy
+
+
+def set_trace_sampling_policy(policy: TraceSamplingPolicy | None) -> None:
+    """Install *policy* for this process; None rebuilds it from settings on next use."""
+    global _POLICY
+    with _LOCK:
+        _POLICY = policy
+
+
+def record_unsampled_turn(
+    trace_metadata: TraceMetadata,
+    *,
+    name: str,
+    reason: str,
+    duration: float,
+    error: str | None = None,
+) -> None:
+    """Send a one-event summary trace for a turn whose session was not sampled.
+
+    Best effort: does nothing when tracing is not initialised, and never raises.
+    """
+    from autobots_devtools_shared_lib.common.observability.tracing import get_langfuse_client
+
+    client = get_langfuse_client()
+    if client is None:
+        return
+    try:
+        from langfuse import propagate_attributes
+
+        with propagate_attributes(
+            user_id=trace_metadata.user_id,
+            session_id=trace_metadata.session_id,
+            tags=[*trace_metadata.tags, f"tail:{reason}"],
+        ):
+            client.create_event(
+                name=name,
+                metadata={**trace_metadata.to_dict(), "duration_s": round(duration, 3)},
+                level="ERROR" if error is not None else "WARNING",
+                status_message=error,
+            )
+    except Exception:
+        logger.warning("Failed to record tail-sampled turn", exc_info=True)
+
+
+@contextmanager
+def tail_sampled_turn(
+    trace_metadata: TraceMetadata,
+    *,
+    sampled: bool,
+    name: str,
+    policy: TraceSamplingPolicy | None = None,
+) -> Iterator[None]:
+    """Time the enclosed turn; if it was not sampled but failed or was slow, record it.
+
+    Exceptions propagate unchanged. Sampled turns are already traced in full, so
+    nothing extra is recorded for them.
+    """
+    started = time.perf_counter()
+    error: str | None = None
+    try:
+        yield
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        if not sampled:
+            duration = time.perf_counter() - started
+            reason = (policy or get_trace_sampling_policy()).tail_reason(
+                duration=duration, failed=error is not None
+            )
+            if reason is not None:
+                record_unsampled_turn(
+                    trace_metadata, name=name, reason=reason, duration=duration, error=error
+                )
@@ -0,0 +1,118 @@
+# ABOUTME: Once-per-process Langfuse tracing lifecycle: idempotent init and a background flusher thread.
+# ABOUTME: Chat start/stop hooks no longer build tracing clients or block on span export.
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from typing import TYPE_CHECKING
+
+from autobots_devtools_shared_lib.common.observability import (
+    flush_tracing,
+    get_logger,
+    init_tracing,
+)
+
+from autobots_agents_jarvis.common.configs.settings import get_app_settings
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = get_logger(__name__)
+
+_LOCK = threading.Lock()
+_ENABLED: bool | None = None  # None until init_process_tracing() has run
+_FLUSHER: BackgroundTraceFlusher | None = None
+_ATEXIT_REGISTERED = False
+
+
+class BackgroundTraceFlusher:
+    """Daemon thread that runs *flush* when asked, off the caller's thread.
+
+    Requests made while a flush is running coalesce into one follow-up flush, so
+    a burst of stopped chats costs at most two exports. :meth:`close` runs a last
+    flush and waits for it up to a timeout.
+    """
+
+    def __init__(self, flush: Callable[[], None]) -> None:
+        self._flush = flush
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self.flushes = 0
+        self._thread = threading.Thread(target=self._run, name="jarvis-trace-flusher", daemon=True)
+        self._thread.start()
+
+    def request(self) -> None:
+        """Schedule a flush and return immediately."""
+        self._wake.set()
+
+    def close(self, timeout: float) -> None:
+        """Run a final flush and wait up to *timeout* seconds for the thread to finish."""
+        self._closed.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("Trace flush did not finish within %.1fs at shutdown", timeout)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self._flush()
+            except Exception:
+                logger.warning("Background trace flush failed", exc_info=True)
+            self.flushes += 1
+            if self._closed.is_set():
+                return
+
+
+def init_process_tracing() -> bool:
+    """Initialise Langfuse tracing once for this process; later calls return the first result.
+
+    Before the client is created, the batch-exporter env vars from
+    ``AppSettings.tracing_exporter_env()`` are applied (explicit ``LANGFUSE_*`` /
+    ``OTEL_BSP_*`` variables win), so spans are exported by Langfuse's background
+    thread in batches from a bounded queue rather than on the request path.
+
+    Returns:
+        True if tracing is enabled, False if Langfuse is not configured or failed to start.
+    """
+    global _ENABLED, _FLUSHER
+    with _LOCK:
+        if _ENABLED is not None:
+            return _ENABLED
+        settings = get_app_settings()
+        for name, value in settings.tracing_exporter_env().items():
+            os.environ.setdefault(name, value)
+        _ENABLED = init_tracing()
+        if _ENABLED:
+            _FLUSHER = BackgroundTraceFlusher(flush_tracing)
+            _register_atexit(settings.tracing_shutdown_timeout)
+        return _ENABLED
+
+
+def request_trace_flush() -> None:
+    """Ask the background flusher to export pending spans; a no-op when tracing is off."""
+    flusher = _FLUSHER
+    if flusher is not None:
+        flusher.request()
+
+
+def shutdown_process_tracing(timeout: float = 5.0) -> None:
+    """Flush pending spans (bounded by *timeout*) and allow init_process_tracing() to run again."""
+    global _ENABLED, _FLUSHER
+    with _LOCK:
+        flusher, _FLUSHER = _FLUSHER, None
+        _ENABLED = None
+    if flusher is not None:
+        flusher.close(timeout)
+
+
+def _register_atexit(timeout: float) -> None:
+    """Register the shutdown hook once per process."""
+    global _ATEXIT_REGISTERED
+    if not _ATEXIT_REGISTERED:
+        atexit.register(shutdown_process_tracing, timeout)
+        _ATEXIT_REGISTERED = True
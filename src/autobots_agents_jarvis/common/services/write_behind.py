@@ -0,0 +1,295 @@
+# ABOUTME: Write-behind variant of the Jarvis cache-backed context store.
+# ABOUTME: Writes hit the cache immediately and are coalesced per key, then flushed to the DB in batches.
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any
+
+from autobots_devtools_shared_lib.common.observability import get_logger
+
+from autobots_agents_jarvis.common.services.context_store import JarvisCacheBackedContextStore
+from autobots_agents_jarvis.common.services.redis_store import cache_set_many
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping
+
+    from autobots_devtools_shared_lib.common.services import ContextStore
+
+    from autobots_agents_jarvis.common.db.repository import JarvisContextRepository
+
+logger = get_logger(__name__)
+
+
+class WriteBehindContextStore(JarvisCacheBackedContextStore):
+    """Cache-first context store that persists to the DB asynchronously.
+
+    set/update write the cache synchronously and record the latest value per
+    prefixed key in a pending map, so repeated writes to one key within a flush
+    window become a single DB row write. Pending rows are flushed with one
+    ``JarvisContextRepository.set_many`` call when:
+
+    - *flush_interval* seconds elapse (background daemon thread), or
+    - *batch_size* distinct keys are pending (flush is signalled), or
+    - *max_pending* distinct keys are pending (the writer flushes inline — backpressure), or
+    - :meth:`flush` / :meth:`close` is called (e.g. at process shutdown).
+
+    delete stays write-through and drops any pending write for the key; it waits
+    for an in-flight flush so that flush cannot resurrect the deleted row.
+    A failed flush puts its rows back (newer pending writes win) and is retried
+    on the next flush.
+
+    Cache misses read the DB, whose row can be older than an unflushed write, so
+    pending and in-flight values win over it, and a read that overlapped a flush
+    or delete is repeated before its rows are cached.
+    """
+
+    def __init__(
+        self,
+        db: JarvisContextRepository,
+        cache: ContextStore,
+        *,
+        prefix: str = "",
+        flush_interval: float | None = 1.0,
+        batch_size: int = 200,
+        max_pending: int = 10_000,
+        read_your_writes_window: float = 0.0,
+        negative_ttl: float = 0.0,
+        negative_max_entries: int = 10_000,
+    ) -> None:
+        super().__init__(
+            db=db,
+            cache=cache,
+            prefix=prefix,
+            read_your_writes_window=read_your_writes_window,
+            negative_ttl=negative_ttl,
+            negative_max_entries=negative_max_entries,
+        )
+        self._batch_size = batch_size
+        self._max_pending = max_pending
+        self._pending: dict[str, dict[str, Any]] = {}
+        # The batch being flushed: taken from _pending, not yet committed.
+        self._inflight: dict[str, dict[str, Any]] = {}
+        # Bumped whenever a flush or delete commits, to fence DB reads that overlapped it.
+        self._db_generation = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._writes_received = 0
+        self._writes_coalesced = 0
+        self._rows_flushed = 0
+        self._flushes = 0
+        self._flush_errors = 0
+        self._thread: threading.Thread | None = None
+        if flush_interval is not None:
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(flush_interval,),
+                name="jarvis-context-write-behind",
+                daemon=True,
+            )
+            self._thread.start()
+
+    # ------------------------------------------------------------------
+    # ContextStore API
+    # ------------------------------------------------------------------
+
+    def _lookup(self, key: str) -> dict[str, Any] | None:
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        with self._lock:
+            unflushed = self._unflushed(key)
+        if unflushed is not None:
+            return dict(unflushed)
+        if self._known_missing(key):
+            return None
+        return self._load_coalesced(key)
+
+    def set(self, context_key: str, data: Mapping[str, Any]) -> None:
+        key = self._key(context_key)
+        with self._lock:
+            self._cache.set(key, data)
+            self._enqueue(key, dict(data))
+        self._enqueued([key])
+
+    def update(self, context_key: str, patch: Mapping[str, Any]) -> dict[str, Any]:
+        key = self._key(context_key)
+        # Unflushed writes are newer than the DB, so read pending/cache before falling back.
+        # The read, merge and enqueue hold the lock so concurrent updates cannot drop fields.
+        with self._lock:
+            current = self._unflushed(key)
+            if current is None:
+                current = self._cache.get(key) or self._repo.get(key, primary=True) or {}
+            updated = {**current, **{k: v for k, v in patch.items() if v is not None}}
+            self._cache.set(key, updated)
+            self._enqueue(key, updated)
+        self._enqueued([key])
+        return updated
+
+    def patch(self, context_key: str, fields: Mapping[str, Any]) -> bool:
+        """Queue a partial update; returns ``True`` when it changes the current value."""
+        key = self._key(context_key)
+        with self._lock:
+            current = self._unflushed(key)
+        if current is None:
+            current = self._cache.get(key) or {}
+        changed = any(v is not None and current.get(k) != v for k, v in fields.items())
+        if changed:
+            self.update(context_key, fields)
+        return changed
+
+    def delete(self, context_key: str) -> None:
+        key = self._key(context_key)
+        # Wait out an in-flight flush: it would write the row back, or re-queue it on failure.
+        with self._flush_lock:
+            with self._lock:
+                self._pending.pop(key, None)
+            self._db.delete(key)
+            with self._lock:
+                self._cache.delete(key)
+                self._db_generation += 1
+        self._mark_written([key])
+
+    def set_many(self, data_by_key: Mapping[str, Mapping[str, Any]]) -> None:
+        prefixed = {self._key(k): v for k, v in data_by_key.items()}
+        with self._lock:
+            cache_set_many(self._cache, prefixed)
+            for key, data in prefixed.items():
+                self._enqueue(key, dict(data))
+        self._enqueued(prefixed)
+
+    # ------------------------------------------------------------------
+    # Cache-miss loads
+    # ------------------------------------------------------------------
+
+    def _unflushed(self, key: str) -> dict[str, Any] | None:
+        """Return the pending or in-flight value of *key*; the caller holds ``self._lock``."""
+        data = self._pending.get(key)
+        return self._inflight.get(key) if data is None else data
+
+    def _load(self, key: str) -> dict[str, Any] | None:
+        write_seq = self._write_seq
+
+        def _read() -> dict[str, dict[str, Any]]:
+            data = self._repo.get(key, primary=self._read_primary(key))
+            return {} if data is None else {key: data}
+
+        data = self._read_fenced([key], _read).get(key)
+        if data is None:
+            self._remember_missing([key], write_seq)
+        return data
+
+    def _load_many(self, keys: list[str]) -> dict[str, dict[str, Any]]:
+        write_seq = self._write_seq
+        loaded = self._read_fenced(keys, lambda: self._read_many(keys))
+        self._remember_missing((k for k in keys if k not in loaded), write_seq)
+        return loaded
+
+    def _read_fenced(
+        self, keys: list[str], read: Callable[[], dict[str, dict[str, Any]]]
+    ) -> dict[str, dict[str, Any]]:
+        """Run the DB *read* of *keys* and cache the result, never older than a write made here.
+
+        Unflushed values replace the rows read. If a flush or delete committed
+        while *read* ran, the rows may predate it, so the read is repeated.
+        """
+        while True:
+            with self._lock:
+                generation = self._db_generation
+            loaded = read()
+            with self._lock:
+                if self._db_generation != generation:
+                    continue
+                for key in keys:
+                    unflushed = self._unflushed(key)
+                    if unflushed is not None:
+                        loaded[key] = dict(unflushed)
+                cache_set_many(self._cache, loaded)
+                return loaded
+
+    # ------------------------------------------------------------------
+    # Queue management
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, key: str, data: dict[str, Any]) -> None:
+        """Record *data* as the pending write of *key*; the caller holds ``self._lock``.
+
+        Writers update the cache under the same lock, so a cache-miss load never
+        fills the cache between a write's cache update and its enqueue.
+        """
+        if key in self._pending:
+            self._writes_coalesced += 1
+        self._pending[key] = data
+        self._writes_received += 1
+
+    def _enqueued(self, keys: Iterable[str]) -> None:
+        """After enqueueing *keys*: fence their negative entries, then flush or wake the flusher."""
+        self._forget_missing(keys)
+        with self._lock:
+            pending = len(self._pending)
+        if pending >= self._max_pending:
+            self.flush()
+        elif pending >= self._batch_size:
+            self._wake.set()
+
+    def _run(self, flush_interval: float) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Write-behind flush failed; will retry on next interval")
+
+    def flush(self) -> int:
+        """Persist all pending writes in one batch; return the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+            if not batch:
+                return 0
+            try:
+                self._repo.set_many(batch)
+            except Exception:
+                with self._lock:
+                    self._inflight = {}
+                    self._flush_errors += 1
+                    # Keep writes that arrived during the failed flush; they are newer.
+                    self._pending = {**batch, **self._pending}
+                raise
+            with self._lock:
+                self._inflight = {}
+                self._db_generation += 1
+                self._rows_flushed += len(batch)
+                self._flushes += 1
+            self._mark_written(batch)
+            return len(batch)
+
+    def close(self) -> None:
+        """Stop the background flusher and flush anything still pending."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def stats(self) -> dict[str, Any]:
+        """Return write-behind counters.
+
+        ``coalescing_ratio`` is writes received per DB row queued (1.0 means no
+        coalescing; 5.0 means five writes to a key collapsed into one row write).
+        """
+        with self._lock:
+            queued_rows = self._writes_received - self._writes_coalesced
+            return {
+                "writes_received": self._writes_received,
+                "writes_coalesced": self._writes_coalesced,
+                "rows_flushed": self._rows_flushed,
+                "flushes": self._flushes,
+                "flush_errors": self._flush_errors,
+                "pending": len(self._pending),
+                "coalescing_ratio": self._writes_received / queued_rows if queued_rows else 1.0,
+            }
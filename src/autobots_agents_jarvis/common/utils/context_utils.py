@@ -1,9 +1,18 @@
-# ABOUTME: Jarvis context key resolution for UI (Chainlit).
+# ABOUTME: Jarvis context key resolution for UI (Chainlit), plus patch_context() for changed-field writes.
 # ABOUTME: Registers a resolver that uses user_name from agent state so context store lookups align with the logged-in user.
 
 from __future__ import annotations
 
-from autobots_devtools_shared_lib.common.utils.context_utils import set_context_key_resolver
+from typing import TYPE_CHECKING, Any
+
+from autobots_devtools_shared_lib.common.services import get_context_store
+from autobots_devtools_shared_lib.common.utils.context_utils import (
+    set_context_key_resolver,
+    update_context,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
 
 
 def init_context_key_resolver() -> None:
@@ -14,3 +23,16 @@ def init_context_key_resolver() -> None:
     get/set/update use the same key (e.g. for workspace context and session persistence).
     """
     set_context_key_resolver(lambda state: state.get("user_name") or "default")
+
+
+def patch_context(context_key: str, fields: Mapping[str, Any]) -> None:
+    """Write only *fields* for *context_key*, skipping the DB write when unchanged.
+
+    Uses the store's ``patch`` (JarvisCacheBackedContextStore) when available; other
+    stores (e.g. the in-memory fallback) get a regular update_context() merge.
+    """
+    patch = getattr(get_context_store(), "patch", None)
+    if patch is None:
+        update_context(context_key, dict(fields))
+        return
+    patch(context_key, fields)
@@ -3,17 +3,22 @@
 
 import asyncio
 import uuid
+from contextlib import nullcontext
 from typing import TYPE_CHECKING
 
 from autobots_devtools_shared_lib.common.observability import (
     TraceMetadata,
     get_logger,
-    init_tracing,
     set_session_id,
 )
 from autobots_devtools_shared_lib.dynagent import ainvoke_agent, invoke_agent
 from dotenv import load_dotenv
 
+from autobots_agents_jarvis.common.services.trace_sampling import (
+    get_trace_sampling_policy,
+    tail_sampled_turn,
+)
+from autobots_agents_jarvis.common.services.tracing_setup import init_process_tracing
 from autobots_agents_jarvis.domains.concierge.tools import register_concierge_tools
 
 if TYPE_CHECKING:
@@ -24,7 +29,7 @@ load_dotenv()
 
 
 register_concierge_tools()
-init_tracing()
+init_process_tracing()
 
 APP_NAME = "concierge-invoke-demo"
 
@@ -46,7 +51,8 @@ def call_invoke_agent_sync(
         agent_name: Name of the agent to invoke (e.g., "joke_agent", "coordinator")
         user_message: Message to send to the agent
         session_id: Optional session ID for tracking (auto-generated if None)
-        enable_tracing: Whether to enable Langfuse tracing (default True)
+        enable_tracing: Whether to enable Langfuse tracing (default True; the
+            trace sampling policy still decides whether this call is traced)
 
     Returns:
         dict: The complete final state from the agent execution
@@ -83,15 +89,25 @@ def call_invoke_agent_sync(
         user_id=APP_NAME,
         tags=[APP_NAME, agent_name, "sync"],
     )
+    # The sampling policy decides unless the caller turned tracing off.
+    trace_sampled = enable_tracing and get_trace_sampling_policy().should_sample(
+        session_id, domain=APP_NAME, agent=agent_name
+    )
+    turn = (
+        tail_sampled_turn(trace_metadata, sampled=trace_sampled, name=f"{APP_NAME}-{agent_name}")
+        if enable_tracing
+        else nullcontext()
+    )
 
     logger.info(f"Invoking SYNC agent '{agent_name}'")
-    result = invoke_agent(
-        agent_name=agent_name,
-        input_state=input_state,
-        config=config,
-        trace_metadata=trace_metadata,
-        enable_tracing=enable_tracing,
-    )
+    with turn:
+        result = invoke_agent(
+            agent_name=agent_name,
+            input_state=input_state,
+            config=config,
+            trace_metadata=trace_metadata,
+            enable_tracing=trace_sampled,
+        )
 
     messages = result.get("messages") or []
     logger.debug(f"#Messages: {len(messages)}")
@@ -122,7 +138,8 @@ async def call_invoke_agent_async(
         agent_name: Name of the agent to invoke (e.g., "joke_agent", "coordinator")
         user_message: Message to send to the agent
         session_id: Optional session ID for tracking (auto-generated if None)
-        enable_tracing: Whether to enable Langfuse tracing (default True)
+        enable_tracing: Whether to enable Langfuse tracing (default True; the
+            trace sampling policy still decides whether this call is traced)
 
     Returns:
         dict: The complete final state from the agent execution
@@ -159,15 +176,25 @@ async def call_invoke_agent_async(
         user_id=APP_NAME,
         tags=[APP_NAME, agent_name, "async"],
     )
+    # The sampling policy decides unless the caller turned tracing off.
+    trace_sampled = enable_tracing and get_trace_sampling_policy().should_sample(
+        session_id, domain=APP_NAME, agent=agent_name
+    )
+    turn = (
+        tail_sampled_turn(trace_metadata, sampled=trace_sampled, name=f"{APP_NAME}-{agent_name}")
+        if enable_tracing
+        else nullcontext()
+    )
 
     logger.info(f"Invoking ASYNC agent '{agent_name}'")
-    result = await ainvoke_agent(
-        agent_name=agent_name,
-        input_state=input_state,
-        config=config,
-        trace_metadata=trace_metadata,
-        enable_tracing=enable_tracing,
-    )
+    with turn:
+        result = await ainvoke_agent(
+            agent_name=agent_name,
+            input_state=input_state,
+            config=config,
+            trace_metadata=trace_metadata,
+            enable_tracing=trace_sampled,
+        )
 
     messages = result.get("messages") or []
     logger.debug(f"#Messages: {len(messages)}")
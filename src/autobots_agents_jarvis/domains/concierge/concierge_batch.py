@@ -1,17 +1,22 @@
 # ABOUTME: Concierge-scoped batch entry point — validates against Concierge's agent set.
 # ABOUTME: Delegates to dynagent's batch_invoker after the Concierge gate passes.
 
+import time
 import uuid
 
 from autobots_devtools_shared_lib.common.observability import (
     TraceMetadata,
     get_logger,
-    init_tracing,
     set_session_id,
 )
 from autobots_devtools_shared_lib.dynagent import BatchResult, batch_invoker
 from dotenv import load_dotenv
 
+from autobots_agents_jarvis.common.services.trace_sampling import (
+    get_trace_sampling_policy,
+    record_unsampled_turn,
+)
+from autobots_agents_jarvis.common.services.tracing_setup import init_process_tracing
 from autobots_agents_jarvis.domains.concierge.settings import init_concierge_settings
 
 logger = get_logger(__name__)
@@ -65,7 +70,7 @@ def concierge_batch(agent_name: str, records: list[str], user_id: str) -> BatchR
     if not records:
         raise ValueError("records must not be empty")
 
-    init_tracing()
+    init_process_tracing()  # idempotent: the client is built once per process
 
     trace_metadata = TraceMetadata.create(
         session_id=session_id,
@@ -73,12 +78,25 @@ def concierge_batch(agent_name: str, records: list[str], user_id: str) -> BatchR
         user_id=user_id,
         tags=[APP_NAME, agent_name, "batch"],
     )
+    # One head decision per batch run (batch_invoker traces all records or none).
+    policy = get_trace_sampling_policy()
+    trace_sampled = policy.should_sample(session_id, domain=APP_NAME, agent=agent_name)
 
+    started = time.perf_counter()
     result = batch_invoker(
         agent_name,
         records,
+        enable_tracing=trace_sampled,
         trace_metadata=trace_metadata,
     )
+    if not trace_sampled and result.failures and policy.always_sample_errors:
+        record_unsampled_turn(
+            trace_metadata,
+            name=f"{APP_NAME}-{agent_name}",
+            reason="error",
+            duration=time.perf_counter() - started,
+            error=f"{len(result.failures)} of {len(records)} records failed",
+        )
 
     logger.info(
         f"concierge_batch complete: agent={agent_name} successes={len(result.successes)} "
@@ -1,24 +1,39 @@
 # ABOUTME: Concierge-specific Chainlit entry point for the concierge_chat use case.
 # ABOUTME: Wires tracing, OAuth, and the shared streaming helper.
 
+import asyncio
 import os
+import time
 from typing import TYPE_CHECKING, Any
 
 import chainlit as cl
 from autobots_devtools_shared_lib.common.observability import (
     TraceMetadata,
-    flush_tracing,
     get_logger,
-    init_tracing,
     set_session_id,
 )
-from autobots_devtools_shared_lib.dynagent import create_base_agent
+from autobots_devtools_shared_lib.dynagent.agents.agent_config_utils import get_default_agent
 from autobots_devtools_shared_lib.dynagent.ui import stream_agent_events
 from dotenv import load_dotenv
 
 from autobots_agents_jarvis.common.models.state import JarvisState
+from autobots_agents_jarvis.common.services.agent_cache import (
+    get_base_agent,
+    release_agent_thread,
+)
 from autobots_agents_jarvis.common.services.context_setup import init_context_store
-from autobots_agents_jarvis.common.utils.context_utils import init_context_key_resolver
+from autobots_agents_jarvis.common.services.trace_sampling import (
+    get_trace_sampling_policy,
+    tail_sampled_turn,
+)
+from autobots_agents_jarvis.common.services.tracing_setup import (
+    init_process_tracing,
+    request_trace_flush,
+)
+from autobots_agents_jarvis.common.utils.context_utils import (
+    init_context_key_resolver,
+    patch_context,
+)
 from autobots_agents_jarvis.common.utils.formatting import format_structured_output
 from autobots_agents_jarvis.domains.concierge.settings import init_concierge_settings
 from autobots_agents_jarvis.domains.concierge.tools import register_concierge_tools
@@ -42,7 +57,11 @@ init_concierge_settings()
 init_context_key_resolver()
 init_context_store(app_name=APP_NAME)
 
-# Registration must precede AgentMeta.instance() (called inside create_base_agent).
+# Tracing is set up once per process; spans export from a background thread.
+init_process_tracing()
+
+# Registration must precede AgentMeta.instance() (called inside create_base_agent,
+# on the first get_base_agent() of the process).
 register_concierge_tools()
 
 
@@ -98,10 +117,10 @@ def _get_user_identifier() -> str:
 @cl.on_chat_start
 async def start():
     """Initialize the chat session with the welcome agent."""
-    # Create agent instance once and store it in session
-    init_tracing()
-    base_agent = create_base_agent(state_schema=JarvisState)
-    cl.user_session.set("base_agent", base_agent)
+    started = time.perf_counter()
+    # The compiled agent is shared by every session of the process (conversation state is
+    # keyed by thread_id), so only the first chat start pays for building it.
+    get_base_agent(APP_NAME, state_schema=JarvisState)
 
     # Prepare trace metadata for Langfuse observability (session-level)
     user_id = _get_user_identifier()
@@ -115,6 +134,14 @@ async def start():
     )
     set_session_id(cl.context.session.thread_id)
     cl.user_session.set("trace_metadata", trace_metadata)
+    # Head sampling is per session, so a conversation is traced in full or not at all.
+    # Chats start on the default agent, so its TRACING_AGENT_SAMPLE_RATIOS entry applies.
+    cl.user_session.set(
+        "trace_sampled",
+        get_trace_sampling_policy().should_sample(
+            cl.context.session.thread_id, domain=APP_NAME, agent=get_default_agent()
+        ),
+    )
 
     await cl.Message(content="Hello! I'm Concierge. How can I help you today?").send()
 
@@ -122,7 +149,9 @@ async def start():
     try:
         from autobots_devtools_shared_lib.common.utils.context_utils import update_context
 
-        update_context(
+        # The store call may hit Redis/Postgres; keep it off the event loop.
+        await asyncio.to_thread(
+            update_context,
             user_id,
             {
                 "user_name": user_id,
@@ -132,6 +161,7 @@ async def start():
         )
     except Exception:
         logger.warning("Failed to seed context store", exc_info=True)
+    logger.debug(f"Chat start took {(time.perf_counter() - started) * 1000:.1f} ms")
 
 
 @cl.on_message
@@ -147,11 +177,8 @@ async def on_message(message: cl.Message):
         "run_name": APP_NAME,  # Set trace name for Langfuse
     }
 
-    # Reuse the same agent instance from session
-    base_agent = cl.user_session.get("base_agent")
-    if not base_agent:
-        await cl.Message(content="Error: Session initialization failed. Please refresh.").send()
-        return
+    # Process-wide agent, built by the first chat start
+    base_agent = get_base_agent(APP_NAME, state_schema=JarvisState)
 
     # Session user for context key and stored user_name (from state.user_name only, not user_id).
     session_user_name = cl.user_session.get("user_id")
@@ -165,30 +192,38 @@ async def on_message(message: cl.Message):
 
     # Retrieve trace metadata from session
     trace_metadata = cl.user_session.get("trace_metadata")
-
-    result = await stream_agent_events(
-        agent=base_agent,
-        input_state=input_state,
-        config=config,
-        on_structured_output=format_structured_output,
-        enable_tracing=True,
-        trace_metadata=trace_metadata,
-    )
+    trace_sampled = cl.user_session.get("trace_sampled", True)
+
+    # Unsampled turns skip Langfuse entirely; failed or slow ones still get a summary trace.
+    with tail_sampled_turn(trace_metadata, sampled=trace_sampled, name=f"{APP_NAME}-turn"):
+        result = await stream_agent_events(
+            agent=base_agent,
+            input_state=input_state,
+            config=config,
+            on_structured_output=format_structured_output,
+            enable_tracing=trace_sampled,
+            trace_metadata=trace_metadata,
+        )
     # Re-assert user_name from session so it is not overwritten by tool payloads (e.g. names from messages).
+    # patch_context writes only user_name and skips the DB write when it is unchanged.
     if session_user_name:
-        from autobots_devtools_shared_lib.common.utils.context_utils import update_context
-
-        update_context(session_user_name, {"user_name": session_user_name})
+        await asyncio.to_thread(patch_context, session_user_name, {"user_name": session_user_name})
     logger.debug(f"Agent execution completed with result: {result}")
 
 
 @cl.on_stop
 def on_stop() -> None:
     """Handle chat stop."""
-    flush_tracing()
+    request_trace_flush()  # non-blocking; the background flusher exports pending spans
     logger.info("Chat session stopped")
 
 
+@cl.on_chat_end
+def on_chat_end() -> None:
+    """Free the session's checkpoints held by the process-wide agent."""
+    release_agent_thread(cl.context.session.thread_id)
+
+
 if __name__ == "__main__":
     from chainlit.cli import run_chainlit
 
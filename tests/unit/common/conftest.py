@@ -0,0 +1,23 @@
+# ABOUTME: Shared fixtures for the context-store service tests.
+# ABOUTME: Provides a JarvisContextRepository over a fresh in-memory SQLite database.
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+
+from autobots_agents_jarvis.common.db.repository import JarvisContextRepository
+
+
+@pytest.fixture()
+def repo():
+    # StaticPool shares one connection, so worker threads (flushers, stampedes) see the same DB.
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    yield JarvisContextRepository(sessionmaker(bind=engine, expire_on_commit=False))
+    engine.dispose()
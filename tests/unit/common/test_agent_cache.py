@@ -0,0 +1,170 @@
+# ABOUTME: Unit tests for the process-level base agent cache used by the Chainlit servers.
+# ABOUTME: Uses a counting build callable so no model or network access is needed.
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from autobots_agents_jarvis.common.models.state import JarvisState
+from autobots_agents_jarvis.common.services.agent_cache import (
+    agent_cache_stats,
+    agent_config_hash,
+    clear_agent_cache,
+    get_base_agent,
+    release_agent_thread,
+)
+
+
+class _OtherState(JarvisState):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_agent_cache()
+    yield
+    clear_agent_cache()
+
+
+@pytest.fixture()
+def config_dir(tmp_path, monkeypatch):
+    import autobots_devtools_shared_lib.dynagent.config.dynagent_settings as settings_module
+
+    (tmp_path / "agents.yaml").write_text("agents: {}\n")
+    (tmp_path / "prompts").mkdir()
+    (tmp_path / "prompts" / "welcome.md").write_text("Hello\n")
+    monkeypatch.setenv("DYNAGENT_CONFIG_ROOT_DIR", str(tmp_path))
+    settings_module._settings = None
+    return tmp_path
+
+
+def _counting_build():
+    calls = []
+
+    def build(_checkpointer):
+        calls.append(1)
+        return object()
+
+    return build, calls
+
+
+# ---------------------------------------------------------------------------
+# get_base_agent
+# ---------------------------------------------------------------------------
+
+
+def test_second_lookup_reuses_the_built_agent(config_dir):
+    build, calls = _counting_build()
+
+    first = get_base_agent("concierge_chat", state_schema=JarvisState, build=build)
+    second = get_base_agent("concierge_chat", state_schema=JarvisState, build=build)
+
+    assert first is second
+    assert len(calls) == 1
+    stats = agent_cache_stats()
+    assert (stats["builds"], stats["hits"], stats["size"]) == (1, 1, 1)
+
+
+def test_domain_and_state_schema_are_part_of_the_key(config_dir):
+    build, calls = _counting_build()
+
+    a = get_base_agent("concierge_chat", state_schema=JarvisState, build=build)
+    b = get_base_agent("sales_chat", state_schema=JarvisState, build=build)
+    c = get_base_agent("concierge_chat", state_schema=_OtherState, build=build)
+
+    assert len({id(a), id(b), id(c)}) == 3
+    assert len(calls) == 3
+
+
+def test_concurrent_first_lookups_build_once(config_dir):
+    calls = []
+    lock = threading.Lock()
+
+    def slow_build(_checkpointer):
+        with lock:
+            calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        agents = list(
+            pool.map(
+                lambda _: get_base_agent(
+                    "concierge_chat", state_schema=JarvisState, build=slow_build
+                ),
+                range(16),
+            )
+        )
+
+    assert len(calls) == 1
+    assert all(agent is agents[0] for agent in agents)
+
+
+def test_failed_build_is_not_cached(config_dir):
+    def broken(_checkpointer):
+        msg = "model unavailable"
+        raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError, match="model unavailable"):
+        get_base_agent("concierge_chat", state_schema=JarvisState, build=broken)
+
+    build, calls = _counting_build()
+    get_base_agent("concierge_chat", state_schema=JarvisState, build=build)
+    assert len(calls) == 1
+
+
+def test_release_agent_thread_drops_only_that_threads_checkpoints(config_dir):
+    from langgraph.checkpoint.base import empty_checkpoint
+
+    savers = []
+
+    def build(checkpointer):
+        savers.append(checkpointer)
+        return object()
+
+    get_base_agent("concierge_chat", state_schema=JarvisState, build=build)
+    get_base_agent("sales_chat", state_schema=JarvisState, build=build)
+    for saver in savers:
+        for thread_id in ("t1", "t2"):
+            saver.put(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}},
+                empty_checkpoint(),
+                {},
+                {},
+            )
+
+    release_agent_thread("t1")
+
+    for saver in savers:
+        assert saver.get_tuple({"configurable": {"thread_id": "t1"}}) is None
+        assert saver.get_tuple({"configurable": {"thread_id": "t2"}}) is not None
+
+
+# ---------------------------------------------------------------------------
+# agent_config_hash
+# ---------------------------------------------------------------------------
+
+
+def test_config_hash_tracks_config_contents(config_dir):
+    before = agent_config_hash()
+    assert agent_config_hash(config_dir) == before
+
+    (config_dir / "prompts" / "welcome.md").write_text("Hi there\n")
+    assert agent_config_hash() == before  # memoized for the process
+    clear_agent_cache()
+    assert agent_config_hash() != before
+
+
+def test_changed_config_builds_a_new_agent(config_dir):
+    build, calls = _counting_build()
+    first = get_base_agent("concierge_chat", state_schema=JarvisState, build=build)
+
+    (config_dir / "agents.yaml").write_text("agents: {welcome: {}}\n")
+    clear_agent_cache()
+
+    assert get_base_agent("concierge_chat", state_schema=JarvisState, build=build) is not first
+    assert len(calls) == 2
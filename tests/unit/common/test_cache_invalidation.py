@@ -0,0 +1,98 @@
+# ABOUTME: Unit tests for cross-process L1 invalidation (RedisInvalidationBus) using fakeredis.
+# ABOUTME: Two near-caches on one FakeServer stand in for two server processes sharing Redis.
+
+from __future__ import annotations
+
+import time
+
+import fakeredis
+import pytest
+from autobots_devtools_shared_lib.common.services import InMemoryContextStore
+
+from autobots_agents_jarvis.common.services.cache_invalidation import RedisInvalidationBus
+from autobots_agents_jarvis.common.services.near_cache import LRUContextCache, NearCacheContextStore
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.fixture()
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture()
+def make_process(server):
+    """Build a near-cache 'process' sharing the remote cache and the pub/sub server."""
+    remote = InMemoryContextStore()
+    created: list[NearCacheContextStore] = []
+
+    def _make(**bus_kwargs) -> tuple[NearCacheContextStore, LRUContextCache, RedisInvalidationBus]:
+        local = LRUContextCache(max_entries=64, ttl=0)
+        bus = RedisInvalidationBus(
+            fakeredis.FakeRedis(server=server), poll_interval=0.02, **bus_kwargs
+        )
+        near = NearCacheContextStore(local, remote, bus=bus)
+        assert bus.wait_subscribed(timeout=5)
+        created.append(near)
+        return near, local, bus
+
+    yield _make
+    for near in created:
+        near.close()
+
+
+def test_write_in_one_process_evicts_l1_in_the_other(make_process):
+    proc_a, local_a, _ = make_process()
+    proc_b, _, _ = make_process()
+    proc_a.set("k1", {"user_name": "alice"})
+    assert proc_b.get("k1") == {"user_name": "alice"}  # cached in B's L1
+
+    proc_a.set("k1", {"user_name": "bob"})
+
+    assert _wait_for(lambda: proc_b.get("k1") == {"user_name": "bob"})
+    # A's own message is ignored: its L1 already holds the new value.
+    assert local_a.get("k1") == {"user_name": "bob"}
+
+
+def test_write_burst_is_batched_into_few_messages(make_process):
+    proc_a, _, bus_a = make_process(batch_interval=0.05)
+    _, _, bus_b = make_process()
+
+    for i in range(300):
+        proc_a.set(f"k{i}", {"user_name": str(i)})
+
+    assert _wait_for(lambda: bus_b.stats()["keys_received"] == 300)
+    assert bus_a.stats()["messages_published"] < 30
+
+
+def test_subscriber_reconnect_flushes_l1(server, make_process):
+    proc, local, bus = make_process(reconnect_delay=0.01)
+    proc.set("k1", {"user_name": "alice"})
+    assert local.stats()["size"] == 1
+
+    server.connected = False
+    assert _wait_for(lambda: not bus.wait_subscribed(timeout=0))
+    server.connected = True
+
+    assert _wait_for(lambda: bus.stats()["subscriptions"] >= 2)
+    assert local.stats()["size"] == 0
+
+
+def test_malformed_messages_are_ignored(server, make_process):
+    _, local, bus = make_process()
+    local.set("k1", {"v": 1})
+
+    fakeredis.FakeRedis(server=server).publish("jarvis:context:invalidate", "not json")
+    fakeredis.FakeRedis(server=server).publish(
+        "jarvis:context:invalidate", '{"origin": "other", "keys": ["k1"]}'
+    )
+
+    assert _wait_for(lambda: bus.stats()["keys_received"] == 1)
+    assert local.get("k1") is None
@@ -0,0 +1,153 @@
+# ABOUTME: Unit tests for the Redis value codecs and JarvisRedisContextStore (fakeredis).
+# ABOUTME: Covers round-trips, cross-codec reads during a codec switch, zstd thresholds and settings wiring.
+
+from __future__ import annotations
+
+import json
+
+import fakeredis
+import pytest
+
+from autobots_agents_jarvis.common.services.codecs import (
+    CODEC_NAMES,
+    CompactCodec,
+    JsonCodec,
+    build_codec,
+)
+from autobots_agents_jarvis.common.services.redis_store import JarvisRedisContextStore
+
+pytest.importorskip("msgpack")
+pytest.importorskip("zstandard")
+
+_CONTEXT = {
+    "domain_name": "concierge_chat",
+    "user_name": "alice",
+    "session_id": "c0ffee-1234",
+    "jira_number": "JAR-42",
+}
+
+_ALL_CODECS = [(name, threshold) for name in CODEC_NAMES for threshold in (0, 1)]
+
+
+# ---------------------------------------------------------------------------
+# Codecs
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(("name", "threshold"), _ALL_CODECS)
+def test_codec_round_trips_schema_contexts(name, threshold):
+    codec = build_codec(name, zstd_threshold=threshold)
+    assert codec.decode(codec.encode(_CONTEXT)) == _CONTEXT
+
+
+@pytest.mark.parametrize(("name", "threshold"), _ALL_CODECS)
+def test_codec_round_trips_keys_outside_the_schema(name, threshold):
+    codec = build_codec(name, zstd_threshold=threshold)
+    data = {**_CONTEXT, "turns": 3, "tags": ["a", "b"]}
+    assert codec.decode(codec.encode(data)) == data
+
+
+@pytest.mark.parametrize("writer", _ALL_CODECS)
+@pytest.mark.parametrize("reader", CODEC_NAMES)
+def test_every_codec_reads_values_written_by_the_others(writer, reader):
+    payload = build_codec(writer[0], zstd_threshold=writer[1]).encode(_CONTEXT)
+    assert build_codec(reader).decode(payload) == _CONTEXT
+
+
+def test_json_codec_matches_shared_lib_format():
+    assert JsonCodec().encode(_CONTEXT) == json.dumps(_CONTEXT).encode()
+
+
+def test_compact_codec_is_smaller_than_json():
+    assert len(CompactCodec().encode(_CONTEXT)) < len(JsonCodec().encode(_CONTEXT))
+
+
+def test_compact_codec_handles_long_and_unicode_values():
+    data = {"user_name": "é" * 300, "repo_name": "r" * 127, "session_id": "s" * 128}
+    codec = CompactCodec()
+    assert codec.decode(codec.encode(data)) == data
+    oversized = {"user_name": "x" * 0x8000}
+    assert codec.encode(oversized)[:1] == b"{"
+    assert codec.decode(codec.encode(oversized)) == oversized
+
+
+def test_zstd_only_compresses_above_threshold():
+    codec = build_codec("compact", zstd_threshold=1024)
+    assert codec.encode(_CONTEXT) == CompactCodec().encode(_CONTEXT)
+    big = {"user_name": "alice " * 400}
+    payload = codec.encode(big)
+    assert payload[0] == 0x03
+    assert len(payload) < len(CompactCodec().encode(big))
+    assert codec.decode(payload) == big
+
+
+def test_build_codec_rejects_unknown_names():
+    with pytest.raises(ValueError, match="Unknown context codec"):
+        build_codec("pickle")
+
+
+def test_decode_rejects_unknown_tags():
+    with pytest.raises(ValueError, match="Unknown context payload tag"):
+        JsonCodec().decode(b"\x7fgarbage")
+
+
+# ---------------------------------------------------------------------------
+# JarvisRedisContextStore
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("name", CODEC_NAMES)
+def test_redis_store_get_set_update_delete(name):
+    store = JarvisRedisContextStore(fakeredis.FakeRedis(), codec=build_codec(name))
+    assert store.get("k1") is None
+
+    store.set("k1", {"user_name": "alice"})
+    assert store.update("k1", {"repo_name": "r", "jira_number": None}) == {
+        "user_name": "alice",
+        "repo_name": "r",
+    }
+    assert store.get("k1") == {"user_name": "alice", "repo_name": "r"}
+
+    store.delete("k1")
+    assert store.get("k1") is None
+
+
+def test_redis_store_json_keys_and_bytes_match_shared_lib():
+    client = fakeredis.FakeRedis()
+    JarvisRedisContextStore(client).set("jarvis-test_alice", _CONTEXT)
+    assert client.get("dynagent_ctx_jarvis-test_alice") == json.dumps(_CONTEXT).encode()
+
+
+def test_redis_store_switching_codec_reads_existing_values():
+    client = fakeredis.FakeRedis()
+    JarvisRedisContextStore(client).set("k1", _CONTEXT)
+    compact = JarvisRedisContextStore(client, codec=build_codec("compact"))
+    assert compact.get("k1") == _CONTEXT
+
+
+def test_init_context_store_uses_configured_codec(tmp_path, monkeypatch, mocker):
+    from autobots_devtools_shared_lib.common.services import get_context_store, set_context_store
+
+    from autobots_agents_jarvis.common.services.context_setup import init_context_store
+
+    for var in ("JARVIS_DATABASE_URL", "JARVIS_DATABASE_REPLICA_URLS"):
+        monkeypatch.setenv(var, "")
+    monkeypatch.setenv("CONTEXT_WRITE_BEHIND", "false")
+    monkeypatch.setenv("JARVIS_SQLITE_PATH", str(tmp_path / "ctx.db"))
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6379/0")
+    monkeypatch.setenv("CONTEXT_L1_MAX_ENTRIES", "0")
+    monkeypatch.setenv("CONTEXT_REDIS_CODEC", "compact")
+    client = fakeredis.FakeRedis()
+    mocker.patch(
+        "autobots_agents_jarvis.common.services.context_setup.get_redis_client", return_value=client
+    )
+    try:
+        init_context_store(app_name="test")
+        get_context_store().set("alice", {"user_name": "alice"})
+
+        payload = client.get("dynagent_ctx_jarvis-test_alice")
+        assert payload is not None
+        assert payload[0] == 0x01
+        assert get_context_store().get("alice") == {"user_name": "alice"}
+    finally:
+        set_context_store(None)  # pyright: ignore[reportArgumentType]
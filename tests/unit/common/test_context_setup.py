@@ -0,0 +1,68 @@
+# ABOUTME: Unit tests for init_context_store wiring (backend selection from AppSettings).
+# ABOUTME: Uses on-disk SQLite so no PostgreSQL or Redis instance is required.
+
+from __future__ import annotations
+
+import pytest
+from autobots_devtools_shared_lib.common.services import (
+    InMemoryContextStore,
+    get_context_store,
+    set_context_store,
+)
+
+from autobots_agents_jarvis.common.services import context_setup
+from autobots_agents_jarvis.common.services.context_setup import init_context_store
+from autobots_agents_jarvis.common.services.context_store import JarvisCacheBackedContextStore
+
+
+@pytest.fixture(autouse=True)
+def _isolated_env(monkeypatch):
+    for var in (
+        "JARVIS_DATABASE_URL",
+        "JARVIS_DATABASE_REPLICA_URLS",
+        "JARVIS_SQLITE_PATH",
+        "REDIS_URL",
+    ):
+        monkeypatch.setenv(var, "")
+    monkeypatch.setenv("CONTEXT_WRITE_BEHIND", "false")
+    yield
+    set_context_store(None)  # pyright: ignore[reportArgumentType]
+
+
+def test_no_database_configured_uses_in_memory_store():
+    init_context_store(app_name="test")
+
+    assert isinstance(get_context_store(), InMemoryContextStore)
+
+
+def test_sqlite_path_persists_across_reinitialisation(tmp_path, monkeypatch):
+    monkeypatch.setenv("JARVIS_SQLITE_PATH", str(tmp_path / "ctx.db"))
+
+    init_context_store(app_name="test")
+    store = get_context_store()
+    assert isinstance(store, JarvisCacheBackedContextStore)
+    store.set("alice", {"user_name": "alice"})
+
+    # A fresh process-local cache must reload the row from the SQLite file.
+    init_context_store(app_name="test")
+    assert get_context_store().get("alice") == {"user_name": "alice"}
+
+
+def test_warmup_preloads_recent_contexts_in_background(tmp_path, monkeypatch):
+    monkeypatch.setenv("JARVIS_SQLITE_PATH", str(tmp_path / "ctx.db"))
+    init_context_store(app_name="test")
+    get_context_store().set_many(  # pyright: ignore[reportAttributeAccessIssue]
+        {f"u{i}": {"user_name": f"u{i}"} for i in range(5)}
+    )
+    init_context_store(app_name="other")
+    get_context_store().set("x", {"user_name": "x"})
+
+    monkeypatch.setenv("CONTEXT_WARMUP_ROWS", "3")
+    monkeypatch.setenv("CONTEXT_WARMUP_PAGE_SIZE", "2")
+    init_context_store(app_name="test")
+    context_setup._WARMUP_THREAD.join(timeout=5)  # pyright: ignore[reportOptionalMemberAccess]
+
+    cache = get_context_store()._cache  # pyright: ignore[reportAttributeAccessIssue]
+    warmed = [k for k in (f"jarvis-test_u{i}" for i in range(5)) if cache.get(k) is not None]
+    assert len(warmed) == 3
+    assert cache.get("jarvis-other_x") is None
@@ -0,0 +1,254 @@
+# ABOUTME: Unit tests for JarvisCacheBackedContextStore using SQLite in-memory and an in-memory cache.
+# ABOUTME: Validates bulk get_many / set_many write-through and cache population.
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from autobots_devtools_shared_lib.common.services import InMemoryContextStore
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from autobots_agents_jarvis.common.db.repository import JarvisContextRepository
+from autobots_agents_jarvis.common.services.context_store import JarvisCacheBackedContextStore
+
+
+@pytest.fixture()
+def cache():
+    return InMemoryContextStore()
+
+
+@pytest.fixture()
+def store(repo, cache):
+    return JarvisCacheBackedContextStore(db=repo, cache=cache, prefix="jarvis-test")
+
+
+def test_set_many_writes_db_and_cache(store, repo, cache):
+    store.set_many({"alice": {"user_name": "alice"}, "bob": {"user_name": "bob"}})
+
+    assert repo.get("jarvis-test_alice") == {"user_name": "alice"}
+    assert cache.get("jarvis-test_bob") == {"user_name": "bob"}
+
+
+def test_get_many_serves_cache_hits_and_loads_misses_from_db(store, repo, cache, mocker):
+    cache.set("jarvis-test_cached", {"user_name": "from-cache"})
+    repo.set("jarvis-test_stored", {"user_name": "from-db"})
+    spy = mocker.spy(repo, "get_many")
+
+    result = store.get_many(["cached", "stored", "missing"])
+
+    assert result == {
+        "cached": {"user_name": "from-cache"},
+        "stored": {"user_name": "from-db"},
+    }
+    spy.assert_called_once()
+    assert set(spy.call_args.args[0]) == {"jarvis-test_stored", "jarvis-test_missing"}
+    # DB hit repopulates the cache
+    assert cache.get("jarvis-test_stored") == {"user_name": "from-db"}
+
+
+def test_get_many_all_cached_skips_db(store, repo, mocker):
+    store.set_many({"k": {"user_name": "x"}})
+    spy = mocker.spy(repo, "get_many")
+
+    assert store.get_many(["k"]) == {"k": {"user_name": "x"}}
+    spy.assert_not_called()
+
+
+def test_update_is_version_checked_and_refreshes_cache(store, repo, cache, mocker):
+    store.set("k1", {"user_name": "alice"})
+    modify = mocker.spy(repo, "modify")
+
+    updated = store.update("k1", {"repo_name": "r", "jira_number": None})
+
+    assert updated == {"user_name": "alice", "repo_name": "r"}
+    assert modify.call_count == 1
+    assert repo.get_with_version("jarvis-test_k1") == (updated, 2)
+    assert cache.get("jarvis-test_k1") == updated
+
+
+def test_patch_writes_db_and_merges_cached_value(store, repo, cache):
+    store.set("carol", {"user_name": "carol", "repo_name": "r1"})
+
+    assert store.patch("carol", {"jira_number": "J-7", "repo_name": None}) is True
+
+    expected = {"user_name": "carol", "repo_name": "r1", "jira_number": "J-7"}
+    assert repo.get("jarvis-test_carol") == expected
+    assert cache.get("jarvis-test_carol") == expected
+
+
+def test_patch_unchanged_returns_false_and_leaves_cache_miss_empty(store, repo, cache):
+    repo.set("jarvis-test_dave", {"user_name": "dave"})
+
+    assert store.patch("dave", {"user_name": "dave"}) is False
+    assert cache.get("jarvis-test_dave") is None
+
+
+def test_patch_context_uses_store_patch_or_falls_back_to_update(store, mocker):
+    from autobots_agents_jarvis.common.utils import context_utils
+
+    mocker.patch.object(context_utils, "get_context_store", return_value=store)
+    spy = mocker.spy(store, "patch")
+    context_utils.patch_context("erin", {"user_name": "erin"})
+    spy.assert_called_once_with("erin", {"user_name": "erin"})
+
+    memory = InMemoryContextStore()
+    mocker.patch.object(context_utils, "get_context_store", return_value=memory)
+    update = mocker.patch.object(context_utils, "update_context")
+    context_utils.patch_context("erin", {"user_name": "erin"})
+    update.assert_called_once_with("erin", {"user_name": "erin"})
+
+
+def test_purge_expired_deletes_db_rows_and_cache_keys(store, repo, cache, mocker):
+    store.set("stale", {"user_name": "s"})
+    store.set("live", {"user_name": "l"})
+    mocker.patch.object(repo, "purge_expired", return_value=iter([["jarvis-test_stale"]]))
+
+    assert store.purge_expired(timedelta(days=30)) == 1
+    assert cache.get("jarvis-test_stale") is None
+    assert cache.get("jarvis-test_live") == {"user_name": "l"}
+
+
+def test_warm_cache_loads_own_prefix_without_overwriting_cached_keys(store, repo, cache):
+    repo.set_many(
+        {
+            "jarvis-test_a": {"user_name": "a"},
+            "jarvis-test_b": {"user_name": "stale"},
+            "jarvis-other_c": {"user_name": "c"},
+        }
+    )
+    cache.set("jarvis-test_b", {"user_name": "newer"})
+
+    assert store.warm_cache(10, page_size=1) == 1
+    assert cache.get("jarvis-test_a") == {"user_name": "a"}
+    assert cache.get("jarvis-test_b") == {"user_name": "newer"}
+    assert cache.get("jarvis-other_c") is None
+
+
+def test_warm_cache_stops_between_pages(store, repo, cache):
+    repo.set_many({f"jarvis-test_k{i}": {"user_name": str(i)} for i in range(4)})
+    pages = 0
+
+    def _stop_after_first() -> bool:
+        nonlocal pages
+        pages += 1
+        return pages > 1
+
+    assert store.warm_cache(10, page_size=2, should_stop=_stop_after_first) == 2
+
+
+def test_purge_expired_contexts_requires_db_backed_store(mocker):
+    from autobots_agents_jarvis.common.services import context_purge
+
+    mocker.patch.object(context_purge, "get_context_store", return_value=InMemoryContextStore())
+    with pytest.raises(RuntimeError, match="DB-backed"):
+        context_purge.purge_expired_contexts(timedelta(days=1))
+
+
+def test_read_your_writes_window_reads_recent_keys_from_primary(cache, mocker):
+    # Two databases: the replica never receives the write (maximal lag).
+    engines = [
+        create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+        for _ in range(2)
+    ]
+    for engine in engines:
+        SQLModel.metadata.create_all(engine)
+    primary, replica = (sessionmaker(bind=e, expire_on_commit=False) for e in engines)
+    JarvisContextRepository(replica).set("jarvis-test_k1", {"user_name": "stale"})
+    routed = JarvisContextRepository(primary, read_session_factory=replica)
+    store = JarvisCacheBackedContextStore(
+        db=routed, cache=cache, prefix="jarvis-test", read_your_writes_window=60
+    )
+    clock = mocker.patch(
+        "autobots_agents_jarvis.common.services.context_store.time.monotonic", return_value=100.0
+    )
+
+    store.set("k1", {"user_name": "fresh"})
+    cache.delete("jarvis-test_k1")  # e.g. evicted before the replica caught up
+    assert store.get("k1") == {"user_name": "fresh"}
+    cache.delete("jarvis-test_k1")
+    assert store.get_many(["k1"]) == {"k1": {"user_name": "fresh"}}
+
+    clock.return_value = 161.0
+    cache.delete("jarvis-test_k1")
+    assert store.get("k1") == {"user_name": "stale"}
+    for engine in engines:
+        engine.dispose()
+
+
+# ---------------------------------------------------------------------------
+# negative caching
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def negative_store(repo, cache):
+    return JarvisCacheBackedContextStore(
+        db=repo, cache=cache, prefix="jarvis-test", negative_ttl=30
+    )
+
+
+def test_missing_key_is_negative_cached(negative_store, repo, mocker):
+    db_get = mocker.spy(repo, "get")
+
+    for _ in range(5):
+        assert negative_store.get("new-user") is None
+
+    assert db_get.call_count == 1
+    assert negative_store.negative_cache_stats()["hits"] == 4
+
+
+def test_set_invalidates_negative_entry(negative_store):
+    assert negative_store.get("new-user") is None
+
+    negative_store.set("new-user", {"user_name": "new-user"})
+    negative_store._cache.delete("jarvis-test_new-user")  # force the DB path
+
+    assert negative_store.get("new-user") == {"user_name": "new-user"}
+
+
+def test_update_and_patch_invalidate_negative_entry(negative_store, cache):
+    assert negative_store.get("a") is None
+    assert negative_store.get("b") is None
+
+    negative_store.update("a", {"user_name": "a"})
+    negative_store.patch("b", {"user_name": "b"})
+    cache.delete("jarvis-test_a")
+    cache.delete("jarvis-test_b")
+
+    assert negative_store.get_many(["a", "b"]) == {"a": {"user_name": "a"}, "b": {"user_name": "b"}}
+
+
+def test_get_many_negative_caches_misses(negative_store, repo, mocker):
+    db_get_many = mocker.spy(repo, "get_many")
+
+    assert negative_store.get_many(["x", "y"]) == {}
+    assert negative_store.get_many(["x", "y"]) == {}
+    assert negative_store.get("x") is None
+
+    assert db_get_many.call_count == 1
+
+
+def test_negative_entry_expires(negative_store, repo, mocker):
+    clock = mocker.patch(
+        "autobots_agents_jarvis.common.services.near_cache.time.monotonic", return_value=0.0
+    )
+    assert negative_store.get("late") is None
+    # Written by another process: only the TTL makes it visible here.
+    repo.set("jarvis-test_late", {"user_name": "late"})
+    assert negative_store.get("late") is None
+
+    clock.return_value = 31.0
+    assert negative_store.get("late") == {"user_name": "late"}
+
+
+def test_negative_caching_disabled_by_default(store, repo, mocker):
+    db_get = mocker.spy(repo, "get")
+
+    store.get("new-user")
+    store.get("new-user")
+
+    assert db_get.call_count == 2
+    assert store.negative_cache_stats() == {}
@@ -0,0 +1,140 @@
+# ABOUTME: Unit tests for the process-local L1 cache (LRUContextCache) and NearCacheContextStore.
+# ABOUTME: Validates LRU eviction, TTL expiry, counters and read-through / write-through to the remote tier.
+
+from __future__ import annotations
+
+import fakeredis
+import pytest
+from autobots_devtools_shared_lib.common.services import (
+    InMemoryContextStore,
+    get_context_store,
+    set_context_store,
+)
+
+from autobots_agents_jarvis.common.services.context_setup import init_context_store
+from autobots_agents_jarvis.common.services.near_cache import LRUContextCache, NearCacheContextStore
+
+_CLOCK = "autobots_agents_jarvis.common.services.near_cache.time.monotonic"
+
+
+# ---------------------------------------------------------------------------
+# LRUContextCache
+# ---------------------------------------------------------------------------
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUContextCache(max_entries=2, ttl=0)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    cache.get("a")  # a is now most recently used
+    cache.set("c", {"v": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 2
+
+
+def test_lru_entries_expire_after_ttl(mocker):
+    clock = mocker.patch(_CLOCK, return_value=10.0)
+    cache = LRUContextCache(max_entries=4, ttl=2.0)
+    cache.set("a", {"v": 1})
+
+    clock.return_value = 11.9
+    assert cache.get("a") == {"v": 1}
+    clock.return_value = 12.0
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_lru_returns_copies():
+    cache = LRUContextCache(max_entries=4, ttl=0)
+    cache.set("a", {"v": 1})
+    cache.get("a")["v"] = 99
+
+    assert cache.get("a") == {"v": 1}
+
+
+def test_lru_counts_hits_and_misses():
+    cache = LRUContextCache(max_entries=4, ttl=0)
+    cache.set("a", {"v": 1})
+    cache.get("a")
+    cache.get("a")
+    cache.get("missing")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+    assert stats["hit_ratio"] == pytest.approx(2 / 3)
+
+
+def test_lru_rejects_non_positive_size():
+    with pytest.raises(ValueError, match="max_entries"):
+        LRUContextCache(max_entries=0)
+
+
+# ---------------------------------------------------------------------------
+# NearCacheContextStore
+# ---------------------------------------------------------------------------
+
+
+def test_near_cache_serves_repeated_reads_from_l1(mocker):
+    remote = InMemoryContextStore()
+    remote.set("k1", {"user_name": "alice"})
+    remote_get = mocker.spy(remote, "get")
+    near = NearCacheContextStore(LRUContextCache(max_entries=8, ttl=0), remote)
+
+    for _ in range(5):
+        assert near.get("k1") == {"user_name": "alice"}
+
+    assert remote_get.call_count == 1
+    assert near.stats()["hits"] == 4
+
+
+def test_near_cache_writes_through_and_deletes_both_tiers():
+    remote = InMemoryContextStore()
+    local = LRUContextCache(max_entries=8, ttl=0)
+    near = NearCacheContextStore(local, remote)
+
+    near.set("k1", {"user_name": "alice"})
+    assert remote.get("k1") == {"user_name": "alice"}
+    assert near.update("k1", {"repo_name": "r"}) == {"user_name": "alice", "repo_name": "r"}
+    assert local.get("k1") == {"user_name": "alice", "repo_name": "r"}
+
+    near.delete("k1")
+    assert remote.get("k1") is None
+    assert local.get("k1") is None
+
+
+def test_near_cache_add_many_fills_only_keys_the_remote_lacks():
+    remote = InMemoryContextStore()
+    local = LRUContextCache(max_entries=8, ttl=0)
+    near = NearCacheContextStore(local, remote)
+    remote.set("k1", {"user_name": "newer"})
+
+    assert near.add_many({"k1": {"user_name": "stale"}, "k2": {"user_name": "b"}}) == ["k2"]
+    assert remote.get("k1") == {"user_name": "newer"}
+    assert local.get("k1") is None
+    assert local.get("k2") == {"user_name": "b"}
+
+
+def test_init_context_store_layers_l1_over_redis(tmp_path, monkeypatch, mocker):
+    for var in ("JARVIS_DATABASE_URL", "JARVIS_DATABASE_REPLICA_URLS"):
+        monkeypatch.setenv(var, "")
+    monkeypatch.setenv("CONTEXT_WRITE_BEHIND", "false")
+    monkeypatch.setenv("JARVIS_SQLITE_PATH", str(tmp_path / "ctx.db"))
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6379/0")
+    monkeypatch.setenv("CONTEXT_L1_MAX_ENTRIES", "16")
+    mocker.patch(
+        "autobots_agents_jarvis.common.services.context_setup.get_redis_client",
+        return_value=fakeredis.FakeRedis(),
+    )
+    try:
+        init_context_store(app_name="test")
+        store = get_context_store()
+        store.set("alice", {"user_name": "alice"})
+        store.get("alice")
+
+        assert isinstance(store._cache, NearCacheContextStore)  # pyright: ignore[reportAttributeAccessIssue]
+        assert store._cache.stats()["hits"] == 1  # pyright: ignore[reportAttributeAccessIssue]
+    finally:
+        set_context_store(None)  # pyright: ignore[reportArgumentType]
@@ -0,0 +1,136 @@
+# ABOUTME: Unit tests for the process-wide Redis client registry and the pipelined batch cache API.
+# ABOUTME: Pools are built without connecting; batch behaviour is checked against fakeredis.
+
+from __future__ import annotations
+
+import fakeredis
+import pytest
+import redis
+from autobots_devtools_shared_lib.common.services import InMemoryContextStore
+
+from autobots_agents_jarvis.common.services.context_store import JarvisCacheBackedContextStore
+from autobots_agents_jarvis.common.services.near_cache import LRUContextCache, NearCacheContextStore
+from autobots_agents_jarvis.common.services.redis_client import (
+    close_redis_clients,
+    get_redis_client,
+)
+from autobots_agents_jarvis.common.services.redis_store import (
+    JarvisRedisContextStore,
+    JarvisRedisHashContextStore,
+    cache_get_many,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    close_redis_clients()
+    yield
+    close_redis_clients()
+
+
+# ---------------------------------------------------------------------------
+# Client registry
+# ---------------------------------------------------------------------------
+
+
+def test_get_redis_client_shares_one_configured_pool_per_url(monkeypatch):
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6379/0")
+    monkeypatch.setenv("REDIS_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("REDIS_SOCKET_TIMEOUT", "1.5")
+    monkeypatch.setenv("REDIS_HEALTH_CHECK_INTERVAL", "10")
+
+    client = get_redis_client()
+
+    assert get_redis_client("redis://localhost:6379/0") is client
+    assert get_redis_client("redis://localhost:6379/1") is not client
+    pool = client.connection_pool
+    assert isinstance(pool, redis.BlockingConnectionPool)
+    assert pool.max_connections == 7
+    assert pool.connection_kwargs["socket_timeout"] == 1.5
+    assert pool.connection_kwargs["health_check_interval"] == 10
+
+
+def test_close_redis_clients_forgets_clients(monkeypatch):
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6379/0")
+    client = get_redis_client()
+    close_redis_clients()
+    assert get_redis_client() is not client
+
+
+def test_get_redis_client_requires_a_url(monkeypatch):
+    monkeypatch.setenv("REDIS_URL", "")
+    with pytest.raises(RuntimeError, match="REDIS_URL"):
+        get_redis_client()
+
+
+# ---------------------------------------------------------------------------
+# Batch API
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("store_cls", [JarvisRedisContextStore, JarvisRedisHashContextStore])
+def test_redis_stores_batch_round_trip(store_cls):
+    store = store_cls(fakeredis.FakeRedis())
+    store.set_many({"k1": {"user_name": "alice"}, "k2": {"user_name": "bob"}})
+
+    assert store.get_many(["k1", "k2", "k3"]) == {
+        "k1": {"user_name": "alice"},
+        "k2": {"user_name": "bob"},
+    }
+
+    store.delete_many(["k1", "k3"])
+    assert store.get_many(["k1", "k2"]) == {"k2": {"user_name": "bob"}}
+
+
+def test_cache_get_many_falls_back_to_single_gets():
+    store = InMemoryContextStore()
+    store.set("k1", {"user_name": "alice"})
+    assert cache_get_many(store, ["k1", "k2"]) == {"k1": {"user_name": "alice"}}
+
+
+def test_context_store_get_many_reads_cache_in_one_round_trip(repo, mocker):
+    client = fakeredis.FakeRedis()
+    store = JarvisCacheBackedContextStore(
+        db=repo, cache=JarvisRedisContextStore(client), prefix="jarvis-test"
+    )
+    store.set_many({f"u{i}": {"user_name": f"u{i}"} for i in range(10)})
+    mget = mocker.spy(client, "mget")
+    single_get = mocker.spy(client, "get")
+
+    result = store.get_many([f"u{i}" for i in range(12)])
+
+    assert len(result) == 10
+    assert mget.call_count == 1
+    single_get.assert_not_called()
+
+
+def test_context_store_get_many_backfills_cache_with_one_pipeline(repo, mocker):
+    client = fakeredis.FakeRedis()
+    cache = JarvisRedisContextStore(client)
+    store = JarvisCacheBackedContextStore(db=repo, cache=cache, prefix="jarvis-test")
+    repo.set_many({f"jarvis-test_u{i}": {"user_name": f"u{i}"} for i in range(5)})
+    mset = mocker.spy(client, "mset")
+
+    assert len(store.get_many([f"u{i}" for i in range(5)])) == 5
+    assert mset.call_count == 1
+    assert cache.get("jarvis-test_u3") == {"user_name": "u3"}
+
+
+def test_near_cache_get_many_only_fetches_l1_misses(mocker):
+    remote = JarvisRedisContextStore(fakeredis.FakeRedis())
+    local = LRUContextCache(max_entries=8, ttl=0)
+    near = NearCacheContextStore(local, remote)
+    near.set_many({"k1": {"user_name": "alice"}})
+    remote.set("k2", {"user_name": "bob"})
+    remote_batch = mocker.spy(remote, "get_many")
+
+    assert near.get_many(["k1", "k2"]) == {
+        "k1": {"user_name": "alice"},
+        "k2": {"user_name": "bob"},
+    }
+    remote_batch.assert_called_once_with(["k2"])
+    assert local.get("k2") == {"user_name": "bob"}
+
+    near.delete_many(["k1", "k2"])
+    assert remote.get_many(["k1", "k2"]) == {}
+    assert local.get("k1") is None
@@ -0,0 +1,222 @@
+# ABOUTME: Unit tests for JarvisRedisHashContextStore (fakeredis) and its field-level cache integration.
+# ABOUTME: Single-field updates must touch only that hash field, through the near-cache and the cache-backed store.
+
+from __future__ import annotations
+
+import fakeredis
+import pytest
+
+from autobots_agents_jarvis.common.services.context_store import JarvisCacheBackedContextStore
+from autobots_agents_jarvis.common.services.near_cache import LRUContextCache, NearCacheContextStore
+from autobots_agents_jarvis.common.services.redis_store import (
+    ConditionalBatchStore,
+    FieldPatchableStore,
+    JarvisRedisContextStore,
+    JarvisRedisHashContextStore,
+)
+
+
+@pytest.fixture()
+def client():
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture()
+def hash_store(client):
+    return JarvisRedisHashContextStore(client)
+
+
+# ---------------------------------------------------------------------------
+# JarvisRedisHashContextStore
+# ---------------------------------------------------------------------------
+
+
+def test_hash_store_get_set_delete(client, hash_store):
+    assert hash_store.get("k1") is None
+
+    hash_store.set("k1", {"user_name": "alice", "repo_name": "r", "jira_number": None})
+
+    assert client.type("dynagent_ctxh_k1") == b"hash"
+    assert client.hget("dynagent_ctxh_k1", "user_name") == b"alice"
+    assert hash_store.get("k1") == {"user_name": "alice", "repo_name": "r"}
+
+    hash_store.set("k1", {"user_name": "bob"})
+    assert hash_store.get("k1") == {"user_name": "bob"}
+
+    hash_store.delete("k1")
+    assert hash_store.get("k1") is None
+
+
+def test_hash_store_round_trips_non_string_values(hash_store):
+    data = {"user_name": "\x00odd", "turns": 3, "tags": ["a"], "flag": False}
+    hash_store.set("k1", data)
+    assert hash_store.get("k1") == data
+
+
+def test_hash_store_update_writes_only_patched_fields(client, hash_store):
+    hash_store.set("k1", {"user_name": "alice", "repo_name": "r"})
+    # Simulates a concurrent writer changing another field between our read and write.
+    client.hset("dynagent_ctxh_k1", "repo_name", "r2")
+
+    updated = hash_store.update("k1", {"jira_number": "JAR-1", "user_name": None})
+
+    assert updated == {"user_name": "alice", "repo_name": "r2", "jira_number": "JAR-1"}
+
+
+def test_hash_store_get_fields_uses_hmget(hash_store):
+    hash_store.set("k1", {"user_name": "alice", "repo_name": "r"})
+    assert hash_store.get_fields("k1", ["repo_name", "jira_number"]) == {"repo_name": "r"}
+
+
+def test_hash_store_patch_existing_skips_missing_keys(hash_store):
+    assert isinstance(hash_store, FieldPatchableStore)
+    assert hash_store.patch_existing("k1", {"jira_number": "JAR-1"}) is False
+    assert hash_store.get("k1") is None
+
+    hash_store.set("k1", {"user_name": "alice"})
+    assert hash_store.patch_existing("k1", {"jira_number": "JAR-1"}) is True
+    assert hash_store.get("k1") == {"user_name": "alice", "jira_number": "JAR-1"}
+
+
+@pytest.mark.parametrize("store_cls", [JarvisRedisContextStore, JarvisRedisHashContextStore])
+def test_add_many_fills_only_absent_keys(client, store_cls):
+    store = store_cls(client)
+    assert isinstance(store, ConditionalBatchStore)
+    store.set("k1", {"user_name": "newer"})
+
+    added = store.add_many({"k1": {"user_name": "stale"}, "k2": {"user_name": "b"}})
+
+    assert added == ["k2"]
+    assert store.get("k1") == {"user_name": "newer"}
+    assert store.get("k2") == {"user_name": "b"}
+
+
+# ---------------------------------------------------------------------------
+# Integration with the cache-backed store and the near-cache
+# ---------------------------------------------------------------------------
+
+
+def test_cache_backed_update_patches_single_hash_field(repo, hash_store, mocker):
+    store = JarvisCacheBackedContextStore(db=repo, cache=hash_store, prefix="jarvis-test")
+    store.set("alice", {"user_name": "alice", "repo_name": "r"})
+    full_write = mocker.spy(hash_store, "set")
+
+    updated = store.update("alice", {"jira_number": "JAR-7"})
+
+    assert updated == {"user_name": "alice", "repo_name": "r", "jira_number": "JAR-7"}
+    full_write.assert_not_called()
+    assert hash_store.get("jarvis-test_alice") == updated
+
+
+def test_cache_backed_update_on_cache_miss_writes_full_row(repo, hash_store):
+    store = JarvisCacheBackedContextStore(db=repo, cache=hash_store, prefix="jarvis-test")
+    store.set("alice", {"user_name": "alice", "repo_name": "r"})
+    hash_store.delete("jarvis-test_alice")  # evicted
+
+    store.update("alice", {"jira_number": "JAR-7"})
+
+    assert hash_store.get("jarvis-test_alice") == {
+        "user_name": "alice",
+        "repo_name": "r",
+        "jira_number": "JAR-7",
+    }
+
+
+def test_cache_backed_patch_leaves_cache_miss_empty(repo, hash_store):
+    store = JarvisCacheBackedContextStore(db=repo, cache=hash_store, prefix="jarvis-test")
+    assert store.patch("alice", {"jira_number": "JAR-7"}) is True
+    assert hash_store.get("jarvis-test_alice") is None
+    assert store.get("alice") == {"jira_number": "JAR-7"}
+
+
+def test_cache_backed_update_writes_authoritative_row_to_value_cache(repo, client, mocker):
+    remote = JarvisRedisContextStore(client)
+    near = NearCacheContextStore(LRUContextCache(max_entries=8, ttl=0), remote)
+    store = JarvisCacheBackedContextStore(db=repo, cache=near, prefix="jarvis-test")
+    store.set("alice", {"user_name": "a"})
+    repo.set("jarvis-test_alice", {"user_name": "a", "repo_name": "x"})  # another process
+    remote_read = mocker.spy(remote, "get")
+
+    updated = store.update("alice", {"jira_number": "J-9"})
+
+    assert updated == {"user_name": "a", "repo_name": "x", "jira_number": "J-9"}
+    assert remote.get("jarvis-test_alice") == updated
+    assert remote_read.call_count == 1  # only the assertion above; update() did not read Redis
+
+
+def test_near_cache_over_hash_store_still_patches_fields(repo, hash_store, mocker):
+    near = NearCacheContextStore(LRUContextCache(max_entries=8, ttl=0), hash_store)
+    store = JarvisCacheBackedContextStore(db=repo, cache=near, prefix="jarvis-test")
+    store.set("alice", {"user_name": "a"})
+    full_write = mocker.spy(hash_store, "set")
+
+    store.update("alice", {"jira_number": "J-9"})
+
+    full_write.assert_not_called()
+    assert hash_store.get("jarvis-test_alice") == {"user_name": "a", "jira_number": "J-9"}
+
+
+def test_near_cache_patch_existing_merges_both_tiers(hash_store):
+    local = LRUContextCache(max_entries=8, ttl=0)
+    near = NearCacheContextStore(local, hash_store)
+    near.set("k1", {"user_name": "alice"})
+
+    assert near.patch_existing("k1", {"jira_number": "JAR-1"}) is True
+    assert local.get("k1") == {"user_name": "alice", "jira_number": "JAR-1"}
+    assert hash_store.get("k1") == {"user_name": "alice", "jira_number": "JAR-1"}
+
+    hash_store.delete("k1")
+    assert near.patch_existing("k1", {"jira_number": "JAR-2"}) is False
+    assert local.get("k1") is None
+
+
+@pytest.mark.parametrize("store_cls", [JarvisRedisContextStore, JarvisRedisHashContextStore])
+def test_warm_cache_keeps_a_write_racing_with_the_fill(repo, client, mocker, store_cls):
+    cache = store_cls(client)
+    store = JarvisCacheBackedContextStore(db=repo, cache=cache, prefix="jarvis-test")
+    repo.set_many({"jarvis-test_a": {"user_name": "a"}, "jarvis-test_b": {"user_name": "stale"}})
+    pipeline = client.pipeline
+    raced = []
+
+    def _racing_pipeline(*args, **kwargs):
+        pipe = pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        def _execute(*a, **kw):
+            if not raced:  # another process writes b after the fill has looked at the cache
+                raced.append(1)
+                cache.set("jarvis-test_b", {"user_name": "newer"})
+            return execute(*a, **kw)
+
+        pipe.execute = _execute
+        return pipe
+
+    mocker.patch.object(client, "pipeline", side_effect=_racing_pipeline)
+
+    assert store.warm_cache(10) == 1
+    assert cache.get("jarvis-test_a") == {"user_name": "a"}
+    assert cache.get("jarvis-test_b") == {"user_name": "newer"}
+
+
+def test_init_context_store_uses_hashes_when_enabled(tmp_path, monkeypatch, mocker, client):
+    from autobots_devtools_shared_lib.common.services import get_context_store, set_context_store
+
+    from autobots_agents_jarvis.common.services.context_setup import init_context_store
+
+    for var in ("JARVIS_DATABASE_URL", "JARVIS_DATABASE_REPLICA_URLS"):
+        monkeypatch.setenv(var, "")
+    monkeypatch.setenv("CONTEXT_WRITE_BEHIND", "false")
+    monkeypatch.setenv("JARVIS_SQLITE_PATH", str(tmp_path / "ctx.db"))
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6379/0")
+    monkeypatch.setenv("CONTEXT_L1_MAX_ENTRIES", "0")
+    monkeypatch.setenv("CONTEXT_REDIS_HASH", "true")
+    mocker.patch(
+        "autobots_agents_jarvis.common.services.context_setup.get_redis_client", return_value=client
+    )
+    try:
+        init_context_store(app_name="test")
+        get_context_store().set("alice", {"user_name": "alice"})
+
+        assert client.hgetall("dynagent_ctxh_jarvis-test_alice") == {b"user_name": b"alice"}
+    finally:
+        set_context_store(None)  # pyright: ignore[reportArgumentType]
@@ -0,0 +1,155 @@
+# ABOUTME: Unit and stress tests for single-flight coalescing of context cache misses.
+# ABOUTME: Shows N concurrent misses on one key (threads or asyncio tasks) cost one DB load.
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+from autobots_devtools_shared_lib.common.services import InMemoryContextStore
+
+from autobots_agents_jarvis.common.services.context_store import JarvisCacheBackedContextStore
+from autobots_agents_jarvis.common.services.single_flight import SingleFlight
+
+_CONCURRENCY = 32
+
+
+@pytest.fixture()
+def slow_db_get(repo, mocker):
+    """Make each DB read take 50ms so concurrent misses overlap; return the call counter."""
+    real_get = repo.get
+    lock = threading.Lock()
+
+    def _slow_get(key, *, primary=False):
+        time.sleep(0.05)
+        with lock:  # StaticPool shares one SQLite connection between threads
+            return real_get(key, primary=primary)
+
+    return mocker.patch.object(repo, "get", side_effect=_slow_get)
+
+
+@pytest.fixture()
+def store(repo):
+    repo.set("jarvis-test_default", {"user_name": "default"})
+    return JarvisCacheBackedContextStore(
+        db=repo, cache=InMemoryContextStore(), prefix="jarvis-test"
+    )
+
+
+def _stampede(read, workers: int = _CONCURRENCY) -> list:
+    """Run *read* from *workers* threads released at the same instant."""
+    barrier = threading.Barrier(workers)
+    results: list = [None] * workers
+
+    def _worker(i: int) -> None:
+        barrier.wait()
+        results[i] = read()
+
+    threads = [threading.Thread(target=_worker, args=(i,)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+# ---------------------------------------------------------------------------
+# SingleFlight
+# ---------------------------------------------------------------------------
+
+
+def test_do_shares_result_between_concurrent_threads():
+    flight = SingleFlight()
+    calls = []
+
+    def _load():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    assert _stampede(lambda: flight.do("k", _load)) == ["value"] * _CONCURRENCY
+    assert len(calls) < _CONCURRENCY
+    assert flight.stats()["loads"] + flight.stats()["coalesced"] == _CONCURRENCY
+
+
+def test_do_propagates_errors_to_waiters_and_then_forgets_the_key():
+    flight = SingleFlight()
+    errors = []
+
+    def _fail():
+        time.sleep(0.05)
+        raise RuntimeError("db down")
+
+    def _read():
+        try:
+            flight.do("k", _fail)
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    _stampede(_read, workers=4)
+    assert len(errors) == 4
+    assert flight.do("k", lambda: "recovered") == "recovered"
+
+
+async def test_ado_shares_one_task_between_coroutines():
+    flight = SingleFlight()
+    calls = []
+
+    async def _load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(flight.ado("k", _load) for _ in range(_CONCURRENCY)))
+
+    assert results == ["value"] * _CONCURRENCY
+    assert len(calls) == 1
+    assert flight.stats() == {"loads": 1, "coalesced": _CONCURRENCY - 1}
+
+
+# ---------------------------------------------------------------------------
+# Stress: DB load reduction in the cache-backed store
+# ---------------------------------------------------------------------------
+
+
+def test_thread_stampede_on_expired_key_costs_one_db_load(store, slow_db_get):
+    results = _stampede(lambda: store.get("default"))
+
+    assert results == [{"user_name": "default"}] * _CONCURRENCY
+    # Without coalescing every thread would query the DB (32 loads).
+    assert slow_db_get.call_count == 1
+    assert store.load_stats() == {"loads": 1, "coalesced": _CONCURRENCY - 1}
+
+
+async def test_asyncio_stampede_on_expired_key_costs_one_db_load(store, slow_db_get):
+    results = await asyncio.gather(*(store.aget("default") for _ in range(_CONCURRENCY)))
+
+    assert results == [{"user_name": "default"}] * _CONCURRENCY
+    assert slow_db_get.call_count == 1
+    assert store.load_stats() == {"loads": 1, "coalesced": _CONCURRENCY - 1}
+
+
+async def test_aget_keeps_cache_lookups_off_the_event_loop(store, mocker):
+    cache = store._cache  # noqa: SLF001
+    real_get = cache.get
+    lookup_threads = []
+
+    def _get(key):
+        lookup_threads.append(threading.get_ident())
+        return real_get(key)
+
+    mocker.patch.object(cache, "get", side_effect=_get)
+
+    assert await store.aget("default") == {"user_name": "default"}  # miss, then DB load
+    assert await store.aget("default") == {"user_name": "default"}  # cache hit
+    assert len(lookup_threads) == 2
+    assert threading.get_ident() not in lookup_threads
+
+
+def test_coalesced_callers_get_independent_copies(store, slow_db_get):
+    first, second = _stampede(lambda: store.get("default"), workers=2)
+    first["user_name"] = "mutated"
+
+    assert second == {"user_name": "default"}
@@ -0,0 +1,188 @@
+# ABOUTME: Unit tests for the trace sampling policy: head ratios, overrides, settings parsing and tail records.
+# ABOUTME: The Langfuse client is a mock, so no tracing backend is needed.
+
+from __future__ import annotations
+
+import time
+
+import pytest
+from autobots_devtools_shared_lib.common.observability import TraceMetadata
+
+from autobots_agents_jarvis.common.configs.settings import AppSettings
+from autobots_agents_jarvis.common.services.trace_sampling import (
+    TraceSamplingPolicy,
+    get_trace_sampling_policy,
+    parse_sample_ratios,
+    set_trace_sampling_policy,
+    tail_sampled_turn,
+)
+
+_SESSIONS = [f"session-{i}" for i in range(2000)]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_policy():
+    set_trace_sampling_policy(None)
+    yield
+    set_trace_sampling_policy(None)
+
+
+@pytest.fixture()
+def langfuse_client(mocker):
+    client = mocker.MagicMock()
+    mocker.patch(
+        "autobots_devtools_shared_lib.common.observability.tracing.get_langfuse_client",
+        return_value=client,
+    )
+    return client
+
+
+@pytest.fixture()
+def trace_metadata():
+    return TraceMetadata.create(session_id="s1", app_name="sales_chat", tags=["sales_chat"])
+
+
+# ---------------------------------------------------------------------------
+# Head sampling
+# ---------------------------------------------------------------------------
+
+
+def test_default_policy_traces_everything():
+    policy = TraceSamplingPolicy()
+    assert all(policy.should_sample(s, domain="sales_chat") for s in _SESSIONS[:50])
+
+
+def test_zero_ratio_traces_nothing():
+    policy = TraceSamplingPolicy(ratio=0.0)
+    assert not any(policy.should_sample(s, domain="sales_chat") for s in _SESSIONS[:50])
+
+
+def test_head_ratio_is_deterministic_and_close_to_target():
+    policy = TraceSamplingPolicy(ratio=0.25)
+    sampled = [s for s in _SESSIONS if policy.should_sample(s, domain="sales_chat")]
+
+    assert 0.2 < len(sampled) / len(_SESSIONS) < 0.3
+    assert sampled == [s for s in _SESSIONS if policy.should_sample(s, domain="sales_chat")]
+
+
+def test_agent_override_beats_domain_override_beats_default():
+    policy = TraceSamplingPolicy(
+        ratio=0.5, domain_ratios={"sales_chat": 0.0}, agent_ratios={"lead_agent": 1.0}
+    )
+
+    assert policy.ratio_for("concierge_chat") == 0.5
+    assert policy.ratio_for("sales_chat") == 0.0
+    assert policy.ratio_for("sales_chat", "lead_agent") == 1.0
+    assert policy.ratio_for("sales_chat", "other_agent") == 0.0
+
+
+def test_tail_reason():
+    policy = TraceSamplingPolicy(ratio=0.0, slow_turn_seconds=2.0)
+
+    assert policy.tail_reason(duration=0.1, failed=True) == "error"
+    assert policy.tail_reason(duration=3.0, failed=False) == "slow"
+    assert policy.tail_reason(duration=0.1, failed=False) is None
+    no_errors = TraceSamplingPolicy(ratio=0.0, always_sample_errors=False)
+    assert no_errors.tail_reason(duration=0.1, failed=True) is None
+
+
+# ---------------------------------------------------------------------------
+# Settings
+# ---------------------------------------------------------------------------
+
+
+def test_parse_sample_ratios():
+    assert parse_sample_ratios("") == {}
+    assert parse_sample_ratios(" sales_chat=0.1, joke_agent=0 ,") == {
+        "sales_chat": 0.1,
+        "joke_agent": 0.0,
+    }
+
+
+@pytest.mark.parametrize("raw", ["sales_chat", "=0.5", "sales_chat=abc", "sales_chat=1.5"])
+def test_parse_sample_ratios_rejects_bad_entries(raw):
+    with pytest.raises(ValueError, match="Invalid trace sample ratio"):
+        parse_sample_ratios(raw)
+
+
+def test_policy_is_built_from_settings(monkeypatch):
+    monkeypatch.setenv("TRACING_SAMPLE_RATIO", "0.2")
+    monkeypatch.setenv("TRACING_DOMAIN_SAMPLE_RATIOS", "sales_chat=0.05")
+    monkeypatch.setenv("TRACING_AGENT_SAMPLE_RATIOS", "joke_agent=0")
+    monkeypatch.setenv("TRACING_SLOW_TURN_SECONDS", "8")
+
+    policy = get_trace_sampling_policy()
+
+    assert policy == TraceSamplingPolicy(
+        ratio=0.2,
+        domain_ratios={"sales_chat": 0.05},
+        agent_ratios={"joke_agent": 0.0},
+        always_sample_errors=True,
+        slow_turn_seconds=8.0,
+    )
+    assert get_trace_sampling_policy() is policy
+
+
+def test_invalid_head_ratio_is_rejected():
+    with pytest.raises(ValueError, match="TRACING_SAMPLE_RATIO"):
+        TraceSamplingPolicy.from_settings(AppSettings(tracing_sample_ratio=2.0))
+
+
+# ---------------------------------------------------------------------------
+# Tail sampling
+# ---------------------------------------------------------------------------
+
+
+def test_unsampled_failed_turn_is_recorded_and_reraised(langfuse_client, trace_metadata):
+    policy = TraceSamplingPolicy(ratio=0.0)
+
+    with (
+        pytest.raises(RuntimeError, match="boom"),
+        tail_sampled_turn(trace_metadata, sampled=False, name="sales_chat-turn", policy=policy),
+    ):
+        raise RuntimeError("boom")
+
+    langfuse_client.create_event.assert_called_once()
+    kwargs = langfuse_client.create_event.call_args.kwargs
+    assert kwargs["name"] == "sales_chat-turn"
+    assert kwargs["level"] == "ERROR"
+    assert kwargs["status_message"] == "RuntimeError: boom"
+
+
+def test_unsampled_slow_turn_is_recorded(langfuse_client, trace_metadata):
+    policy = TraceSamplingPolicy(ratio=0.0, slow_turn_seconds=0.01)
+
+    with tail_sampled_turn(trace_metadata, sampled=False, name="sales_chat-turn", policy=policy):
+        time.sleep(0.02)
+
+    kwargs = langfuse_client.create_event.call_args.kwargs
+    assert kwargs["level"] == "WARNING"
+    assert kwargs["metadata"]["duration_s"] >= 0.01
+
+
+def test_fast_or_sampled_turns_record_nothing(langfuse_client, trace_metadata):
+    policy = TraceSamplingPolicy(ratio=0.0, slow_turn_seconds=5.0)
+
+    with tail_sampled_turn(trace_metadata, sampled=False, name="t", policy=policy):
+        pass
+    with (
+        pytest.raises(RuntimeError),
+        tail_sampled_turn(trace_metadata, sampled=True, name="t", policy=policy),
+    ):
+        raise RuntimeError("traced in full already")
+
+    langfuse_client.create_event.assert_not_called()
+
+
+def test_tail_record_is_skipped_without_a_tracing_client(mocker, trace_metadata):
+    mocker.patch(
+        "autobots_devtools_shared_lib.common.observability.tracing.get_langfuse_client",
+        return_value=None,
+    )
+    policy = TraceSamplingPolicy(ratio=0.0)
+
+    with (
+        pytest.raises(RuntimeError),
+        tail_sampled_turn(trace_metadata, sampled=False, name="t", policy=policy),
+    ):
+        raise RuntimeError("boom")
@@ -0,0 +1,140 @@
+# ABOUTME: Unit tests for the once-per-process tracing lifecycle and the background trace flusher.
+# ABOUTME: The shared-lib init/flush functions are patched, so no Langfuse server is needed.
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+import pytest
+
+from autobots_agents_jarvis.common.services import tracing_setup
+from autobots_agents_jarvis.common.services.tracing_setup import (
+    BackgroundTraceFlusher,
+    init_process_tracing,
+    request_trace_flush,
+    shutdown_process_tracing,
+)
+
+_EXPORTER_ENV = ("LANGFUSE_FLUSH_AT", "LANGFUSE_FLUSH_INTERVAL", "OTEL_BSP_MAX_QUEUE_SIZE")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_tracing(mocker):
+    # init_process_tracing() sets exporter vars with os.environ.setdefault; restore them after.
+    mocker.patch.dict(os.environ)
+    for name in _EXPORTER_ENV:
+        os.environ.pop(name, None)
+    shutdown_process_tracing(timeout=1)
+    yield
+    shutdown_process_tracing(timeout=1)
+
+
+@pytest.fixture()
+def init_tracing(mocker):
+    return mocker.patch.object(tracing_setup, "init_tracing", return_value=True)
+
+
+# ---------------------------------------------------------------------------
+# init_process_tracing
+# ---------------------------------------------------------------------------
+
+
+def test_init_runs_once_per_process(init_tracing):
+    assert init_process_tracing() is True
+    assert init_process_tracing() is True
+    init_tracing.assert_called_once()
+
+
+def test_concurrent_init_builds_one_client(init_tracing):
+    init_tracing.side_effect = lambda: time.sleep(0.05) or True
+    threads = [threading.Thread(target=init_process_tracing) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    init_tracing.assert_called_once()
+
+
+def test_disabled_tracing_is_remembered_and_flush_is_a_no_op(init_tracing, mocker):
+    init_tracing.return_value = False
+    flush = mocker.patch.object(tracing_setup, "flush_tracing")
+
+    assert init_process_tracing() is False
+    assert init_process_tracing() is False
+    request_trace_flush()
+
+    init_tracing.assert_called_once()
+    flush.assert_not_called()
+
+
+def test_init_applies_exporter_settings_without_overriding_env(init_tracing, monkeypatch):
+    monkeypatch.setenv("TRACING_MAX_QUEUE_SIZE", "64")
+    monkeypatch.setenv("LANGFUSE_FLUSH_AT", "7")
+
+    init_process_tracing()
+
+    assert os.environ["OTEL_BSP_MAX_QUEUE_SIZE"] == "64"
+    assert os.environ["LANGFUSE_FLUSH_AT"] == "7"
+    assert os.environ["LANGFUSE_FLUSH_INTERVAL"] == "2.0"
+
+
+def test_request_trace_flush_does_not_block(init_tracing, mocker):
+    release = threading.Event()
+    flushed = threading.Event()
+
+    def slow_flush():
+        release.wait(2)
+        flushed.set()
+
+    mocker.patch.object(tracing_setup, "flush_tracing", side_effect=slow_flush)
+    init_process_tracing()
+
+    started = time.perf_counter()
+    request_trace_flush()
+    assert time.perf_counter() - started < 0.05
+
+    release.set()
+    assert flushed.wait(2)
+
+
+# ---------------------------------------------------------------------------
+# BackgroundTraceFlusher
+# ---------------------------------------------------------------------------
+
+
+def test_flusher_coalesces_requests_made_during_a_flush():
+    release = threading.Event()
+    calls = []
+
+    def flush():
+        calls.append(1)
+        release.wait(2)
+
+    flusher = BackgroundTraceFlusher(flush)
+    flusher.request()
+    time.sleep(0.05)  # first flush is now running
+    for _ in range(10):
+        flusher.request()
+    release.set()
+    flusher.close(timeout=2)
+
+    # The running flush, one coalesced follow-up, and the final flush at close.
+    assert len(calls) <= 3
+
+
+def test_flusher_close_runs_a_final_flush_and_survives_errors():
+    calls = []
+
+    def flush():
+        calls.append(1)
+        msg = "langfuse unavailable"
+        raise RuntimeError(msg)
+
+    flusher = BackgroundTraceFlusher(flush)
+    flusher.request()
+    flusher.close(timeout=2)
+
+    assert calls
+    assert flusher.flushes == len(calls)
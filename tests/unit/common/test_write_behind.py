@@ -0,0 +1,259 @@
+# ABOUTME: Unit tests for WriteBehindContextStore using SQLite in-memory and an in-memory cache.
+# ABOUTME: Validates coalescing, batch/interval/backpressure flushing, retry on failure and metrics.
+
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+
+import pytest
+from autobots_devtools_shared_lib.common.services import InMemoryContextStore
+
+from autobots_agents_jarvis.common.services.write_behind import WriteBehindContextStore
+
+
+@pytest.fixture()
+def cache():
+    return InMemoryContextStore()
+
+
+@pytest.fixture()
+def store(repo, cache):
+    """Manual-flush store (no background thread)."""
+    return WriteBehindContextStore(db=repo, cache=cache, prefix="wb", flush_interval=None)
+
+
+def test_set_writes_cache_immediately_and_db_on_flush(store, repo, cache):
+    store.set("alice", {"user_name": "alice"})
+
+    assert cache.get("wb_alice") == {"user_name": "alice"}
+    assert repo.get("wb_alice") is None
+
+    assert store.flush() == 1
+    assert repo.get("wb_alice") == {"user_name": "alice"}
+
+
+def test_repeated_writes_to_one_key_coalesce_into_one_row(store, repo, mocker):
+    spy = mocker.spy(repo, "set_many")
+    store.set("bob", {"user_name": "bob"})
+    store.update("bob", {"jira_number": "J-1"})
+    store.update("bob", {"user_name": "bob"})
+
+    store.flush()
+
+    spy.assert_called_once_with({"wb_bob": {"user_name": "bob", "jira_number": "J-1"}})
+    stats = store.stats()
+    assert stats["writes_received"] == 3
+    assert stats["writes_coalesced"] == 2
+    assert stats["rows_flushed"] == 1
+    assert stats["coalescing_ratio"] == 3.0
+
+
+def test_update_reads_unflushed_value(store, cache):
+    store.set("carol", {"user_name": "carol"})
+    cache.delete("wb_carol")  # simulate cache eviction before flush
+
+    assert store.update("carol", {"repo_name": "r"}) == {"user_name": "carol", "repo_name": "r"}
+
+
+def test_concurrent_updates_of_one_key_keep_both_fields(store, cache, mocker):
+    store.set("nia", {"user_name": "nia"})
+    store.flush()
+    real_get = cache.get
+
+    def slow_get(key):
+        data = real_get(key)
+        time.sleep(0.05)  # widen the read-merge-write window
+        return data
+
+    mocker.patch.object(cache, "get", side_effect=slow_get)
+    threads = [
+        threading.Thread(target=store.update, args=("nia", patch))
+        for patch in ({"repo_name": "r"}, {"jira_number": "J-4"})
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(2)
+
+    assert real_get("wb_nia") == {"user_name": "nia", "repo_name": "r", "jira_number": "J-4"}
+    store.flush()
+    assert store.get("nia") == {"user_name": "nia", "repo_name": "r", "jira_number": "J-4"}
+
+
+def test_get_falls_back_to_pending_then_db(store, repo, cache):
+    store.set("dave", {"user_name": "dave"})
+    cache.delete("wb_dave")
+    assert store.get("dave") == {"user_name": "dave"}
+
+    repo.set("wb_erin", {"user_name": "erin"})
+    assert store.get("erin") == {"user_name": "erin"}
+
+
+def test_get_many_prefers_pending_write_over_older_db_row(store, repo, cache):
+    repo.set("wb_kim", {"user_name": "old"})
+    store.set("kim", {"user_name": "new"})
+    cache.delete("wb_kim")
+
+    assert store.get_many(["kim"]) == {"kim": {"user_name": "new"}}
+    store.flush()
+
+    assert cache.get("wb_kim") == {"user_name": "new"}
+    assert store.get("kim") == {"user_name": "new"}
+
+
+def test_get_during_flush_returns_in_flight_write(store, repo, cache, mocker):
+    repo.set("wb_lee", {"user_name": "old"})
+    store.set("lee", {"user_name": "new"})
+    cache.delete("wb_lee")
+    read_during_flush = []
+
+    def set_many_then_read(batch):
+        # The batch has left the pending map but is not committed yet.
+        read_during_flush.append(store.get("lee"))
+        real_set_many(batch)
+
+    real_set_many = repo.set_many
+    mocker.patch.object(repo, "set_many", side_effect=set_many_then_read)
+    store.flush()
+
+    assert read_during_flush == [{"user_name": "new"}]
+    assert store.get("lee") == {"user_name": "new"}
+
+
+def test_read_overlapping_a_flush_commit_is_repeated(store, repo, cache, mocker):
+    repo.set("wb_max", {"user_name": "old"})
+    store.set("max", {"user_name": "new"})
+    cache.delete("wb_max")
+    real_get_many = repo.get_many
+
+    def stale_read(keys, **kwargs):
+        rows = real_get_many(keys, **kwargs)
+        store.flush()  # commits the newer row before the older read returns
+        mocker.patch.object(repo, "get_many", side_effect=real_get_many)
+        return rows
+
+    mocker.patch.object(repo, "get_many", side_effect=stale_read)
+
+    assert store.get_many(["max"]) == {"max": {"user_name": "new"}}
+    assert cache.get("wb_max") == {"user_name": "new"}
+
+
+def test_delete_drops_pending_write(store, repo):
+    store.set("frank", {"user_name": "frank"})
+    store.delete("frank")
+
+    assert store.flush() == 0
+    assert repo.get("wb_frank") is None
+
+
+def _delete_during_flush(store, repo, mocker, *, fail):
+    """Start a flush whose DB write blocks, delete the key meanwhile, then let the flush finish."""
+    entered = threading.Event()
+    release = threading.Event()
+    real_set_many = repo.set_many
+
+    def blocking_set_many(batch):
+        entered.set()
+        release.wait(2)
+        if fail:
+            msg = "db down"
+            raise RuntimeError(msg)
+        real_set_many(batch)
+
+    mocker.patch.object(repo, "set_many", side_effect=blocking_set_many)
+
+    def run_flush():
+        with contextlib.suppress(RuntimeError):
+            store.flush()
+
+    flusher = threading.Thread(target=run_flush)
+    flusher.start()
+    assert entered.wait(2)
+    deleter = threading.Thread(target=store.delete, args=("alice",))
+    deleter.start()
+    time.sleep(0.05)  # deleter is now waiting for the flush
+    release.set()
+    flusher.join(2)
+    deleter.join(2)
+    mocker.patch.object(repo, "set_many", side_effect=real_set_many)
+
+
+def test_delete_during_flush_is_not_resurrected(store, repo, mocker):
+    store.set("alice", {"user_name": "alice"})
+
+    _delete_during_flush(store, repo, mocker, fail=False)
+
+    assert repo.get("wb_alice") is None
+    assert store.get("alice") is None
+
+
+def test_delete_during_failed_flush_is_not_requeued(store, repo, mocker):
+    store.set("alice", {"user_name": "alice"})
+
+    _delete_during_flush(store, repo, mocker, fail=True)
+
+    assert store.stats()["pending"] == 0
+    store.flush()
+    assert repo.get("wb_alice") is None
+    assert store.get("alice") is None
+
+
+def test_max_pending_flushes_inline(repo, cache):
+    store = WriteBehindContextStore(
+        db=repo, cache=cache, prefix="wb", flush_interval=None, max_pending=2
+    )
+    store.set("a", {"user_name": "a"})
+    store.set("b", {"user_name": "b"})
+
+    assert repo.get("wb_a") == {"user_name": "a"}
+    assert store.stats()["pending"] == 0
+
+
+def test_batch_size_wakes_background_flusher(repo, cache):
+    store = WriteBehindContextStore(
+        db=repo, cache=cache, prefix="wb", flush_interval=60, batch_size=2
+    )
+    try:
+        store.set("a", {"user_name": "a"})
+        store.set("b", {"user_name": "b"})
+        # Poll the counters, not the DB: the StaticPool connection is not safe to
+        # use from this thread while the flusher is mid-transaction.
+        deadline = time.monotonic() + 5
+        while store.stats()["rows_flushed"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert repo.get("wb_b") == {"user_name": "b"}
+    finally:
+        store.close()
+
+
+def test_failed_flush_requeues_rows(store, repo, mocker):
+    store.set("gina", {"user_name": "gina"})
+    mocker.patch.object(repo, "set_many", side_effect=RuntimeError("db down"))
+
+    with pytest.raises(RuntimeError, match="db down"):
+        store.flush()
+
+    assert store.stats()["pending"] == 1
+    assert store.stats()["flush_errors"] == 1
+    mocker.stopall()
+    assert store.flush() == 1
+    assert repo.get("wb_gina") == {"user_name": "gina"}
+
+
+def test_close_flushes_pending_writes(repo, cache):
+    store = WriteBehindContextStore(db=repo, cache=cache, prefix="wb", flush_interval=60)
+    store.set("hank", {"user_name": "hank"})
+
+    store.close()
+
+    assert repo.get("wb_hank") == {"user_name": "hank"}
+
+
+def test_patch_queues_only_when_value_changes(store):
+    store.set("ivy", {"user_name": "ivy"})
+
+    assert store.patch("ivy", {"user_name": "ivy"}) is False
+    assert store.patch("ivy", {"jira_number": "J-3"}) is True
+    assert store.stats()["writes_received"] == 2
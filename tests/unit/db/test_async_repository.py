@@ -0,0 +1,65 @@
+# ABOUTME: Unit tests for AsyncJarvisContextRepository using SQLite via aiosqlite.
+# ABOUTME: Validates async CRUD, bulk reads and DSN driver conversion.
+
+from __future__ import annotations
+
+import pytest
+
+from autobots_agents_jarvis.common.db.async_repository import AsyncJarvisContextRepository
+from autobots_agents_jarvis.common.db.engine import init_async_db_engine, to_async_url
+
+
+@pytest.fixture()
+async def async_session_factory(tmp_path):
+    factory = await init_async_db_engine(f"sqlite:///{tmp_path / 'ctx.db'}")
+    yield factory
+    await factory.kw["bind"].dispose()
+
+
+@pytest.fixture()
+def arepo(async_session_factory):
+    return AsyncJarvisContextRepository(async_session_factory, prefix="jarvis_ctx")
+
+
+def test_to_async_url_swaps_known_drivers():
+    assert to_async_url("postgresql://u:p@h:5432/db") == "postgresql+asyncpg://u:p@h:5432/db"
+    assert (
+        to_async_url("postgresql+psycopg2://u:p@h:5432/db") == "postgresql+asyncpg://u:p@h:5432/db"
+    )
+    assert to_async_url("sqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+    assert to_async_url("postgresql+asyncpg://h/db") == "postgresql+asyncpg://h/db"
+
+
+async def test_init_async_db_engine_rejects_empty_url():
+    with pytest.raises(RuntimeError, match="must not be empty"):
+        await init_async_db_engine("")
+
+
+async def test_aget_returns_none_when_missing(arepo):
+    assert await arepo.aget("missing") is None
+
+
+async def test_aset_then_aget_roundtrip(arepo):
+    await arepo.aset("s1", {"user_id": "alice", "repo_name": "r1", "unknown": "x"})
+    await arepo.aset("s1", {"user_name": "alice", "repo_name": "r2"})
+
+    assert await arepo.aget("s1") == {"user_name": "alice", "repo_name": "r2"}
+
+
+async def test_aget_many_omits_missing(arepo):
+    await arepo.aset("a", {"user_name": "a"})
+    await arepo.aset("b", {"jira_number": "J-2"})
+
+    assert await arepo.aget_many(["a", "b", "c"]) == {
+        "a": {"user_name": "a"},
+        "b": {"jira_number": "J-2"},
+    }
+    assert await arepo.aget_many([]) == {}
+
+
+async def test_adelete_removes_row_and_is_idempotent(arepo):
+    await arepo.aset("gone", {"user_name": "x"})
+    await arepo.adelete("gone")
+    await arepo.adelete("gone")
+
+    assert await arepo.aget("gone") is None
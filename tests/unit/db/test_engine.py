@@ -0,0 +1,142 @@
+# ABOUTME: Unit tests for the jarvis DB engine factory: pool options and pool statistics.
+# ABOUTME: Uses SQLite so no PostgreSQL instance is required.
+
+from __future__ import annotations
+
+import pytest
+
+from autobots_agents_jarvis.common.configs.settings import AppSettings
+from autobots_agents_jarvis.common.db import engine as engine_module
+from autobots_agents_jarvis.common.db.engine import (
+    _engine_kwargs,
+    get_pool_stats,
+    get_read_session_factory,
+    init_db_engine,
+)
+
+_POOL = {
+    "pool_size": 3,
+    "max_overflow": 2,
+    "pool_recycle": 600,
+    "pool_timeout": 5.0,
+    "pool_pre_ping": False,
+    "statement_timeout_ms": 2500,
+}
+
+
+def test_engine_kwargs_postgres_includes_pool_and_statement_timeout():
+    kwargs = _engine_kwargs("postgresql+psycopg2://u:p@h/db", **_POOL)
+
+    assert kwargs["pool_size"] == 3
+    assert kwargs["max_overflow"] == 2
+    assert kwargs["pool_recycle"] == 600
+    assert kwargs["pool_timeout"] == 5.0
+    assert kwargs["pool_pre_ping"] is False
+    assert kwargs["connect_args"] == {"options": "-c statement_timeout=2500"}
+
+
+def test_engine_kwargs_asyncpg_uses_server_settings():
+    kwargs = _engine_kwargs("postgresql+asyncpg://u:p@h/db", **_POOL, async_driver=True)
+
+    assert kwargs["connect_args"] == {"server_settings": {"statement_timeout": "2500"}}
+
+
+def test_engine_kwargs_sqlite_skips_pool_sizing():
+    assert _engine_kwargs("sqlite://", **_POOL) == {"pool_pre_ping": False}
+
+
+def test_engine_kwargs_zero_statement_timeout_omits_connect_args():
+    kwargs = _engine_kwargs("postgresql://h/db", **{**_POOL, "statement_timeout_ms": 0})
+
+    assert "connect_args" not in kwargs
+
+
+def test_get_pool_stats_empty_before_init(monkeypatch):
+    monkeypatch.setattr(engine_module, "_ENGINE", None)
+
+    assert get_pool_stats() == {}
+
+
+def test_get_pool_stats_reports_queue_pool_occupancy(tmp_path, monkeypatch):
+    monkeypatch.setattr(engine_module, "_ENGINE", None)
+    factory = init_db_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+
+    with factory() as session:
+        session.connection()
+        stats = get_pool_stats()
+        assert stats["pool_class"] == "QueuePool"
+        assert stats["checked_out"] == 1
+
+    assert get_pool_stats()["checked_out"] == 0
+    factory.kw["bind"].dispose()
+
+
+def test_settings_db_engine_options_from_env(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "1500")
+
+    options = AppSettings().db_engine_options()
+
+    assert options["pool_size"] == 20
+    assert options["pool_pre_ping"] is False
+    assert options["statement_timeout_ms"] == 1500
+
+
+def test_init_db_engine_rejects_empty_url():
+    with pytest.raises(RuntimeError, match="must not be empty"):
+        init_db_engine("")
+
+
+def test_init_db_engine_applies_sqlite_wal_pragmas(tmp_path):
+    factory = init_db_engine(
+        f"sqlite:///{tmp_path / 'wal.db'}", sqlite_pragmas={"cache_size": -2048}
+    )
+    bind = factory.kw["bind"]
+
+    with bind.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert conn.exec_driver_sql("PRAGMA cache_size").scalar() == -2048
+    bind.dispose()
+
+
+def test_engine_kwargs_sqlite_file_allows_cross_thread_use():
+    kwargs = _engine_kwargs("sqlite:////tmp/ctx.db", **_POOL)
+
+    assert kwargs["connect_args"] == {"check_same_thread": False}
+
+
+def test_settings_context_database_url_prefers_database_url(monkeypatch):
+    monkeypatch.setenv("JARVIS_SQLITE_PATH", "/data/jarvis.db")
+    monkeypatch.delenv("JARVIS_DATABASE_URL", raising=False)
+    assert AppSettings(_env_file=None).context_database_url() == "sqlite:////data/jarvis.db"  # pyright: ignore[reportCallIssue]
+
+    monkeypatch.setenv("JARVIS_DATABASE_URL", "postgresql://h/db")
+    assert AppSettings(_env_file=None).context_database_url() == "postgresql://h/db"  # pyright: ignore[reportCallIssue]
+
+
+def test_init_db_engine_round_robins_reads_across_replicas(tmp_path):
+    replicas = [f"sqlite:///{tmp_path / f'replica{i}.db'}" for i in range(2)]
+    primary = init_db_engine(f"sqlite:///{tmp_path / 'primary.db'}", replica_urls=replicas)
+
+    read_factory = get_read_session_factory()
+    assert read_factory is not None
+    bound = [str(read_factory().get_bind().url) for _ in range(4)]
+    assert bound[0] != bound[1]
+    assert bound[:2] == bound[2:]
+    assert set(bound) == set(replicas)
+
+    # Re-initialising without replicas routes reads back to the primary.
+    primary.kw["bind"].dispose()
+    init_db_engine(f"sqlite:///{tmp_path / 'primary.db'}").kw["bind"].dispose()
+    assert get_read_session_factory() is None
+
+
+def test_settings_replica_urls_are_split(monkeypatch):
+    monkeypatch.setenv("JARVIS_DATABASE_REPLICA_URLS", "postgresql://r1/db, postgresql://r2/db,")
+
+    assert AppSettings().db_engine_options()["replica_urls"] == [
+        "postgresql://r1/db",
+        "postgresql://r2/db",
+    ]
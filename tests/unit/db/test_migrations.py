@@ -0,0 +1,162 @@
+# ABOUTME: Unit tests for the versioned schema check and migration entry point.
+# ABOUTME: Uses SQLite files so fresh, legacy and current databases can be simulated.
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, event, inspect, text
+
+from autobots_agents_jarvis.common.configs.settings import AppSettings
+from autobots_agents_jarvis.common.db.engine import init_db_engine
+from autobots_agents_jarvis.common.db.migrations import (
+    SCHEMA_VERSION,
+    ensure_schema,
+    main,
+    migrate,
+    read_schema_version,
+)
+from autobots_agents_jarvis.common.db.models import JarvisContextEntity
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    eng = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    yield eng
+    eng.dispose()
+
+
+def test_read_schema_version_is_zero_without_version_table(engine):
+    with engine.connect() as conn:
+        assert read_schema_version(conn) == 0
+
+
+def test_migrate_fresh_database_creates_tables_and_stamps_version(engine):
+    with engine.connect() as conn:
+        assert migrate(conn) == SCHEMA_VERSION
+        assert read_schema_version(conn) == SCHEMA_VERSION
+    assert inspect(engine).has_table("jarvis_context_store")
+
+
+def test_migrate_legacy_database_without_version_table(engine):
+    # Pre-versioning layout: table without the lookup indexes.
+    JarvisContextEntity.__table__.create(engine)  # pyright: ignore[reportAttributeAccessIssue]
+    for index in JarvisContextEntity.__table__.indexes:  # pyright: ignore[reportAttributeAccessIssue]
+        index.drop(engine)
+
+    with engine.connect() as conn:
+        assert migrate(conn) == SCHEMA_VERSION
+        assert read_schema_version(conn) == SCHEMA_VERSION
+
+    index_names = {ix["name"] for ix in inspect(engine).get_indexes("jarvis_context_store")}
+    assert "ix_jarvis_context_user_name" in index_names
+    assert "ix_jarvis_context_jira_number" in index_names
+
+
+def _create_v3_database(engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE jarvis_context_store (context_key VARCHAR PRIMARY KEY, "
+                "domain_name VARCHAR, user_name VARCHAR, repo_name VARCHAR, session_id VARCHAR, "
+                "jira_number VARCHAR, created_at DATETIME, updated_at DATETIME)"
+            )
+        )
+        conn.execute(text("INSERT INTO jarvis_context_store (context_key) VALUES ('k1')"))
+        conn.execute(
+            text(
+                "CREATE TABLE jarvis_schema_version (version INTEGER PRIMARY KEY, applied_at DATETIME)"
+            )
+        )
+        conn.execute(text("INSERT INTO jarvis_schema_version (version) VALUES (3)"))
+
+
+def test_migrate_v3_database_adds_version_column(engine):
+    _create_v3_database(engine)
+
+    with engine.connect() as conn:
+        assert migrate(conn) == SCHEMA_VERSION
+        assert conn.execute(text("SELECT version FROM jarvis_context_store")).scalar_one() == 1
+
+
+def _migrate_concurrently(url: str, workers: int = 4) -> list[int]:
+    """Run migrate() from *workers* engines at once (one per simulated process)."""
+    barrier = threading.Barrier(workers)
+
+    def _run(_: int) -> int:
+        eng = create_engine(url)
+        try:
+            with eng.connect() as conn:
+                barrier.wait()
+                return migrate(conn)
+        finally:
+            eng.dispose()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run, range(workers)))
+
+
+def test_concurrent_migrate_of_fresh_database(engine):
+    assert _migrate_concurrently(str(engine.url)) == [SCHEMA_VERSION] * 4
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT version FROM jarvis_schema_version")).scalars().all()
+    assert rows == [SCHEMA_VERSION]
+
+
+def test_concurrent_upgrade_of_v3_database_adds_version_column_once(engine):
+    _create_v3_database(engine)
+
+    assert _migrate_concurrently(str(engine.url)) == [SCHEMA_VERSION] * 4
+
+    columns = [c["name"] for c in inspect(engine).get_columns("jarvis_context_store")]
+    assert columns.count("version") == 1
+
+
+def test_migrate_is_idempotent(engine):
+    with engine.connect() as conn:
+        migrate(conn)
+        assert migrate(conn) == SCHEMA_VERSION
+
+
+def test_ensure_schema_on_current_database_is_one_query(engine):
+    with engine.connect() as conn:
+        migrate(conn)
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    with engine.connect() as conn:
+        assert ensure_schema(conn) == SCHEMA_VERSION
+    event.remove(engine, "before_cursor_execute", _record)
+
+    assert len(statements) == 1
+    assert "jarvis_schema_version" in statements[0]
+
+
+def test_init_db_engine_skip_schema_creates_nothing(tmp_path):
+    factory = init_db_engine(f"sqlite:///{tmp_path / 'skip.db'}", init_schema=False)
+    bind = factory.kw["bind"]
+
+    assert not inspect(bind).has_table("jarvis_context_store")
+    bind.dispose()
+
+
+def test_skip_schema_init_setting_disables_schema_check(monkeypatch):
+    monkeypatch.setenv("JARVIS_SKIP_SCHEMA_INIT", "true")
+
+    assert AppSettings().db_engine_options()["init_schema"] is False
+
+
+def test_main_check_then_migrate(tmp_path, capsys):
+    url = f"sqlite:///{tmp_path / 'cli.db'}"
+
+    assert main(["--url", url, "--check"]) == 1
+    assert main(["--url", url]) == 0
+    assert main(["--url", url, "--check"]) == 0
+    assert f"schema version {SCHEMA_VERSION}" in capsys.readouterr().out
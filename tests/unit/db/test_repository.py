@@ -3,13 +3,18 @@
 
 from __future__ import annotations
 
+from datetime import UTC, datetime
+
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, update
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
 
 from autobots_agents_jarvis.common.db.models import JarvisContextEntity
-from autobots_agents_jarvis.common.db.repository import JarvisContextRepository
+from autobots_agents_jarvis.common.db.repository import (
+    ContextVersionConflictError,
+    JarvisContextRepository,
+)
 
 # ---------------------------------------------------------------------------
 # Fixtures
@@ -73,6 +78,30 @@ def test_get_omits_none_fields(repo, session_factory):
     assert result == {"repo_name": "only-repo"}
 
 
+def test_get_selects_only_context_columns_with_cached_statement(repo, session_factory):
+    """get() is a Core SELECT of the five context columns, compiled once."""
+    repo.set("k1", {"user_name": "alice"})
+    engine = session_factory.kw["bind"]
+    statements: list[str] = []
+    compiled: list[object] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+        compiled.append(context.compiled)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        repo.get("k1")
+        repo.get("k2")
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert len(statements) == 2
+    assert "created_at" not in statements[0]
+    assert "version" not in statements[0]
+    assert compiled[0] is compiled[1]
+
+
 # ---------------------------------------------------------------------------
 # set (upsert)
 # ---------------------------------------------------------------------------
@@ -116,6 +145,38 @@ def test_set_ignores_unknown_keys(repo):
     assert "unknown_field" not in result
 
 
+def test_set_issues_single_upsert_statement(repo, session_factory):
+    """set() is one INSERT ... ON CONFLICT, with no preceding SELECT."""
+    repo.set("one_stmt", {"user_name": "first"})
+    engine = session_factory.kw["bind"]
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        repo.set("one_stmt", {"user_name": "second"})
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert len(statements) == 1
+    assert "ON CONFLICT" in statements[0].upper()
+    assert repo.get("one_stmt") == {"user_name": "second"}
+
+
+def test_set_upsert_preserves_created_at(repo, session_factory):
+    repo.set("ts_key", {"user_name": "a"})
+    with session_factory() as session:
+        created = session.get(JarvisContextEntity, "ts_key").created_at
+
+    repo.set("ts_key", {"user_name": "b"})
+    with session_factory() as session:
+        entity = session.get(JarvisContextEntity, "ts_key")
+        assert entity.created_at == created
+        assert entity.updated_at is not None
+
+
 def test_get_returns_none_after_unset_key(repo):
     assert repo.get("never_set") is None
 
@@ -178,3 +239,342 @@ def test_prefix_delete_removes_prefixed_row(repo_with_prefix, session_factory):
     assert repo_with_prefix.get("del_me") is None
     with session_factory() as session:
         assert session.get(JarvisContextEntity, "jarvis_ctx_del_me") is None
+
+
+# ---------------------------------------------------------------------------
+# get_many / set_many (bulk)
+# ---------------------------------------------------------------------------
+
+
+def test_get_many_returns_only_existing_keys(repo):
+    repo.set("a", {"user_name": "alice"})
+    repo.set("b", {"repo_name": "r-b"})
+
+    result = repo.get_many(["a", "b", "missing"])
+    assert result == {"a": {"user_name": "alice"}, "b": {"repo_name": "r-b"}}
+
+
+def test_get_many_empty_input_returns_empty_dict(repo):
+    assert repo.get_many([]) == {}
+
+
+def test_set_many_inserts_and_updates(repo):
+    repo.set("existing", {"user_name": "old"})
+
+    repo.set_many(
+        {
+            "existing": {"user_name": "new", "jira_number": "J-9"},
+            "fresh": {"user_id": "zoe", "unknown": "ignored"},
+        }
+    )
+
+    assert repo.get("existing") == {"user_name": "new", "jira_number": "J-9"}
+    assert repo.get("fresh") == {"user_name": "zoe"}
+
+
+def test_set_many_handles_more_keys_than_one_chunk(repo):
+    data = {f"user-{i}": {"user_name": f"u{i}"} for i in range(1200)}
+    repo.set_many(data)
+
+    result = repo.get_many(data)
+    assert len(result) == 1200
+    assert result["user-1199"] == {"user_name": "u1199"}
+
+
+def test_prefix_bulk_roundtrip_uses_prefixed_storage_keys(repo_with_prefix, session_factory):
+    repo_with_prefix.set_many({"s1": {"user_name": "a"}, "s2": {"user_name": "b"}})
+
+    assert repo_with_prefix.get_many(["s1", "s2"]) == {
+        "s1": {"user_name": "a"},
+        "s2": {"user_name": "b"},
+    }
+    with session_factory() as session:
+        assert session.get(JarvisContextEntity, "jarvis_ctx_s1") is not None
+
+
+# ---------------------------------------------------------------------------
+# patch (column-level update)
+# ---------------------------------------------------------------------------
+
+
+def test_patch_updates_only_provided_columns(repo):
+    repo.set("p1", {"user_name": "alice", "repo_name": "r1", "jira_number": "J-1"})
+
+    assert repo.patch("p1", {"jira_number": "J-2"}) is True
+    assert repo.get("p1") == {"user_name": "alice", "repo_name": "r1", "jira_number": "J-2"}
+
+
+def test_patch_inserts_missing_row(repo):
+    assert repo.patch("p2", {"user_id": "bob", "unknown": "ignored"}) is True
+    assert repo.get("p2") == {"user_name": "bob"}
+
+
+def test_patch_skips_write_when_unchanged(repo, session_factory):
+    repo.set("p3", {"user_name": "carol"})
+    engine = session_factory.kw["bind"]
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        assert repo.patch("p3", {"user_name": "carol"}) is False
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert len(statements) == 1
+    assert "IS NOT" in statements[0].upper() or "DISTINCT" in statements[0].upper()
+
+
+def test_patch_with_no_known_fields_is_noop(repo):
+    assert repo.patch("p4", {"workspace_context": "{}"}) is False
+    assert repo.get("p4") is None
+
+
+# ---------------------------------------------------------------------------
+# optimistic concurrency (version / compare-and-swap)
+# ---------------------------------------------------------------------------
+
+
+def test_every_write_bumps_version(repo):
+    repo.set("k1", {"user_name": "alice"})
+    assert repo.get_with_version("k1") == ({"user_name": "alice"}, 1)
+    repo.set("k1", {"user_name": "bob"})
+    repo.patch("k1", {"repo_name": "r"})
+    assert repo.get_with_version("k1")[1] == 3
+    # An unchanged patch is skipped and does not bump the version.
+    repo.patch("k1", {"repo_name": "r"})
+    assert repo.get_with_version("k1")[1] == 3
+
+
+def test_get_with_version_missing_returns_none(repo):
+    assert repo.get_with_version("missing") is None
+
+
+def test_set_with_expected_version_rejects_stale_writer(repo):
+    repo.set("k1", {"user_name": "alice"})
+    _, version = repo.get_with_version("k1")
+    repo.set("k1", {"user_name": "bob"}, expected_version=version)
+
+    with pytest.raises(ContextVersionConflictError):
+        repo.set("k1", {"user_name": "carol"}, expected_version=version)
+    assert repo.get("k1") == {"user_name": "bob"}
+
+
+def test_set_with_expected_version_zero_is_create_only(repo):
+    repo.set("k1", {"user_name": "alice"}, expected_version=0)
+    assert repo.get_with_version("k1") == ({"user_name": "alice"}, 1)
+    with pytest.raises(ContextVersionConflictError):
+        repo.set("k1", {"user_name": "bob"}, expected_version=0)
+
+
+def test_patch_with_expected_version(repo):
+    repo.set("k1", {"user_name": "alice"})
+    assert repo.patch("k1", {"repo_name": "r"}, expected_version=1) is True
+    with pytest.raises(ContextVersionConflictError):
+        repo.patch("k1", {"repo_name": "s"}, expected_version=1)
+    with pytest.raises(ContextVersionConflictError):
+        repo.patch("missing", {"repo_name": "s"}, expected_version=1)
+    assert repo.get("k1") == {"user_name": "alice", "repo_name": "r"}
+
+
+def test_modify_retries_after_concurrent_write(repo):
+    repo.set("k1", {"user_name": "alice"})
+    calls = []
+
+    def mutate(current):
+        calls.append(dict(current))
+        if len(calls) == 1:
+            # Another writer lands between our read and our write.
+            repo.set("k1", {**current, "jira_number": "J-1"})
+        return {**current, "repo_name": "r"}
+
+    result = repo.modify("k1", mutate)
+
+    assert len(calls) == 2
+    assert result == {"user_name": "alice", "jira_number": "J-1", "repo_name": "r"}
+    assert repo.get("k1") == result
+
+
+def test_modify_gives_up_after_max_attempts(repo):
+    repo.set("k1", {"user_name": "alice"})
+
+    def always_lose(current):
+        repo.set("k1", {"user_name": "someone-else"})
+        return {**current, "repo_name": "r"}
+
+    with pytest.raises(ContextVersionConflictError):
+        repo.modify("k1", always_lose, max_attempts=2)
+
+
+def test_modify_creates_missing_row(repo):
+    assert repo.modify("k1", lambda cur: {**cur, "user_name": "alice"}) == {"user_name": "alice"}
+    assert repo.get_with_version("k1") == ({"user_name": "alice"}, 1)
+
+
+# ---------------------------------------------------------------------------
+# read-replica routing
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def replica_factory():
+    """Second in-memory database standing in for a (lagging) read replica."""
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    engine.dispose()
+
+
+def test_reads_go_to_replica_and_writes_to_primary(session_factory, replica_factory):
+    routed = JarvisContextRepository(session_factory, read_session_factory=replica_factory)
+    JarvisContextRepository(replica_factory).set("k1", {"user_name": "stale"})
+
+    routed.set("k1", {"user_name": "fresh"})
+
+    assert routed.get("k1") == {"user_name": "stale"}
+    assert routed.get_many(["k1"]) == {"k1": {"user_name": "stale"}}
+    assert routed.find_by_user("stale").items == [("k1", {"user_name": "stale"})]
+    assert routed.get("k1", primary=True) == {"user_name": "fresh"}
+    assert routed.get_many(["k1"], primary=True) == {"k1": {"user_name": "fresh"}}
+    # Version reads guard compare-and-swap writes, so they never use the replica.
+    assert routed.get_with_version("k1") == ({"user_name": "fresh"}, 1)
+
+
+# ---------------------------------------------------------------------------
+# find_by_* (indexed, keyset-paginated)
+# ---------------------------------------------------------------------------
+
+
+def test_find_by_user_pages_in_context_key_order(repo):
+    repo.set_many({f"k{i:02d}": {"user_name": "alice", "jira_number": f"J-{i}"} for i in range(5)})
+    repo.set("other", {"user_name": "bob"})
+
+    first = repo.find_by_user("alice", limit=2)
+    assert [k for k, _ in first.items] == ["k00", "k01"]
+    assert first.next_after == "k01"
+
+    second = repo.find_by_user("alice", after=first.next_after, limit=2)
+    assert [k for k, _ in second.items] == ["k02", "k03"]
+
+    last = repo.find_by_user("alice", after=second.next_after, limit=2)
+    assert last.items == [("k04", {"user_name": "alice", "jira_number": "J-4"})]
+    assert last.next_after is None
+
+
+def test_find_by_session_jira_and_domain(repo):
+    repo.set("s", {"session_id": "t-1", "jira_number": "J-9", "domain_name": "sales_chat"})
+
+    assert [k for k, _ in repo.find_by_session("t-1").items] == ["s"]
+    assert [k for k, _ in repo.find_by_jira("J-9").items] == ["s"]
+    assert [k for k, _ in repo.find_by_domain("sales_chat").items] == ["s"]
+    assert repo.find_by_jira("J-missing").items == []
+
+
+def test_find_by_with_prefix_scopes_and_strips_keys(repo_with_prefix, repo):
+    repo.set("unprefixed", {"user_name": "carol"})
+    repo_with_prefix.set("mine", {"user_name": "carol"})
+
+    page = repo_with_prefix.find_by_user("carol")
+    assert page.items == [("mine", {"user_name": "carol"})]
+
+
+def test_find_by_rejects_non_positive_limit(repo):
+    with pytest.raises(ValueError, match="limit must be positive"):
+        repo.find_by_user("x", limit=0)
+
+
+# ---------------------------------------------------------------------------
+# purge_expired (TTL)
+# ---------------------------------------------------------------------------
+
+
+def _age_rows(session_factory, keys, when):
+    with session_factory() as session:
+        session.execute(
+            update(JarvisContextEntity)
+            .where(JarvisContextEntity.context_key.in_(keys))  # pyright: ignore[reportAttributeAccessIssue]
+            .values(updated_at=when)
+        )
+        session.commit()
+
+
+def test_purge_expired_deletes_old_rows_in_batches(repo, session_factory):
+    repo.set_many({f"old{i}": {"user_name": "x"} for i in range(5)})
+    repo.set("fresh", {"user_name": "y"})
+    _age_rows(session_factory, [f"old{i}" for i in range(5)], datetime(2020, 1, 1, tzinfo=UTC))
+
+    batches = list(repo.purge_expired(datetime(2021, 1, 1, tzinfo=UTC), batch_size=2))
+
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert sorted(k for b in batches for k in b) == [f"old{i}" for i in range(5)]
+    assert repo.get_many([f"old{i}" for i in range(5)]) == {}
+    assert repo.get("fresh") == {"user_name": "y"}
+
+
+def test_purge_expired_with_prefix_only_touches_own_rows(repo_with_prefix, repo, session_factory):
+    repo.set("other_domain", {"user_name": "a"})
+    repo_with_prefix.set("mine", {"user_name": "b"})
+    _age_rows(
+        session_factory, ["other_domain", "jarvis_ctx_mine"], datetime(2020, 1, 1, tzinfo=UTC)
+    )
+
+    batches = list(repo_with_prefix.purge_expired(datetime(2021, 1, 1, tzinfo=UTC)))
+
+    assert batches == [["mine"]]
+    assert repo.get("other_domain") == {"user_name": "a"}
+
+
+def test_purge_expired_rejects_non_positive_batch(repo):
+    with pytest.raises(ValueError, match="batch_size must be positive"):
+        list(repo.purge_expired(datetime(2021, 1, 1, tzinfo=UTC), batch_size=0))
+
+
+# ---------------------------------------------------------------------------
+# iter_recent (cache warm-up)
+# ---------------------------------------------------------------------------
+
+
+def _stamp_rows(session_factory, stamps):
+    for key, when in stamps.items():
+        _age_rows(session_factory, [key], when)
+
+
+def test_iter_recent_pages_newest_first_with_ties(repo, session_factory):
+    repo.set_many({f"k{i}": {"user_name": f"u{i}"} for i in range(6)})
+    tie = datetime(2024, 1, 2, tzinfo=UTC)
+    _stamp_rows(
+        session_factory,
+        {
+            "k0": datetime(2024, 1, 1, tzinfo=UTC),
+            "k1": tie,
+            "k2": tie,
+            "k3": tie,
+            "k4": datetime(2024, 1, 3, tzinfo=UTC),
+            "k5": datetime(2023, 1, 1, tzinfo=UTC),
+        },
+    )
+
+    pages = list(repo.iter_recent(5, page_size=2))
+
+    assert [list(page) for page in pages] == [["k4", "k3"], ["k2", "k1"], ["k0"]]
+    assert pages[0]["k4"] == {"user_name": "u4"}
+
+
+def test_iter_recent_filters_by_key_prefix(repo_with_prefix, repo):
+    repo.set("jarvis-sales_bob", {"user_name": "bob"})
+    repo.set("jarvis-concierge_alice", {"user_name": "alice"})
+    repo.set("jarvis_ctx_jarvis-concierge_carol", {"user_name": "carol"})
+
+    assert [dict(p) for p in repo.iter_recent(10, key_prefix="jarvis-concierge_")] == [
+        {"jarvis-concierge_alice": {"user_name": "alice"}}
+    ]
+    assert list(repo_with_prefix.iter_recent(10, key_prefix="jarvis-concierge_")) == [
+        {"jarvis-concierge_carol": {"user_name": "carol"}}
+    ]
+
+
+def test_iter_recent_rejects_non_positive_page_size(repo):
+    with pytest.raises(ValueError, match="page_size must be positive"):
+        list(repo.iter_recent(10, page_size=0))